@@ -0,0 +1,194 @@
+"""
+Gemini Load Test
+Drives generate_summary_with_gemini and the key manager against the mock server
+
+Starts benchmarks/mock_gemini_server.py in-process (or uses --base-url), then
+for every combination of key count and per-key concurrency sends the same
+number of synthetic articles and reports throughput, tail latency and how
+evenly the keys were used. No real quota is spent.
+
+Usage:
+    python benchmarks/gemini_loadtest.py                            # 1/2/4 keys x concurrency 1/2
+    python benchmarks/gemini_loadtest.py --keys 1,3 --concurrency 1,4 --requests 60
+    python benchmarks/gemini_loadtest.py --error-429 0.1 --malformed 0.05 --latency-dist exponential
+    python benchmarks/gemini_loadtest.py --batch-size 5 --output loadtest.json
+"""
+
+import io
+import os
+import sys
+import json
+import time
+import argparse
+import threading
+import contextlib
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, List
+
+BENCH_DIR = os.path.dirname(os.path.abspath(__file__))
+sys.path.insert(0, os.path.dirname(BENCH_DIR))
+sys.path.insert(0, BENCH_DIR)
+
+from mock_gemini_server import add_behaviour_arguments, behaviour_from_args, start_server  # noqa: E402
+
+
+def _int_list(value: str) -> List[int]:
+    return [int(item) for item in value.split(",") if item.strip()]
+
+
+def _percentile(values: List[float], pct: float) -> float:
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(pct / 100 * len(ordered)))]
+
+
+def _server_stats(base_url: str) -> Dict[str, int]:
+    try:
+        with urllib.request.urlopen(f"{base_url}/stats", timeout=5) as response:
+            return json.load(response)
+    except Exception:
+        return {}
+
+
+def synthetic_article(n: int) -> tuple:
+    """Unique title and body so neither the cache nor the token budget dedups them"""
+    title = f"Load test article {n}: flood update from district {n % 64}"
+    body = "\n\n".join(
+        f"Paragraph {p} of article {n} reports figures {n * 31 + p} and {n * 17 + p} from the field."
+        for p in range(12)
+    )
+    return title, body
+
+
+def run_setting(gemini_ai, keys: int, concurrency: int, args: argparse.Namespace) -> Dict:
+    """Fresh key manager and worker pool, then push ``args.requests`` articles through"""
+    config = gemini_ai.config
+    api_keys = [f"mock-key-{i + 1}" for i in range(keys)]
+
+    manager = gemini_ai.GeminiAPIManager(api_keys, model_rpm=config.GEMINI_MODEL_RPM)
+    pool = gemini_ai.GeminiWorkerPool(manager, concurrency, rpm=config.GEMINI_KEY_RPM, tpm=config.GEMINI_KEY_TPM)
+    gemini_ai.gemini_manager = manager
+    gemini_ai.gemini_pool = pool
+
+    batches = [
+        [synthetic_article(n) for n in range(start, min(start + args.batch_size, args.requests))]
+        for start in range(0, args.requests, args.batch_size)
+    ]
+    latencies: List[float] = []
+    outcomes = {"ok": 0, "failed": 0}
+    lock = threading.Lock()
+
+    def call(batch) -> None:
+        started = time.monotonic()
+        if len(batch) == 1:
+            try:
+                gemini_ai.generate_summary_with_gemini(*batch[0])
+                results = [True]
+            except Exception:
+                results = [False]
+        else:
+            results = [result is not None for result in gemini_ai.generate_summaries_with_gemini(batch)]
+        with lock:
+            latencies.append(time.monotonic() - started)
+            outcomes["ok"] += sum(results)
+            outcomes["failed"] += len(results) - sum(results)
+
+    before = _server_stats(args.base_url)
+    callers = args.callers or pool.capacity
+    output = contextlib.nullcontext() if args.verbose else contextlib.redirect_stdout(io.StringIO())
+
+    started = time.monotonic()
+    with output, ThreadPoolExecutor(max_workers=callers) as executor:
+        list(executor.map(call, batches))
+    elapsed = time.monotonic() - started
+    pool.close()
+
+    after = _server_stats(args.base_url)
+    server = {name: after.get(name, 0) - before.get(name, 0) for name in after}
+
+    total_requests = sum(pool.requests_per_key.values()) or 1
+    key_share = {
+        manager.key_label(key): round(count / total_requests, 3)
+        for key, count in pool.requests_per_key.items()
+    }
+
+    return {
+        "keys": keys,
+        "concurrency_per_key": concurrency,
+        "callers": callers,
+        "batch_size": args.batch_size,
+        "articles_ok": outcomes["ok"],
+        "articles_failed": outcomes["failed"],
+        "seconds": round(elapsed, 3),
+        "articles_per_second": round(outcomes["ok"] / elapsed, 3) if elapsed else 0.0,
+        "p50_seconds": round(_percentile(latencies, 50), 3),
+        "p95_seconds": round(_percentile(latencies, 95), 3),
+        "p99_seconds": round(_percentile(latencies, 99), 3),
+        "http_requests": server.get("requests", 0),
+        "http_429": server.get("429_per_minute", 0) + server.get("429_per_day", 0),
+        "http_500": server.get("500", 0),
+        "malformed": server.get("malformed", 0),
+        "key_share": key_share,
+        "routing": manager.get_stats(),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load-test the Gemini client against the offline mock server")
+    parser.add_argument("--keys", type=_int_list, default=[1, 2, 4], help="Comma-separated key counts to sweep")
+    parser.add_argument("--concurrency", type=_int_list, default=[1, 2], help="Comma-separated per-key concurrency values")
+    parser.add_argument("--requests", "-n", type=int, default=40, help="Articles per setting")
+    parser.add_argument("--batch-size", type=int, default=1, help="Articles per generate call (>1 uses the batch path)")
+    parser.add_argument("--callers", type=int, default=0, help="Concurrent callers (default: keys x concurrency)")
+    parser.add_argument("--model-rpm", default="", help="GEMINI_MODEL_RPM for the run (default: unlimited)")
+    parser.add_argument("--key-rpm", type=int, default=0, help="GEMINI_KEY_RPM for the run (default: unlimited)")
+    parser.add_argument("--base-url", default=None, help="Use an already running mock instead of starting one")
+    parser.add_argument("--output", "-o", default=None, help="Write the results as JSON")
+    parser.add_argument("--verbose", "-v", action="store_true", help="Show the client's per-request log lines")
+    add_behaviour_arguments(parser)
+    args = parser.parse_args()
+    args.batch_size = max(1, args.batch_size)
+
+    if args.base_url is None:
+        server = start_server(behaviour_from_args(args))
+        args.base_url = f"http://127.0.0.1:{server.server_port}"
+    args.base_url = args.base_url.rstrip("/")
+
+    # Configuration is read at import time, so set it before importing utils
+    os.environ.update({
+        "GEMINI_API_BASE": args.base_url,
+        "GEMINI_API_KEYS": ",".join(f"mock-key-{i + 1}" for i in range(max(args.keys))),
+        "GEMINI_MODEL_RPM": args.model_rpm,
+        "GEMINI_KEY_RPM": str(args.key_rpm),
+        "GEMINI_KEY_TPM": "0",
+        "ANALYSIS_CACHE_ENABLED": "false",
+        "GEMINI_HEALTH_ENABLED": "false",
+    })
+    with contextlib.redirect_stdout(io.StringIO()):
+        from utils import gemini_ai
+
+    print(f"🧪 Gemini load test against {args.base_url} ({args.requests} articles per setting)")
+    print(f"   {'keys':>4} {'conc':>4} {'ok':>5} {'fail':>4} {'art/s':>7} {'p50':>7} {'p95':>7} {'p99':>7} {'429':>4}  key share")
+
+    results = []
+    for keys in args.keys:
+        for concurrency in args.concurrency:
+            row = run_setting(gemini_ai, keys, concurrency, args)
+            results.append(row)
+            share = " ".join(f"{label}={value:.0%}" for label, value in row["key_share"].items())
+            print(
+                f"   {keys:>4} {concurrency:>4} {row['articles_ok']:>5} {row['articles_failed']:>4} "
+                f"{row['articles_per_second']:>7.2f} {row['p50_seconds']:>6.2f}s {row['p95_seconds']:>6.2f}s "
+                f"{row['p99_seconds']:>6.2f}s {row['http_429']:>4}  {share}"
+            )
+
+    if args.output:
+        with open(args.output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"\n📁 Results saved to: {args.output}")
+
+
+if __name__ == "__main__":
+    main()
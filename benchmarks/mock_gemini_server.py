@@ -0,0 +1,260 @@
+"""
+Mock Gemini Server
+Offline stand-in for the generativelanguage.googleapis.com generateContent endpoint
+
+Answers single, batch and triage analysis prompts with schema-valid JSON after
+a simulated latency, and can inject 429s (per-minute or per-day, with
+RetryInfo), 500s and malformed JSON. Request counters are served at /stats.
+
+Usage:
+    python benchmarks/mock_gemini_server.py --port 8089 --latency-ms 800 --latency-dist lognormal
+    GEMINI_API_BASE=http://127.0.0.1:8089 python main.py --scraper bbc
+"""
+
+import re
+import json
+import time
+import random
+import argparse
+import threading
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, Optional
+
+ARTICLE_ID = re.compile(r'--- ARTICLE id="([^"]+)" ---')
+MODEL_PATH = re.compile(r"^/v1beta/models/([^/:]+):generateContent$")
+
+
+class MockBehaviour:
+    """Latency distribution and fault injection settings"""
+
+    def __init__(
+        self,
+        latency_ms: float = 500,
+        latency_dist: str = "lognormal",
+        error_429: float = 0.0,
+        daily_fraction: float = 0.0,
+        retry_delay: float = 5.0,
+        error_500: float = 0.0,
+        malformed: float = 0.0,
+        seed: Optional[int] = None
+    ):
+        self.latency_ms = latency_ms
+        self.latency_dist = latency_dist
+        self.error_429 = error_429
+        self.daily_fraction = daily_fraction
+        self.retry_delay = retry_delay
+        self.error_500 = error_500
+        self.malformed = malformed
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+        self.counters: Counter = Counter()
+
+    def latency(self) -> float:
+        """Seconds to wait before answering"""
+        mean = self.latency_ms / 1000
+        with self.lock:
+            if self.latency_dist == "fixed":
+                return mean
+            if self.latency_dist == "uniform":
+                return self.random.uniform(0.5 * mean, 1.5 * mean)
+            if self.latency_dist == "exponential":
+                return self.random.expovariate(1 / mean) if mean > 0 else 0.0
+            # lognormal with the given mean and a long right tail
+            sigma = 0.6
+            return self.random.lognormvariate(0, sigma) * mean / (2.718281828 ** (sigma ** 2 / 2))
+
+    def roll(self, probability: float) -> bool:
+        with self.lock:
+            return self.random.random() < probability
+
+    def count(self, *names: str) -> None:
+        with self.lock:
+            for name in names:
+                self.counters[name] += 1
+
+
+def _analysis(n: int) -> Dict:
+    return {
+        "category": random.choice(["Politics", "Sports", "Economy", "World", "Crime"]),
+        "summary_60_bn": "এটি একটি পরীক্ষামূলক সারাংশ। " * 6,
+        "summary_60_en": "This is a mock summary for load testing. " * 6,
+        "importance": random.randint(1, 10),
+        "clickbait_score": random.randint(0, 5),
+        "clickbait_reason": "Mock reason generated by the offline test server",
+        "corrected_title": "",
+        "keywords": ["mock", f"article{n}"],
+        "mcqs": [
+            {
+                "question": f"Mock question {q}?",
+                "options": ["A one", "B two", "C three", "D four"],
+                "correct_answer": "A one",
+            }
+            for q in range(3)
+        ],
+    }
+
+
+def _triage(n: int) -> Dict:
+    full = _analysis(n)
+    return {field: full[field] for field in ("category", "importance", "keywords")}
+
+
+def build_answer(body: Dict) -> object:
+    """Schema-shaped answer for the prompt in a generateContent request"""
+    prompt = body["contents"][0]["parts"][0]["text"]
+    schema = body.get("generationConfig", {}).get("responseSchema") or {}
+    item_schema = schema.get("items", schema)
+    if item_schema.get("properties"):
+        triage = "mcqs" not in item_schema["properties"]
+    else:
+        triage = '"mcqs"' not in prompt
+    make = _triage if triage else _analysis
+
+    ids = ARTICLE_ID.findall(prompt)
+    if ids:
+        return [dict(make(n), id=item_id) for n, item_id in enumerate(ids)]
+    return make(0)
+
+
+def _quota_body(per_day: bool, retry_delay: float) -> Dict:
+    quota_id = (
+        "GenerateRequestsPerDayPerProjectPerModel-FreeTier"
+        if per_day else "GenerateRequestsPerMinutePerProjectPerModel-FreeTier"
+    )
+    details = [{
+        "@type": "type.googleapis.com/google.rpc.QuotaFailure",
+        "violations": [{"quotaMetric": "generativelanguage.googleapis.com/generate_content_free_tier_requests", "quotaId": quota_id}],
+    }]
+    if not per_day:
+        details.append({"@type": "type.googleapis.com/google.rpc.RetryInfo", "retryDelay": f"{retry_delay:.0f}s"})
+    return {"error": {"code": 429, "message": "Resource has been exhausted (mock)", "status": "RESOURCE_EXHAUSTED", "details": details}}
+
+
+def make_handler(behaviour: MockBehaviour):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def log_message(self, format, *args):
+            pass
+
+        def _send(self, status: int, payload, headers: Optional[Dict] = None) -> None:
+            data = payload if isinstance(payload, bytes) else json.dumps(payload).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(data)))
+            for name, value in (headers or {}).items():
+                self.send_header(name, value)
+            self.end_headers()
+            self.wfile.write(data)
+
+        def do_GET(self):
+            if self.path == "/stats":
+                with behaviour.lock:
+                    self._send(200, dict(behaviour.counters))
+            else:
+                self._send(404, {"error": {"code": 404, "message": "not found"}})
+
+        def do_POST(self):
+            match = MODEL_PATH.match(self.path)
+            length = int(self.headers.get("Content-Length", 0))
+            raw = self.rfile.read(length)
+            if not match:
+                self._send(404, {"error": {"code": 404, "message": "not found"}})
+                return
+
+            model = match.group(1)
+            key = self.headers.get("x-goog-api-key", "")
+            behaviour.count("requests", f"model:{model}", f"key:{key}")
+
+            if behaviour.roll(behaviour.error_429):
+                per_day = behaviour.roll(behaviour.daily_fraction)
+                behaviour.count("429_per_day" if per_day else "429_per_minute")
+                headers = {} if per_day else {"Retry-After": f"{behaviour.retry_delay:.0f}"}
+                self._send(429, _quota_body(per_day, behaviour.retry_delay), headers)
+                return
+
+            time.sleep(behaviour.latency())
+
+            if behaviour.roll(behaviour.error_500):
+                behaviour.count("500")
+                self._send(500, {"error": {"code": 500, "message": "Internal error (mock)", "status": "INTERNAL"}})
+                return
+
+            try:
+                body = json.loads(raw)
+                text = json.dumps(build_answer(body), ensure_ascii=False)
+            except Exception as e:
+                self._send(400, {"error": {"code": 400, "message": f"bad request: {e}", "status": "INVALID_ARGUMENT"}})
+                return
+
+            if behaviour.roll(behaviour.malformed):
+                behaviour.count("malformed")
+                text = text[: len(text) // 2]
+
+            behaviour.count("ok")
+            prompt_tokens = len(raw) // 4
+            self._send(200, {
+                "candidates": [{"content": {"role": "model", "parts": [{"text": text}]}, "finishReason": "STOP"}],
+                "usageMetadata": {
+                    "promptTokenCount": prompt_tokens,
+                    "candidatesTokenCount": len(text) // 4,
+                    "totalTokenCount": prompt_tokens + len(text) // 4,
+                },
+                "modelVersion": model,
+            })
+
+    return Handler
+
+
+def start_server(behaviour: MockBehaviour, host: str = "127.0.0.1", port: int = 0) -> ThreadingHTTPServer:
+    """Serve in a background thread; port 0 picks a free port"""
+    server = ThreadingHTTPServer((host, port), make_handler(behaviour))
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="mock-gemini", daemon=True).start()
+    return server
+
+
+def add_behaviour_arguments(parser: argparse.ArgumentParser) -> None:
+    parser.add_argument("--latency-ms", type=float, default=500, help="Mean response latency")
+    parser.add_argument("--latency-dist", choices=["fixed", "uniform", "exponential", "lognormal"], default="lognormal")
+    parser.add_argument("--error-429", type=float, default=0.0, help="Probability of a 429 per request")
+    parser.add_argument("--daily-fraction", type=float, default=0.0, help="Share of 429s that are daily quota errors")
+    parser.add_argument("--retry-delay", type=float, default=5.0, help="RetryInfo / Retry-After seconds for per-minute 429s")
+    parser.add_argument("--error-500", type=float, default=0.0, help="Probability of a 500 per request")
+    parser.add_argument("--malformed", type=float, default=0.0, help="Probability of truncated JSON in a 200")
+    parser.add_argument("--seed", type=int, default=None)
+
+
+def behaviour_from_args(args: argparse.Namespace) -> MockBehaviour:
+    return MockBehaviour(
+        latency_ms=args.latency_ms,
+        latency_dist=args.latency_dist,
+        error_429=args.error_429,
+        daily_fraction=args.daily_fraction,
+        retry_delay=args.retry_delay,
+        error_500=args.error_500,
+        malformed=args.malformed,
+        seed=args.seed,
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Offline mock of the Gemini generateContent API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    add_behaviour_arguments(parser)
+    args = parser.parse_args()
+
+    server = start_server(behaviour_from_args(args), args.host, args.port)
+    print(f"🧪 Mock Gemini listening on http://{args.host}:{server.server_port}")
+    print(f"   export GEMINI_API_BASE=http://{args.host}:{server.server_port}")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,147 @@
+"""
+HTML Parser Benchmark
+Compares CPU time per page of the parse_html backends and checks they extract identical output
+
+Usage:
+    python benchmarks/parse_html_bench.py                      # synthetic article pages
+    python benchmarks/parse_html_bench.py page1.html page2.html
+    python benchmarks/parse_html_bench.py https://www.bbc.com/news/articles/...
+
+Exits with status 1 when a backend extracts anything different from
+html.parser, so it can gate a switch of HTML_PARSER on saved real pages.
+"""
+
+import os
+import sys
+import time
+import argparse
+from typing import Callable, Dict, List
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from utils.helpers import (  # noqa: E402
+    HAS_LXML,
+    SelectolaxParser,
+    fetch_url,
+    parse_html,
+    extract_og_image,
+    extract_paragraphs,
+    select_texts,
+)
+
+# The extractions the scrapers actually run on a page
+EXTRACTIONS: Dict[str, Callable] = {
+    "og_image": extract_og_image,
+    "paragraphs": extract_paragraphs,
+    "bbc": lambda doc: select_texts(doc, "p.sc-9a00e533-0, h2.sc-f98b1ad2-0, li.sc-734a601e-0"),
+    "tbs": lambda doc: select_texts(doc, "p.rtejustify, li.rtejustify"),
+    "dailystar": lambda doc: select_texts(doc, "p:not([class])"),
+    "bdpratidin": lambda doc: select_texts(doc, "p", scope="article"),
+}
+
+
+def synthetic_page(paragraphs: int = 60) -> str:
+    """Article-sized page with a head, navigation, body text and footer"""
+    head = (
+        "<head><title>Sample</title>"
+        + "".join(f'<meta name="m{i}" content="v{i}">' for i in range(40))
+        + '<meta property="og:image" content="https://example.com/banner.jpg">'
+        + "".join(f'<script>var x{i} = {i};</script>' for i in range(20))
+        + "</head>"
+    )
+    nav = "<nav>" + "".join(f'<a href="/s{i}">Section {i}</a>' for i in range(80)) + "</nav>"
+    body = "<article>" + "".join(
+        f'<p class="sc-9a00e533-0 rtejustify">Paragraph {i} with <b>bold</b> and <a href="#">link</a> text.</p>'
+        f"<p>Plain paragraph {i} of the story body.</p>"
+        for i in range(paragraphs)
+    ) + "</article>"
+    footer = "<footer>" + "".join(f'<p class="footer">Footer {i}</p>' for i in range(30)) + "</footer>"
+    return f"<!DOCTYPE html><html>{head}<body>{nav}{body}{footer}</body></html>"
+
+
+def malformed_page() -> str:
+    """Tag soup as found on real pages: inline scripts, unclosed and misnested tags"""
+    return (
+        '<html><head><meta property="og:image" content="https://example.com/a.jpg"></head><body>'
+        "<article>"
+        "<p>Story <script>window.ads = [];</script>starts<style>.ad{}</style> here.</p>"
+        "<p>Unclosed <b>bold <i>italic</p> tail</b>"
+        "<p>&nbsp; Entities &amp; spaces </p>"
+        "<p>Embedded<div>block</div>rest</p>"
+        "<p>One<p>Two"
+        "</article></body></html>"
+    )
+
+
+def load_pages(sources: List[str]) -> List[str]:
+    if not sources:
+        return [synthetic_page(), malformed_page()]
+
+    pages = []
+    for source in sources:
+        if source.startswith(("http://", "https://")):
+            html = fetch_url(source)
+        else:
+            with open(source, "r", encoding="utf-8") as f:
+                html = f.read()
+        if html:
+            pages.append(html)
+    return pages
+
+
+def run_backend(backend: str, pages: List[str], iterations: int) -> float:
+    """Average CPU seconds to parse a page and run every extraction"""
+    start = time.process_time()
+    for _ in range(iterations):
+        for html in pages:
+            doc = parse_html(html, backend)
+            for extract in EXTRACTIONS.values():
+                extract(doc)
+    return (time.process_time() - start) / (iterations * len(pages))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark parse_html backends")
+    parser.add_argument("sources", nargs="*", help="HTML files or URLs (default: synthetic page)")
+    parser.add_argument("--iterations", "-n", type=int, default=50)
+    args = parser.parse_args()
+
+    pages = load_pages(args.sources)
+    if not pages:
+        print("❌ No pages to benchmark")
+        return
+
+    backends = ["html.parser"]
+    if HAS_LXML:
+        backends.append("lxml")
+    if SelectolaxParser is not None:
+        backends.append("selectolax")
+
+    # Every backend must extract exactly what html.parser does
+    differences = 0
+    for idx, html in enumerate(pages):
+        page = args.sources[idx] if idx < len(args.sources) else f"synthetic page {idx + 1}"
+        reference = {name: fn(parse_html(html, "html.parser")) for name, fn in EXTRACTIONS.items()}
+        for backend in backends[1:]:
+            doc = parse_html(html, backend)
+            for name, fn in EXTRACTIONS.items():
+                if fn(doc) != reference[name]:
+                    differences += 1
+                    print(f"⚠️  {backend} output differs from html.parser for '{name}' on {page}")
+
+    print(f"\n📊 parse_html CPU time per page ({len(pages)} pages x {args.iterations} iterations)")
+    baseline = None
+    for backend in backends:
+        per_page = run_backend(backend, pages, args.iterations)
+        baseline = baseline or per_page
+        saved = baseline - per_page
+        print(f"   {backend:12} {per_page * 1000:8.2f} ms/page   saved {saved * 1000:7.2f} ms ({saved / baseline:6.1%})")
+
+    if differences:
+        print(f"\n❌ {differences} extraction(s) differ from html.parser; keep HTML_PARSER=html.parser for these pages")
+        sys.exit(1)
+    print("\n✅ Every backend extracted identical output")
+
+
+if __name__ == "__main__":
+    main()
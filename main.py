@@ -5,29 +5,45 @@ Orchestrates all news scrapers and manages execution
 
 import json
 import argparse
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
-from typing import List, Dict
+from typing import List, Dict, Optional
 
 from scrapers import SCRAPERS
-from utils import config
+from utils import config, db_handler, complete_analysis, ArticlePipeline, export_gemini_stats, telegram_dispatcher, http_sessions, result_sink, metrics, RunProfiler
 
 
-def run_scraper(scraper_name: str) -> Dict:
+def _call_scraper(name: str, pipeline: Optional[ArticlePipeline] = None) -> List[Dict]:
+    """Call a registered scraper, handing it a pipeline channel if one is running"""
+    scraper_func = SCRAPERS[name]
+    if pipeline is None:
+        return scraper_func()
+    return scraper_func(pipeline=pipeline.channel(name))
+
+
+def run_scraper(scraper_name: str, use_pipeline: bool = False) -> Dict:
     """Run a single scraper by name"""
     if scraper_name not in SCRAPERS:
         print(f"❌ Unknown scraper: {scraper_name}")
         print(f"Available scrapers: {', '.join(SCRAPERS.keys())}")
         return {"scraper": scraper_name, "status": "error", "articles": []}
     
+    pipeline = ArticlePipeline().start() if use_pipeline else None
+    
     try:
-        scraper_func = SCRAPERS[scraper_name]
-        articles = scraper_func()
+        articles = _call_scraper(scraper_name, pipeline)
+        
+        if pipeline is not None:
+            articles = pipeline.close().get(scraper_name, [])
+        
+        result_sink.close()
         
         return {
             "scraper": scraper_name,
             "status": "success",
             "articles": articles,
-            "count": len(articles)
+            "count": len(articles),
+            "output": result_sink.output(scraper_name)
         }
     except Exception as e:
         print(f"❌ Scraper {scraper_name} failed: {e}")
@@ -37,43 +53,85 @@ def run_scraper(scraper_name: str) -> Dict:
             "articles": [],
             "error": str(e)
         }
+    finally:
+        if pipeline is not None:
+            pipeline.close()
 
 
-def run_all_available_scrapers() -> Dict:
-    """Run all available scrapers"""
-    print("="*70)
-    print("🚀 STARTING ALL NEWS SCRAPERS")
-    print("="*70)
+def _run_source(idx: int, total: int, name: str, pipeline: Optional[ArticlePipeline] = None) -> Dict:
+    """Run one registered scraper, isolating its failures"""
+    try:
+        print(f"\n\n[{idx}/{total}] Running {name.upper()} Scraper...")
+        articles = _call_scraper(name, pipeline)
+        return {
+            "status": "success",
+            "articles": articles,
+            "count": len(articles)
+        }
+        
+    except Exception as e:
+        print(f"❌ {name} failed: {e}")
+        return {
+            "status": "error",
+            "articles": [],
+            "count": 0,
+            "error": str(e)
+        }
+
+
+def _run_sources(names: List[str], parallel: int = 1, use_pipeline: bool = False) -> Dict:
+    """Run scrapers serially or on a bounded worker pool.
     
-    results = {}
+    Each source keeps its own politeness delays and failure handling, so a
+    parallel run finishes when the slowest source does. Results keep the
+    order of ``names`` regardless of completion order. With ``use_pipeline``
+    the scrapers only fetch, and analysis/saving/notification of every
+    source share one staged pipeline that is drained before returning.
+    """
+    total = len(names)
+    pipeline = ArticlePipeline().start() if use_pipeline else None
     
-    for idx, (name, scraper_func) in enumerate(SCRAPERS.items(), 1):
-        try:
-            print(f"\n\n[{idx}/{len(SCRAPERS)}] Running {name.upper()} Scraper...")
-            articles = scraper_func()
-            results[name] = {
-                "status": "success",
-                "articles": articles,
-                "count": len(articles)
+    try:
+        if parallel <= 1 or total <= 1:
+            results = {
+                name: _run_source(idx, total, name, pipeline)
+                for idx, name in enumerate(names, 1)
             }
+        else:
+            workers = min(parallel, total)
+            print(f"⚡ Running {total} scrapers with {workers} parallel workers")
             
-            # Save individual results
-            output_file = f"{name}_articles.json"
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(articles, f, ensure_ascii=False, indent=2)
-            
-        except Exception as e:
-            print(f"❌ {name} failed: {e}")
-            results[name] = {
-                "status": "error",
-                "articles": [],
-                "count": 0,
-                "error": str(e)
-            }
+            with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="scraper") as executor:
+                futures = {
+                    name: executor.submit(_run_source, idx, total, name, pipeline)
+                    for idx, name in enumerate(names, 1)
+                }
+                results = {name: future.result() for name, future in futures.items()}
+    finally:
+        processed = pipeline.close() if pipeline is not None else None
+    
+    # Articles were already streamed to per-source NDJSON files as they were
+    # saved, so results only keep counts and file locations
+    result_sink.close()
     
-    # Print summary
+    for name, result in results.items():
+        articles = result.pop("articles", [])
+        if result["status"] != "success":
+            continue
+        
+        # Only articles that made it through every stage count as processed
+        if processed is not None:
+            articles = processed.get(name, [])
+        result["count"] = len(articles)
+        result["output"] = result_sink.output(name)
+    
+    return results
+
+
+def _print_summary(results: Dict, heading: str) -> None:
+    """Print per-scraper article counts"""
     print("\n\n" + "="*70)
-    print("✅ ALL SCRAPERS COMPLETED!")
+    print(f"✅ {heading} COMPLETED!")
     print("="*70)
     print("\n📊 SUMMARY:")
     
@@ -86,20 +144,40 @@ def run_all_available_scrapers() -> Dict:
     
     print(f"\n   🎯 TOTAL: {total_articles} articles processed")
     print("="*70)
-    
-    # Save combined results
+
+
+def _save_combined_results(results: Dict, prefix: str) -> None:
+    """Save an index of the per-source result files of a multi-scraper run"""
     timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    combined_file = f"all_scrapers_results_{timestamp}.json"
+    combined_file = f"{prefix}_results_{timestamp}.json"
     
+    index = {
+        "generated_at": datetime.now().isoformat(),
+        "format": "ndjson",
+        "compression": result_sink.compression,
+        "sources": results
+    }
     with open(combined_file, 'w', encoding='utf-8') as f:
-        json.dump(results, f, ensure_ascii=False, indent=2)
+        json.dump(index, f, ensure_ascii=False, indent=2)
+    
+    print(f"\n📁 Results index saved to: {combined_file}")
+
+
+def run_all_available_scrapers(parallel: int = 1, use_pipeline: bool = False) -> Dict:
+    """Run all available scrapers"""
+    print("="*70)
+    print("🚀 STARTING ALL NEWS SCRAPERS")
+    print("="*70)
+    
+    results = _run_sources(list(SCRAPERS.keys()), parallel, use_pipeline)
     
-    print(f"\n📁 Combined results saved to: {combined_file}")
+    _print_summary(results, "ALL SCRAPERS")
+    _save_combined_results(results, "all_scrapers")
     
     return results
 
 
-def run_enabled_scrapers() -> Dict:
+def run_enabled_scrapers(parallel: int = 1, use_pipeline: bool = False) -> Dict:
     """Run only enabled scrapers (prothomalo and jagonews24)"""
     # Only these scrapers will run by default
     ENABLED_SCRAPERS = ['bbc']
@@ -109,62 +187,64 @@ def run_enabled_scrapers() -> Dict:
     print(f"📋 Running: {', '.join(ENABLED_SCRAPERS)}")
     print("="*70)
     
-    results = {}
-    
-    for idx, name in enumerate(ENABLED_SCRAPERS, 1):
-        scraper_func = SCRAPERS.get(name)
-        if not scraper_func:
+    names = []
+    for name in ENABLED_SCRAPERS:
+        if name not in SCRAPERS:
             print(f"⚠️  Scraper '{name}' not found, skipping...")
             continue
-        try:
-            print(f"\n\n[{idx}/{len(ENABLED_SCRAPERS)}] Running {name.upper()} Scraper...")
-            articles = scraper_func()
-            results[name] = {
-                "status": "success",
-                "articles": articles,
-                "count": len(articles)
-            }
-            
-            # Save individual results
-            output_file = f"{name}_articles.json"
-            with open(output_file, 'w', encoding='utf-8') as f:
-                json.dump(articles, f, ensure_ascii=False, indent=2)
-            
-        except Exception as e:
-            print(f"❌ {name} failed: {e}")
-            results[name] = {
-                "status": "error",
-                "articles": [],
-                "count": 0,
-                "error": str(e)
-            }
+        names.append(name)
     
-    # Print summary
-    print("\n\n" + "="*70)
-    print("✅ ENABLED SCRAPERS COMPLETED!")
-    print("="*70)
-    print("\n📊 SUMMARY:")
+    results = _run_sources(names, parallel, use_pipeline)
     
-    total_articles = 0
-    for name, result in results.items():
-        count = result.get("count", 0)
-        status = "✓" if result["status"] == "success" else "✗"
-        print(f"   {status} {name:20} {count} articles")
-        total_articles += count
+    _print_summary(results, "ENABLED SCRAPERS")
+    _save_combined_results(results, "enabled_scrapers")
     
-    print(f"\n   🎯 TOTAL: {total_articles} articles processed")
+    return results
+
+
+def complete_triaged_articles(limit: int) -> int:
+    """Run the full AI analysis for stored articles that only got the triage pass"""
+    print("="*70)
+    print(f"🧠 COMPLETING TRIAGED ARTICLES (up to {limit})")
     print("="*70)
     
-    # Save combined results
-    timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
-    combined_file = f"enabled_scrapers_results_{timestamp}.json"
+    articles = db_handler.find_triaged_articles(limit)
+    completed = 0
     
-    with open(combined_file, 'w', encoding='utf-8') as f:
-        json.dump(results, f, ensure_ascii=False, indent=2)
+    for idx, doc in enumerate(articles, 1):
+        print(f"\n[{idx}/{len(articles)}] {doc.get('title', '')[:60]}...")
+        try:
+            analysis = complete_analysis(doc.get("title", ""), doc.get("content", ""))
+            db_handler.update_analysis(doc["source_url"], analysis)
+            completed += 1
+            print(f"   ✅ Full analysis saved")
+        except Exception as e:
+            print(f"   ❌ ERROR: {e}")
     
-    print(f"\n📁 Combined results saved to: {combined_file}")
+    print(f"\n🎯 Completed {completed}/{len(articles)} triaged articles")
+    return completed
+
+
+def _shutdown(profiler: Optional[RunProfiler] = None) -> None:
+    """Flush buffered writes, drain the Telegram outbox and release shared resources
     
-    return results
+    Runs on every exit from main(); a failing step does not stop the rest.
+    """
+    steps = [
+        ("MongoDB", db_handler.close),
+        ("Telegram outbox", telegram_dispatcher.close),
+        ("Profiler", profiler.stop if profiler is not None else None),
+        ("Gemini stats", export_gemini_stats),
+        ("HTTP sessions", http_sessions.close_all),
+        ("Metrics", metrics.export),
+    ]
+    for label, step in steps:
+        if step is None:
+            continue
+        try:
+            step()
+        except Exception as e:
+            print(f"⚠️  {label} shutdown failed: {e}")
 
 
 def main():
@@ -187,6 +267,43 @@ def main():
         help="List all available scrapers"
     )
     
+    parser.add_argument(
+        '--parallel',
+        '-p',
+        type=int,
+        default=config.SCRAPER_PARALLELISM,
+        metavar='N',
+        help="Run up to N scrapers concurrently (default: 1, serial)"
+    )
+    
+    parser.add_argument(
+        '--pipeline',
+        action='store_true',
+        default=config.USE_PIPELINE,
+        help="Run AI analysis, saving and notification as separate pipeline stages"
+    )
+    
+    parser.add_argument(
+        '--complete-triaged',
+        type=int,
+        metavar='N',
+        help="Run the full AI analysis for up to N stored articles that only got triage"
+    )
+    
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help="Sample stacks during the run; writes flamegraph-compatible stacks and a per-source time breakdown"
+    )
+    
+    parser.add_argument(
+        '--profile-interval',
+        type=float,
+        default=config.PROFILE_INTERVAL,
+        metavar='SECONDS',
+        help="Seconds between profiler samples (default: 0.01)"
+    )
+    
     args = parser.parse_args()
     
     # Validate configuration
@@ -202,25 +319,35 @@ def main():
         print("\nUsage:")
         print("  python main.py --scraper <name>  # Run specific scraper")
         print("  python main.py --scraper all     # Run all scrapers")
+        print("  python main.py --parallel 4      # Run up to 4 scrapers at once")
+        print("  python main.py --pipeline        # Overlap fetching with AI/DB/Telegram stages")
+        print("  python main.py --complete-triaged 20  # Full analysis for triaged articles")
+        print("  python main.py --profile         # Flamegraph stacks + per-source time breakdown")
         return
     
-    # Run specific scraper
-    if args.scraper:
-        if args.scraper.lower() == 'all':
-            # Run ALL scrapers (kept for manual use)
-            run_all_available_scrapers()
+    profiler = RunProfiler(interval=args.profile_interval).start() if args.profile else None
+    
+    try:
+        # Finish analyses deferred by GEMINI_ANALYSIS_MODE=tiered
+        if args.complete_triaged:
+            complete_triaged_articles(args.complete_triaged)
+        
+        # Run specific scraper
+        elif args.scraper:
+            if args.scraper.lower() == 'all':
+                # Run ALL scrapers (kept for manual use)
+                run_all_available_scrapers(args.parallel, args.pipeline)
+            else:
+                result = run_scraper(args.scraper.lower(), args.pipeline)
+                
+                # Articles were streamed to the NDJSON file as they were saved
+                if result["status"] == "success" and result["output"]:
+                    print(f"\n📁 Results saved to: {result['output']['path']}")
         else:
-            result = run_scraper(args.scraper.lower())
-            
-            # Save results
-            if result["status"] == "success":
-                output_file = f"{args.scraper}_articles.json"
-                with open(output_file, 'w', encoding='utf-8') as f:
-                    json.dump(result["articles"], f, ensure_ascii=False, indent=2)
-                print(f"\n📁 Results saved to: {output_file}")
-    else:
-        # Default: run only enabled scrapers
-        run_enabled_scrapers()
+            # Default: run only enabled scrapers
+            run_enabled_scrapers(args.parallel, args.pipeline)
+    finally:
+        _shutdown(profiler)
 
 
 if __name__ == "__main__":
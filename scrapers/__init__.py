@@ -11,6 +11,7 @@ from .bbc import scrape_bbc
 from .jagonews24 import scrape_jagonews24
 from .bangla_tribune import scrape_bangla_tribune
 from .bd24live import scrape_bd24live
+from .engine import SourceSpec, run_source
 
 # All available scrapers
 SCRAPERS = {
@@ -26,6 +27,8 @@ SCRAPERS = {
 
 __all__ = [
     'SCRAPERS',
+    'SourceSpec',
+    'run_source',
     'scrape_prothomalo',
     'scrape_dailystar',
     'scrape_tbs',
@@ -0,0 +1,264 @@
+"""
+Scraping Engine
+Generic feed loop driven by a declarative per-source spec
+"""
+
+import time
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Tuple, Union
+
+from pymongo.errors import DuplicateKeyError
+
+from utils import (
+    config,
+    fetch_feed,
+    mark_feed_processed,
+    fetch_url,
+    fetch_until,
+    parse_html,
+    extract_og_image,
+    select_texts,
+    select_first_text,
+    sleep_random,
+    generate_summary_with_gemini,
+    db_handler,
+    send_to_telegram,
+    result_sink,
+    metrics,
+    source_context,
+    PipelineChannel
+)
+
+# Image strategy callables receive the feed entry and the parsed page (or None)
+ImageStrategy = Union[str, Callable[[Dict, Optional[object]], str]]
+
+
+@dataclass
+class SourceSpec:
+    """Declarative description of one news source
+
+    Image strategies:
+      - "og":            og:image of the fetched article page
+      - "media_content": first media:content URL of the feed entry
+      - "guid":          the feed entry's guid
+      - callable:        ``fn(entry, doc)`` for anything site-specific
+    """
+
+    name: str                                   # registry / CLI name
+    label: str                                  # name used in log lines
+    source_name: str                            # stored as article "source"
+    feed_url: str
+    skip_substrings: Tuple[str, ...] = ()       # links containing these are skipped
+    skip_label: str = "video"
+    content_selector: Optional[str] = None      # CSS selector for body text; None = feed summary
+    content_scope: Optional[str] = None         # only search the first element matching this
+    title_selector: Optional[str] = None        # take the title from the page instead of the feed
+    stop_after_tag: Optional[str] = None        # stream the page only up to </tag>
+    image: ImageStrategy = "og"
+    impersonate: Optional[str] = None           # curl_cffi browser fingerprint
+    require_page: bool = False                  # skip entries whose page cannot be fetched
+    list_entries: Optional[Callable[[], List[Dict]]] = None  # non-RSS sources
+
+    @property
+    def needs_page(self) -> bool:
+        return bool(self.content_selector or self.title_selector or self.image == "og")
+
+
+def _feed_entries(spec: SourceSpec) -> Optional[List[Dict]]:
+    """Entries to consider, or None when the feed has not changed"""
+    if spec.list_entries is not None:
+        return spec.list_entries()
+
+    feed = fetch_feed(spec.feed_url)
+    if feed is None:
+        return None
+    return feed.entries
+
+
+def _fetch_page(spec: SourceSpec, link: str):
+    """Fetch and parse an article page; returns None on failure"""
+    try:
+        if spec.stop_after_tag:
+            html = fetch_until(link, spec.stop_after_tag, impersonate=spec.impersonate)
+        else:
+            html = fetch_url(link, impersonate=spec.impersonate)
+        return parse_html(html) if html else None
+    except Exception as e:
+        print(f"   ❌ Failed to extract content: {e}")
+        return None
+
+
+def _extract_image(spec: SourceSpec, entry: Dict, doc) -> str:
+    if callable(spec.image):
+        return spec.image(entry, doc)
+    if spec.image == "og":
+        return extract_og_image(doc) if doc is not None else "NO IMAGE"
+    if spec.image == "media_content":
+        media = entry.get("media_content") or []
+        return media[0].get("url", "NO IMAGE") if media else "NO IMAGE"
+    if spec.image == "guid":
+        return entry.get("guid") or "NO IMAGE"
+    return "NO IMAGE"
+
+
+def _extract_text(spec: SourceSpec, entry: Dict, doc) -> str:
+    if not spec.content_selector:
+        return entry.get("summary", entry.get("description", ""))
+    if doc is None:
+        return "NO CONTENT"
+
+    text_array = select_texts(doc, spec.content_selector, scope=spec.content_scope)
+    return "\n\n".join(text_array) if text_array else "NO CONTENT"
+
+
+def build_article(spec: SourceSpec, entry: Dict) -> Optional[Dict]:
+    """Turn a feed entry into ``article_data`` (None if it must be skipped)"""
+    link = entry.get("link", "")
+
+    doc = None
+    if spec.needs_page:
+        print(f"   🔍 Fetching article content...")
+        doc = _fetch_page(spec, link)
+        if doc is None and spec.require_page:
+            return None
+
+    title = entry.get("title", "")
+    if spec.title_selector:
+        page_title = select_first_text(doc, spec.title_selector) if doc is not None else None
+        title = page_title if page_title is not None else "No Title"
+
+    return {
+        "title": title,
+        "link": link,
+        "image": _extract_image(spec, entry, doc),
+        "full_text": _extract_text(spec, entry, doc),
+        "source": spec.source_name,
+        "published": entry.get("published") or datetime.now().isoformat()
+    }
+
+
+def process_article(article_data: Dict, pipeline: Optional[PipelineChannel] = None) -> bool:
+    """Analyze, save and notify one article, or hand it to the pipeline
+
+    Returns True once the article is saved to MongoDB. False means it was
+    queued (the pipeline records it when saved) or was already stored.
+    """
+    if pipeline is not None:
+        print(f"   📥 Queued for AI analysis")
+        pipeline.submit(article_data)
+        return False
+
+    # Generate AI summary
+    print(f"   🤖 Generating AI analysis...")
+    ai_analysis = generate_summary_with_gemini(article_data["title"], article_data["full_text"])
+    article_data.update(ai_analysis)
+
+    # Save to MongoDB
+    print(f"   💾 Saving to MongoDB...")
+    try:
+        db_handler.create_article(article_data)
+    except DuplicateKeyError:
+        return False
+
+    # Send to Telegram
+    print(f"   📱 Sending to Telegram...")
+    send_to_telegram(article_data)
+    return True
+
+
+def run_source(spec: SourceSpec, pipeline: Optional[PipelineChannel] = None) -> List[Dict]:
+    """Scrape one source described by ``spec``
+
+    When a pipeline channel is given, articles are only fetched here and
+    handed off for analysis, saving and notification. Metrics recorded
+    meanwhile are tagged with the source name.
+    """
+    with source_context(spec.name), metrics.timer("source_seconds"):
+        cpu_started = time.thread_time()
+        try:
+            return _run_source(spec, pipeline)
+        finally:
+            metrics.inc("source_cpu_seconds_total", time.thread_time() - cpu_started)
+
+
+def _run_source(spec: SourceSpec, pipeline: Optional[PipelineChannel] = None) -> List[Dict]:
+    print(f"\n🚀 Starting {spec.label} scraper...")
+    print(f"📡 Fetching feed: {spec.feed_url}\n")
+
+    try:
+        entries = _feed_entries(spec)
+        if entries is None:
+            return []
+
+        articles = []
+        processed_count = 0
+        failed_count = 0
+
+        # Look up every feed link in one query before fetching anything
+        existing_links = db_handler.get_existing_urls(
+            [entry.get("link", "") for entry in entries]
+        )
+
+        for entry in entries:
+            if processed_count >= config.MAX_ARTICLES:
+                break
+
+            link = entry.get("link", "")
+            title = entry.get("title", "") or link
+
+            if any(substring in link for substring in spec.skip_substrings):
+                print(f"⏭️  Skipping {spec.skip_label}: {link}")
+                continue
+
+            # Check if exists
+            if link in existing_links:
+                print(f"⏭️  Already exists: {title[:50]}...")
+                continue
+
+            print(f"\n📰 Processing [{processed_count + 1}]: {title[:60]}...")
+
+            try:
+                article_data = build_article(spec, entry)
+                if not article_data:
+                    failed_count += 1
+                    continue
+
+                if process_article(article_data, pipeline):
+                    result_sink.write(spec.name, article_data)
+                elif pipeline is None:
+                    # Saved meanwhile by another run; nothing left to do
+                    continue
+
+                articles.append(article_data)
+                processed_count += 1
+
+                print(f"   ✅ SUCCESS - Article processed!\n")
+                sleep_random(2, 6)
+
+            except Exception as e:
+                print(f"   ❌ ERROR: {e}\n")
+                failed_count += 1
+                continue
+
+        # Every entry was handled, so an unchanged feed can be skipped next
+        # run. Failed entries must be retried, which a 304 would prevent.
+        if processed_count < config.MAX_ARTICLES and spec.list_entries is None:
+            if failed_count:
+                print(f"⚠️  {failed_count} article(s) failed; feed will be read again next run")
+            elif pipeline is not None:
+                # Articles are still in flight; commit once they are all saved
+                pipeline.on_success(lambda: mark_feed_processed(spec.feed_url))
+            else:
+                mark_feed_processed(spec.feed_url)
+
+        print(f"\n{'='*60}")
+        print(f"✅ {spec.label} scraping completed!")
+        print(f"📊 Total processed: {len(articles)} articles")
+        print(f"{'='*60}\n")
+
+        return articles
+
+    except Exception as e:
+        print(f"\n❌ FATAL ERROR: {e}\n")
+        raise
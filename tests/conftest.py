@@ -0,0 +1,24 @@
+"""
+Test setup: keep the run-wide singletons away from real services and files
+"""
+
+import os
+import sys
+import tempfile
+
+# Must happen before ``utils`` reads its config
+_CACHE_DIR = tempfile.mkdtemp(prefix="scraper-tests-")
+os.environ.update({
+    "CACHE_DIR": _CACHE_DIR,
+    "RESULTS_DIR": _CACHE_DIR,
+    "GEMINI_API_KEYS": "",
+    "GEMINI_HEALTH_ENABLED": "false",
+    "ANALYSIS_CACHE_ENABLED": "false",
+    "SEEN_CACHE_ENABLED": "false",
+    "FEED_CACHE_ENABLED": "false",
+    "METRICS_ENABLED": "false",
+    "MONGODB_URI": "",
+    "TELEGRAM_BOT_TOKEN": "",
+})
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
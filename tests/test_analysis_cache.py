@@ -0,0 +1,39 @@
+"""Content-addressed cache of Gemini analyses"""
+
+import itertools
+
+import utils.analysis_cache as analysis_cache_module
+from utils.analysis_cache import AnalysisCache, content_key
+
+
+def test_content_key_ignores_whitespace_and_case_but_not_prompt_version():
+    key = content_key("Title", "Body  text\n", "v1")
+
+    assert content_key(" title ", "body text", "v1") == key
+    assert content_key("Title", "Body text", "v2") != key
+    assert content_key("Title", "Other text", "v1") != key
+
+
+def test_round_trip_survives_reopening(tmp_path):
+    path = str(tmp_path / "analyses.sqlite3")
+    cache = AnalysisCache(path, max_entries=10)
+    cache.put("k", {"summary_60_bn": "সারাংশ", "importance": 7})
+    cache.close()
+
+    assert AnalysisCache(path, max_entries=10).get("k") == {"summary_60_bn": "সারাংশ", "importance": 7}
+    assert AnalysisCache(path, max_entries=10).get("missing") is None
+
+
+def test_least_recently_used_entry_is_evicted(monkeypatch, tmp_path):
+    clock = itertools.count(1)
+    monkeypatch.setattr(analysis_cache_module.time, "time", lambda: next(clock))
+    cache = AnalysisCache(str(tmp_path / "analyses.sqlite3"), max_entries=2)
+
+    cache.put("a", {"n": 1})
+    cache.put("b", {"n": 2})
+    cache.get("a")
+    cache.put("c", {"n": 3})
+
+    assert cache.get("b") is None
+    assert cache.get("a") == {"n": 1}
+    assert cache.get("c") == {"n": 3}
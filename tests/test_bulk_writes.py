@@ -0,0 +1,99 @@
+"""Buffered MongoDB writes: flush triggers and per-article outcomes"""
+
+import pytest
+from pymongo.errors import BulkWriteError
+
+import utils.database as database
+import utils.pipeline as pipeline_module
+from utils.pipeline import ArticlePipeline
+
+
+class FakeCollection:
+    def __init__(self, write_errors=(), error=None):
+        self.write_errors = list(write_errors)
+        self.error = error
+        self.inserted = []
+
+    def insert_many(self, documents, ordered):
+        assert ordered is False
+        self.inserted.append([document["source_url"] for document in documents])
+        if self.error is not None:
+            raise self.error
+        if self.write_errors:
+            raise BulkWriteError({"writeErrors": self.write_errors})
+
+
+def _article(n):
+    return {"title": f"Story {n}", "link": f"https://example.test/{n}", "published": "2024-01-01T00:00:00Z"}
+
+
+@pytest.fixture
+def handler(monkeypatch):
+    handler = database.MongoDBHandler()
+    handler.client = object()
+    handler.batch_size = 3
+    handler.flush_interval = 0
+    handler.remembered = []
+    monkeypatch.setattr(handler, "_remember", lambda urls: handler.remembered.extend(urls))
+    return handler
+
+
+def test_buffer_flushes_once_the_batch_is_full(handler):
+    handler.articles_collection = FakeCollection()
+    outcomes = []
+    for n in range(2):
+        handler.buffer_article(_article(n), lambda article, outcome: outcomes.append((article["title"], outcome)))
+
+    assert handler.articles_collection.inserted == [] and outcomes == []
+
+    handler.buffer_article(_article(2), lambda article, outcome: outcomes.append((article["title"], outcome)))
+
+    assert len(handler.articles_collection.inserted) == 1
+    assert outcomes == [("Story 0", "saved"), ("Story 1", "saved"), ("Story 2", "saved")]
+
+
+def test_flush_reports_duplicates_apart_from_failures(handler):
+    handler.articles_collection = FakeCollection(write_errors=[
+        {"index": 1, "code": database.DUPLICATE_KEY_ERROR, "errmsg": "E11000 duplicate key"},
+        {"index": 2, "code": 121, "errmsg": "Document failed validation"},
+    ])
+    outcomes = []
+    for n in range(2):
+        handler.buffer_article(_article(n), lambda article, outcome: outcomes.append(outcome))
+    handler.buffer_article(_article(2), lambda article, outcome: outcomes.append(outcome))
+
+    assert outcomes == ["saved", "duplicate", "failed"]
+    # Duplicates are stored already, so the seen-URL cache learns them too
+    assert handler.remembered == ["https://example.test/0", "https://example.test/1"]
+
+
+def test_failed_insert_fails_the_whole_batch(handler):
+    handler.articles_collection = FakeCollection(error=ConnectionError("no primary"))
+    outcomes = []
+    handler.buffer_article(_article(0), lambda article, outcome: outcomes.append(outcome))
+
+    assert handler.flush() == 0
+    assert outcomes == ["failed"]
+    assert handler.flush() == 0  # nothing left buffered
+
+
+def test_pipeline_treats_bulk_duplicates_as_done(monkeypatch, handler):
+    handler.articles_collection = FakeCollection(write_errors=[
+        {"index": 1, "code": database.DUPLICATE_KEY_ERROR, "errmsg": "E11000 duplicate key"},
+    ])
+    handler.batch_size = 10
+    written = []
+    marked = []
+    monkeypatch.setattr(pipeline_module, "db_handler", handler)
+    monkeypatch.setattr(pipeline_module.result_sink, "write", lambda name, article: written.append(article["title"]))
+    pipeline = ArticlePipeline(analyze_workers=1, persist_workers=1, notify_workers=1)
+
+    for n in range(2):
+        assert pipeline._persist(("bbc", _article(n))) is None
+    handler.flush()
+    pipeline.on_success("bbc", lambda: marked.append("bbc"))
+    pipeline.close()
+
+    assert written == ["Story 0"]
+    assert pipeline.notify_stage.queue.qsize() == 1
+    assert pipeline.failures == {} and marked == ["bbc"]
@@ -0,0 +1,92 @@
+"""Feeds are only marked processed when every entry made it into the database"""
+
+import scrapers.engine as engine
+import utils.pipeline as pipeline_module
+from utils.pipeline import ArticlePipeline
+
+SPEC = engine.SourceSpec(
+    name="test", label="Test", source_name="Test", feed_url="https://example.test/rss",
+    image="guid"
+)
+
+ENTRIES = [{"link": f"https://example.test/{i}", "title": f"Story {i}"} for i in range(3)]
+
+
+def _patch_engine(monkeypatch, marked, fail_links=()):
+    monkeypatch.setattr(engine, "_feed_entries", lambda spec: ENTRIES)
+    monkeypatch.setattr(engine.db_handler, "get_existing_urls", lambda links: set())
+    monkeypatch.setattr(engine, "sleep_random", lambda *args: None)
+    monkeypatch.setattr(engine, "mark_feed_processed", marked.append)
+    monkeypatch.setattr(
+        engine, "build_article",
+        lambda spec, entry: None if entry["link"] in fail_links else dict(entry)
+    )
+
+
+def test_feed_marked_when_every_entry_succeeds(monkeypatch):
+    marked = []
+    _patch_engine(monkeypatch, marked)
+    monkeypatch.setattr(engine, "process_article", lambda article, pipeline=None: True)
+    monkeypatch.setattr(engine.result_sink, "write", lambda name, article: None)
+
+    engine._run_source(SPEC)
+
+    assert marked == [SPEC.feed_url]
+
+
+def test_feed_not_marked_when_page_fetch_fails(monkeypatch):
+    marked = []
+    _patch_engine(monkeypatch, marked, fail_links=(ENTRIES[1]["link"],))
+    monkeypatch.setattr(engine, "process_article", lambda article, pipeline=None: True)
+    monkeypatch.setattr(engine.result_sink, "write", lambda name, article: None)
+
+    engine._run_source(SPEC)
+
+    assert marked == []
+
+
+def test_feed_not_marked_when_processing_raises(monkeypatch):
+    marked = []
+    _patch_engine(monkeypatch, marked)
+
+    def process(article, pipeline=None):
+        if article["link"] == ENTRIES[2]["link"]:
+            raise RuntimeError("Gemini down")
+        return True
+
+    monkeypatch.setattr(engine, "process_article", process)
+    monkeypatch.setattr(engine.result_sink, "write", lambda name, article: None)
+
+    engine._run_source(SPEC)
+
+    assert marked == []
+
+
+def _run_pipeline(monkeypatch, marked, failed_title=None):
+    def summarize(articles):
+        return [None if title == failed_title else {"summary": "ok"} for title, _ in articles]
+
+    monkeypatch.setattr(pipeline_module, "generate_summaries_with_gemini", summarize)
+    monkeypatch.setattr(pipeline_module.db_handler, "batch_size", 1)
+    monkeypatch.setattr(pipeline_module.db_handler, "create_article", lambda article: article)
+    monkeypatch.setattr(pipeline_module.db_handler, "flush", lambda: 0)
+    monkeypatch.setattr(pipeline_module, "send_to_telegram", lambda article: True)
+    monkeypatch.setattr(pipeline_module.result_sink, "write", lambda name, article: None)
+    _patch_engine(monkeypatch, marked)
+
+    with ArticlePipeline(analyze_workers=1, persist_workers=1, notify_workers=1, queue_size=4) as pipeline:
+        engine._run_source(SPEC, pipeline.channel(SPEC.name))
+        # Nothing is committed while articles are still in flight
+        assert marked == []
+
+
+def test_pipeline_marks_feed_after_articles_are_saved(monkeypatch):
+    marked = []
+    _run_pipeline(monkeypatch, marked)
+    assert marked == [SPEC.feed_url]
+
+
+def test_pipeline_skips_marking_when_analysis_fails(monkeypatch):
+    marked = []
+    _run_pipeline(monkeypatch, marked, failed_title="Story 1")
+    assert marked == []
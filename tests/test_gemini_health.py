@@ -0,0 +1,53 @@
+"""Key/model health carried over between runs"""
+
+import pytest
+
+from utils.config import config
+from utils.gemini_ai import GeminiAPIManager, GeminiWorkerPool
+from utils.gemini_health import GeminiHealthStore, key_fingerprint
+
+
+def test_parks_and_samples_survive_a_round_trip(tmp_path):
+    store = GeminiHealthStore(str(tmp_path / "health.json"))
+    before = GeminiAPIManager(["k1", "k2"])
+    model = before.models[0]
+    before.park("k1", model, seconds=600)
+    before.record("k2", model, True, 1.5)
+    store.save(before.export_health())
+
+    after = GeminiAPIManager(["k1", "k2"])
+    assert after.restore_health(store.load()) == 1
+
+    assert after.seconds_until_available("k1") == 0  # other models are free
+    assert ("k1", model) in after.parked_until
+    assert list(after.pair_stats[("k2", model)].samples) == [(True, 1.5)]
+    assert key_fingerprint("k1") in store.load()["keys"]
+
+
+def test_expired_parks_and_unknown_keys_are_ignored():
+    manager = GeminiAPIManager(["k1"])
+    state = {"keys": {
+        key_fingerprint("k1"): {"models": {manager.models[0]: {"parked_until": "2000-01-01T00:00:00+00:00"}}},
+        key_fingerprint("gone"): {"disabled_until": "2999-01-01T00:00:00+00:00"},
+    }}
+
+    assert manager.restore_health(state) == 0
+    assert manager.parked_until == {}
+
+
+def test_restored_long_parks_fail_requests_instead_of_hanging(monkeypatch):
+    monkeypatch.setattr(config, "GEMINI_MAX_PARK_WAIT", 120)
+    before = GeminiAPIManager(["k1"])
+    for model in before.models:
+        before.park("k1", model, seconds=6 * 3600)
+
+    after = GeminiAPIManager(["k1"])
+    after.restore_health(before.export_health())
+    pool = GeminiWorkerPool(after, concurrency_per_key=1, rpm=0, tpm=0)
+    try:
+        future = pool.submit("hello")
+        assert future.done()
+        with pytest.raises(ValueError):
+            future.result()
+    finally:
+        pool.close()
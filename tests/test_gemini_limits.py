@@ -0,0 +1,120 @@
+"""Per-key and per-model rate limits, and reading 429 responses"""
+
+import pytest
+
+import utils.gemini_ai as gemini_ai
+from utils.config import config
+from utils.gemini_ai import (
+    GeminiAPIManager,
+    GeminiKeyUnavailable,
+    GeminiWorkerPool,
+    RateBudget,
+    TokenBucket,
+    _quota_error,
+)
+
+
+class FakeResponse:
+    def __init__(self, body=None, headers=None):
+        self._body = body
+        self.headers = headers or {}
+
+    def json(self):
+        if self._body is None:
+            raise ValueError("no JSON")
+        return self._body
+
+
+def test_token_bucket_allows_rpm_then_reports_wait():
+    bucket = TokenBucket(rpm=2)
+
+    assert bucket.try_acquire() == 0
+    assert bucket.try_acquire() == 0
+    assert 0 < bucket.try_acquire() <= 30
+
+
+def test_token_bucket_unlimited_and_drain():
+    assert TokenBucket(rpm=0).try_acquire() == 0
+
+    bucket = TokenBucket(rpm=60)
+    bucket.drain()
+    assert bucket.try_acquire() > 0
+
+
+def test_rate_budget_release_returns_the_slot():
+    budget = RateBudget(rpm=1, tpm=0)
+    event = budget.acquire(100)
+
+    budget.release(event)
+    budget.release(event)  # second release is a no-op
+
+    # Would block for the whole window if the slot were still taken
+    assert budget.acquire(100) is not event
+
+
+def test_rate_budget_settle_replaces_estimate():
+    budget = RateBudget(rpm=0, tpm=1000)
+    event = budget.acquire(900)
+    budget.settle(event, 50)
+
+    assert budget.acquire(900)[1] == 900
+
+
+def test_quota_error_reads_retry_info_and_daily_quota():
+    error = _quota_error(FakeResponse({"error": {
+        "message": "Quota exceeded",
+        "details": [
+            {"@type": "type.googleapis.com/google.rpc.QuotaFailure",
+             "violations": [{"quotaId": "GenerateRequestsPerDayPerProjectPerModel"}]},
+            {"@type": "type.googleapis.com/google.rpc.RetryInfo", "retryDelay": "37s"},
+        ],
+    }}))
+
+    assert error.retry_after == 37
+    assert error.per_day
+    assert "Quota exceeded" in str(error)
+
+
+def test_quota_error_falls_back_to_retry_after_header():
+    error = _quota_error(FakeResponse(headers={"Retry-After": "12"}))
+
+    assert error.retry_after == 12
+    assert not error.per_day
+
+
+def test_rate_limited_key_returns_budget_and_waits(monkeypatch):
+    """A key that could not serve a job must not re-take it and burn its budget"""
+    monkeypatch.setattr(config, "GEMINI_MAX_PARK_WAIT", 120)
+    pool = GeminiWorkerPool(GeminiAPIManager(["only-key"]), concurrency_per_key=1, rpm=10, tpm=0)
+    calls = []
+
+    def request(prompt, key, *args):
+        calls.append(key)
+        if len(calls) == 1:
+            raise GeminiKeyUnavailable(0.3)
+        return {}, "m", 0
+
+    monkeypatch.setattr(gemini_ai, "_request_with_key", request)
+    try:
+        assert pool.request("hello") == ({}, "m")
+    finally:
+        pool.close()
+
+    assert calls == ["only-key", "only-key"]
+    # Only the request that was actually answered holds a slot
+    assert len(pool.budgets["only-key"]._events) == 1
+
+
+def test_job_fails_when_key_wait_exceeds_park_limit(monkeypatch):
+    monkeypatch.setattr(config, "GEMINI_MAX_PARK_WAIT", 10)
+    pool = GeminiWorkerPool(GeminiAPIManager(["only-key"]), concurrency_per_key=1, rpm=0, tpm=0)
+
+    def request(prompt, key, *args):
+        raise GeminiKeyUnavailable(600)
+
+    monkeypatch.setattr(gemini_ai, "_request_with_key", request)
+    try:
+        with pytest.raises(ValueError):
+            pool.request("hello")
+    finally:
+        pool.close()
@@ -0,0 +1,92 @@
+"""GeminiWorkerPool: requests never wait forever for a parked key"""
+
+import threading
+
+import pytest
+
+import utils.gemini_ai as gemini_ai
+from utils.config import config
+from utils.gemini_ai import GeminiAPIManager, GeminiWorkerPool
+
+KEYS = ["key-a", "key-b"]
+
+
+@pytest.fixture
+def manager():
+    return GeminiAPIManager(list(KEYS))
+
+
+@pytest.fixture
+def pool(manager):
+    pool = GeminiWorkerPool(manager, concurrency_per_key=1, rpm=0, tpm=0)
+    yield pool
+    pool.close()
+
+
+def _park_everything(manager, seconds):
+    for key in KEYS:
+        for model in manager.get_all_models():
+            manager.park(key, model, seconds=seconds)
+
+
+def test_request_goes_through_a_worker(monkeypatch, pool):
+    monkeypatch.setattr(gemini_ai, "_request_with_key", lambda prompt, key, *args: ({"ok": prompt}, "m", 10))
+
+    assert pool.request("hello") == ({"ok": "hello"}, "m")
+
+
+def test_submit_fails_at_once_when_every_key_is_parked(monkeypatch, manager, pool):
+    monkeypatch.setattr(config, "GEMINI_MAX_PARK_WAIT", 120)
+    _park_everything(manager, 3600)
+
+    future = pool.submit("hello")
+
+    assert future.done()
+    with pytest.raises(ValueError, match="All Gemini models and keys failed"):
+        future.result()
+
+
+def test_queued_jobs_fail_once_parks_exceed_the_wait(monkeypatch, manager, pool):
+    monkeypatch.setattr(config, "GEMINI_MAX_PARK_WAIT", 120)
+    _park_everything(manager, 60)
+    future = pool.submit("hello")
+    assert not future.done()
+
+    # The limit shrinks below the parks: the reaper must not leave it queued
+    monkeypatch.setattr(config, "GEMINI_MAX_PARK_WAIT", 10)
+    pool._fail_exhausted()
+
+    with pytest.raises(ValueError):
+        future.result(timeout=1)
+    assert pool.queue.empty()
+
+
+def test_job_fails_after_every_key_failed(monkeypatch, pool):
+    calls = []
+
+    def failing(prompt, key, *args):
+        calls.append(key)
+        raise RuntimeError("server error")
+
+    monkeypatch.setattr(gemini_ai, "_request_with_key", failing)
+
+    with pytest.raises(ValueError):
+        pool.request("hello")
+    assert sorted(calls) == sorted(KEYS)
+
+
+def test_request_times_out_and_cancels_the_job(monkeypatch, pool):
+    release = threading.Event()
+
+    def slow(prompt, key, *args):
+        release.wait(5)
+        return {}, "m", 0
+
+    monkeypatch.setattr(gemini_ai, "_request_with_key", slow)
+    monkeypatch.setattr(config, "GEMINI_REQUEST_TIMEOUT", 0.2)
+
+    with pytest.raises(TimeoutError):
+        pool.request("hello")
+    # A late answer for the abandoned request must not break the worker
+    release.set()
+    assert pool.request("again") == ({}, "m")
@@ -0,0 +1,54 @@
+"""Model routing from rolling success rate and latency"""
+
+import pytest
+
+from utils.config import config
+from utils.gemini_ai import GeminiAPIManager, RollingStats
+
+
+def test_rolling_stats_window_and_percentiles():
+    stats = RollingStats(window=3)
+    for ok, latency in [(True, 9.0), (True, 1.0), (False, 2.0), (True, 3.0)]:
+        stats.record(ok, latency)
+
+    assert len(stats.samples) == 3
+    assert stats.requests == 4 and stats.failures == 1
+    assert stats.consecutive_failures == 0
+    assert stats.percentile(50) == 2.0
+    # Laplace smoothing: 2 successes of 3 -> 3/5
+    assert stats.success_rate() == pytest.approx(0.6)
+
+
+def test_route_prefers_faster_reliable_model(monkeypatch):
+    monkeypatch.setattr(config, "GEMINI_ROUTING_MIN_SAMPLES", 2)
+    manager = GeminiAPIManager(["k"])
+    slow, fast = manager.models[0], manager.models[1]
+    for _ in range(3):
+        manager.record("k", slow, True, 20.0)
+        manager.record("k", fast, True, 1.0)
+
+    route = manager.route("k")
+    assert route.index(fast) < route.index(slow)
+    # An explicit preference goes first while its circuit is closed
+    assert manager.route("k", prefer=slow)[0] == slow
+
+
+def test_repeated_failures_open_the_circuit(monkeypatch):
+    monkeypatch.setattr(config, "GEMINI_CIRCUIT_FAILURES", 2)
+    monkeypatch.setattr(config, "GEMINI_CIRCUIT_COOLDOWN", 60)
+    manager = GeminiAPIManager(["k"])
+    broken = manager.models[0]
+    manager.record("k", broken, False, 1.0)
+    manager.record("k", broken, False, 1.0)
+
+    assert broken not in manager.route("k")
+    assert broken not in manager.route("k", prefer=broken)
+
+
+def test_route_returns_every_model_when_all_circuits_are_open(monkeypatch):
+    monkeypatch.setattr(config, "GEMINI_CIRCUIT_FAILURES", 1)
+    manager = GeminiAPIManager(["k"])
+    for model in manager.models:
+        manager.record("k", model, False, 1.0)
+
+    assert sorted(manager.route("k")) == sorted(manager.models)
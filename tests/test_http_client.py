@@ -0,0 +1,80 @@
+"""Pooled async HTTP client: per-host sessions, fetch retries and received bytes"""
+
+import asyncio
+
+import pytest
+
+import utils.helpers as helpers
+from utils.http_client import AsyncHTTPClient, http_client
+from utils.metrics import MetricsRegistry, source_context
+
+
+class FakeResponse:
+    def __init__(self, status_code, text=""):
+        self.status_code = status_code
+        self.text = text
+        self.content = text.encode("utf-8")
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+
+class FakeSession:
+    def __init__(self, *responses):
+        self.responses = list(responses)
+        self.urls = []
+
+    async def get(self, url):
+        self.urls.append(url)
+        return self.responses.pop(0)
+
+
+@pytest.fixture
+def client(monkeypatch):
+    async def no_sleep(seconds):
+        pass
+
+    monkeypatch.setattr(asyncio, "sleep", no_sleep)
+    return AsyncHTTPClient(per_host_limit=2)
+
+
+def test_sessions_are_pooled_per_host_and_fingerprint(client):
+    plain = client._session("example.test", None)
+
+    assert client._session("example.test", None) is plain
+    assert client._session("example.test", "safari260") is not plain
+    assert client._session("other.test", None) is not plain
+    assert client._semaphore("example.test") is client._semaphore("example.test")
+
+
+def test_fetch_retries_then_returns_the_page(monkeypatch, client):
+    session = FakeSession(FakeResponse(503), FakeResponse(200, "<html>ok</html>"))
+    monkeypatch.setattr(client, "_session", lambda host, impersonate: session)
+
+    assert asyncio.run(client.fetch("https://example.test/a")) == "<html>ok</html>"
+    assert len(session.urls) == 2
+
+
+def test_fetch_gives_up_after_max_retries(monkeypatch, client):
+    session = FakeSession(*(FakeResponse(500) for _ in range(2)))
+    monkeypatch.setattr(client, "_session", lambda host, impersonate: session)
+
+    assert asyncio.run(client.fetch("https://example.test/a", max_retries=2)) is None
+
+
+def test_fetch_url_records_received_bytes_under_the_callers_source(monkeypatch, client):
+    registry = MetricsRegistry()
+    registry.enabled = True
+    session = FakeSession(FakeResponse(503, "busy"), FakeResponse(200, "<p>খবর</p>"))
+    monkeypatch.setattr(helpers, "metrics", registry)
+    monkeypatch.setattr(http_client, "_session", lambda host, impersonate: session)
+
+    with source_context("bbc"):
+        assert helpers.fetch_url("https://example.test/a") == "<p>খবর</p>"
+
+    downloaded = {
+        row["labels"]["source"]: row["value"]
+        for row in registry.snapshot()["counters"] if row["name"] == "download_bytes_total"
+    }
+    assert downloaded == {"bbc": len("busy") + len("<p>খবর</p>".encode("utf-8"))}
@@ -0,0 +1,106 @@
+"""Streamed fetches stop early and retry from a clean parser state"""
+
+import asyncio
+import threading
+
+import pytest
+
+from utils.http_client import AsyncHTTPClient, ReceivedBytes
+
+
+class FakeStream:
+    def __init__(self, chunks, fail_after=None):
+        self.chunks = chunks
+        self.fail_after = fail_after
+        self.charset = "utf-8"
+        self.quit_now = threading.Event()
+        self.read = 0
+
+    def raise_for_status(self):
+        pass
+
+    async def aiter_content(self):
+        for chunk in self.chunks:
+            if self.read == self.fail_after:
+                raise ConnectionError("connection reset")
+            self.read += 1
+            yield chunk.encode("utf-8")
+
+    async def aclose(self):
+        pass
+
+
+class FakeSession:
+    def __init__(self, *responses):
+        self.responses = list(responses)
+
+    async def request(self, method, url, stream=False):
+        return self.responses.pop(0)
+
+
+@pytest.fixture
+def client(monkeypatch):
+    async def no_sleep(seconds):
+        pass
+
+    monkeypatch.setattr(asyncio, "sleep", no_sleep)
+    return AsyncHTTPClient(per_host_limit=2)
+
+
+def _use(monkeypatch, client, *responses):
+    session = FakeSession(*responses)
+    monkeypatch.setattr(client, "_session", lambda host, impersonate: session)
+
+
+def test_meta_stream_stops_once_fields_are_found(monkeypatch, client):
+    response = FakeStream([
+        '<html><head><meta property="og:image" content="https://img">',
+        "<title>t</title></head><body>",
+        "<p>never needed</p>",
+    ])
+    _use(monkeypatch, client, response)
+
+    meta = asyncio.run(client.fetch_meta("https://example.test/a", fields=["og:image"]))
+
+    assert meta == {"og:image": "https://img"}
+    assert response.read == 1 and response.quit_now.is_set()
+
+
+def test_until_stream_stops_after_the_element_closes(monkeypatch, client):
+    response = FakeStream(["<article>body", "</article>", "<footer>tail</footer>"])
+    _use(monkeypatch, client, response)
+
+    html = asyncio.run(client.fetch_until("https://example.test/a", "article"))
+
+    assert html == "<article>body</article>"
+    assert response.read == 2
+
+
+def test_retry_after_a_failed_stream_starts_a_fresh_extractor(monkeypatch, client):
+    broken = FakeStream(["<article>partial", "<p>never</p>"], fail_after=1)
+    retried = FakeStream(["<article>body", "</article>", "<footer>tail</footer>"])
+    _use(monkeypatch, client, broken, retried)
+
+    html = asyncio.run(client.fetch_until("https://example.test/a", "article"))
+
+    # A reused parser would still be one <article> deep and read to the end
+    assert html == "<article>body</article>"
+    assert retried.read == 2 and retried.quit_now.is_set()
+
+
+def test_meta_is_empty_when_every_attempt_fails(monkeypatch, client):
+    _use(monkeypatch, client, *(FakeStream(["<head>"], fail_after=0) for _ in range(2)))
+
+    assert asyncio.run(client.fetch_meta("https://example.test/a", max_retries=2)) == {}
+
+
+def test_received_bytes_count_raw_chunks_of_every_attempt(monkeypatch, client):
+    broken = FakeStream(["<article>ক", "<p>never</p>"], fail_after=1)
+    retried = FakeStream(["<article>body", "</article>", "<footer>tail</footer>"])
+    _use(monkeypatch, client, broken, retried)
+    received = ReceivedBytes()
+
+    asyncio.run(client.fetch_until("https://example.test/a", "article", received=received))
+
+    # The Bangla letter is three bytes on the wire; the unread footer is not counted
+    assert received.total == len("<article>ক".encode("utf-8")) + len("<article>body</article>")
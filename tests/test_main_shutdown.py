@@ -0,0 +1,65 @@
+"""main() drains and closes shared resources on every exit path"""
+
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+import main
+
+
+@pytest.fixture
+def calls(monkeypatch):
+    calls = []
+
+    class FakeProfiler:
+        def __init__(self, interval):
+            pass
+
+        def start(self):
+            return self
+
+        def stop(self):
+            calls.append("profiler")
+
+    monkeypatch.setattr(main.config, "validate", lambda: True)
+    monkeypatch.setattr(main, "RunProfiler", FakeProfiler)
+    monkeypatch.setattr(main, "db_handler", SimpleNamespace(close=lambda: calls.append("mongo")))
+    monkeypatch.setattr(main, "telegram_dispatcher", SimpleNamespace(close=lambda: calls.append("telegram")))
+    monkeypatch.setattr(main, "export_gemini_stats", lambda: calls.append("gemini"))
+    monkeypatch.setattr(main, "http_sessions", SimpleNamespace(close_all=lambda: calls.append("sessions")))
+    monkeypatch.setattr(main, "metrics", SimpleNamespace(export=lambda: calls.append("metrics")))
+    return calls
+
+
+def test_shutdown_runs_in_order_after_a_normal_run(monkeypatch, calls):
+    monkeypatch.setattr(sys, "argv", ["main.py", "--profile"])
+    monkeypatch.setattr(main, "run_enabled_scrapers", lambda parallel, pipeline: calls.append("run"))
+
+    main.main()
+
+    assert calls == ["run", "mongo", "telegram", "profiler", "gemini", "sessions", "metrics"]
+
+
+def test_shutdown_runs_when_the_run_raises(monkeypatch, calls):
+    def interrupted(limit):
+        raise KeyboardInterrupt
+
+    monkeypatch.setattr(sys, "argv", ["main.py", "--complete-triaged", "5"])
+    monkeypatch.setattr(main, "complete_triaged_articles", interrupted)
+
+    with pytest.raises(KeyboardInterrupt):
+        main.main()
+
+    assert calls == ["mongo", "telegram", "gemini", "sessions", "metrics"]
+
+
+def test_failing_shutdown_step_does_not_skip_the_rest(monkeypatch, calls):
+    def broken():
+        raise RuntimeError("disk full")
+
+    monkeypatch.setattr(main, "export_gemini_stats", broken)
+
+    main._shutdown()
+
+    assert calls == ["mongo", "telegram", "sessions", "metrics"]
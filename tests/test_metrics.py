@@ -0,0 +1,88 @@
+"""Run metrics registry and its Prometheus text output"""
+
+import json
+import threading
+
+from utils.metrics import MetricsRegistry, current_source, source_context
+
+
+def _registry():
+    registry = MetricsRegistry()
+    registry.enabled = True
+    return registry
+
+
+def test_source_label_comes_from_context():
+    registry = _registry()
+    with source_context("bbc"):
+        assert current_source() == "bbc"
+        registry.inc("articles_total")
+        registry.inc("articles_total", source="override")
+    registry.inc("articles_total")
+
+    counters = {row["labels"]["source"]: row["value"] for row in registry.snapshot()["counters"]}
+    assert counters == {"bbc": 1, "override": 1, "-": 1}
+    assert current_source() == "-"
+
+
+def test_source_context_is_per_thread():
+    seen = []
+    with source_context("bbc"):
+        thread = threading.Thread(target=lambda: seen.append(current_source()))
+        thread.start()
+        thread.join()
+    assert seen == ["-"]
+
+
+def test_histogram_snapshot():
+    registry = _registry()
+    for seconds in (0.004, 0.2, 3.0):
+        registry.observe("fetch_seconds", seconds, source="bbc")
+
+    row = registry.snapshot()["histograms"][0]
+    assert row["count"] == 3
+    assert row["max"] == 3.0
+    assert row["p50"] == 0.25
+    assert row["buckets"]["0.005"] == 1
+
+
+def test_prometheus_text_format():
+    registry = _registry()
+    registry.inc("gemini_requests_total", model="flash", status=200, source="bbc")
+    registry.inc("gemini_requests_total", model="flash", status=429, source="bbc")
+    registry.observe("fetch_seconds", 0.3, source='we"ird')
+    registry.observe("fetch_seconds", 12.0, source='we"ird')
+
+    lines = registry.prometheus_text().splitlines()
+
+    assert lines.count("# TYPE scraper_gemini_requests_total counter") == 1
+    assert 'scraper_gemini_requests_total{model="flash",source="bbc",status="429"} 1' in lines
+    assert "# TYPE scraper_fetch_seconds histogram" in lines
+    # Buckets are cumulative and end with +Inf == count
+    assert 'scraper_fetch_seconds_bucket{source="we\\"ird",le="0.25"} 0' in lines
+    assert 'scraper_fetch_seconds_bucket{source="we\\"ird",le="0.5"} 1' in lines
+    assert 'scraper_fetch_seconds_bucket{source="we\\"ird",le="+Inf"} 2' in lines
+    assert 'scraper_fetch_seconds_count{source="we\\"ird"} 2' in lines
+    assert any(line.startswith("scraper_run_duration_seconds ") for line in lines)
+
+
+def test_disabled_registry_records_nothing(tmp_path):
+    registry = MetricsRegistry()
+    registry.enabled = False
+    registry.inc("x")
+    with registry.timer("y"):
+        pass
+
+    assert registry.snapshot()["counters"] == []
+    assert registry.export(str(tmp_path / "m.json"), str(tmp_path / "m.prom")) is None
+
+
+def test_export_writes_json_and_textfile(tmp_path):
+    registry = _registry()
+    registry.inc("articles_total", source="bbc")
+    json_path, prom_path = tmp_path / "m.json", tmp_path / "m.prom"
+
+    registry.export(str(json_path), str(prom_path))
+
+    assert json.loads(json_path.read_text())["counters"][0]["value"] == 1
+    assert 'scraper_articles_total{source="bbc"} 1' in prom_path.read_text()
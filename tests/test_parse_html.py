@@ -0,0 +1,43 @@
+"""HTML backends must extract what html.parser does on the pages scrapers read"""
+
+import pytest
+
+from utils.config import config
+from utils.helpers import (
+    HAS_LXML,
+    SelectolaxParser,
+    _parser_backend,
+    parse_html,
+    select_texts,
+    extract_og_image,
+)
+
+BACKENDS = ["html.parser"] + (["lxml"] if HAS_LXML else []) + (["selectolax"] if SelectolaxParser else [])
+
+PAGE = (
+    '<html><head><meta property="og:image" content="https://example.com/a.jpg">'
+    "<script>var tracking = 1;</script></head><body><article>"
+    "<p>Story <script>window.ads = [];</script>starts<style>.ad{}</style> here.</p>"
+    '<p class="lead">Second <b>bold</b> &amp; <a href="#">linked</a>.</p>'
+    "<template><p>Hidden template</p></template>"
+    "</article></body></html>"
+)
+
+
+def test_default_backend_is_html_parser():
+    assert config.HTML_PARSER == "html.parser"
+    assert _parser_backend() == "html.parser"
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_script_and_style_text_is_skipped(backend):
+    doc = parse_html(PAGE, backend)
+
+    assert select_texts(doc, "p") == ["Story starts here.", "Second bold & linked."]
+    assert extract_og_image(doc) == "https://example.com/a.jpg"
+
+
+@pytest.mark.parametrize("backend", BACKENDS)
+def test_scoped_selection_matches_html_parser(backend):
+    reference = select_texts(parse_html(PAGE, "html.parser"), "p.lead", scope="article")
+    assert select_texts(parse_html(PAGE, backend), "p.lead", scope="article") == reference
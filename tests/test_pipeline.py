@@ -0,0 +1,130 @@
+"""Pipeline stages: batching, backpressure, drain order and success callbacks"""
+
+import threading
+from types import SimpleNamespace
+
+import pytest
+
+import utils.pipeline as pipeline_module
+from utils.config import config
+from utils.pipeline import ArticlePipeline, BatchStage, Stage
+
+
+def _jobs(n, name="bbc"):
+    return [(name, {"title": f"Story {i}"}) for i in range(n)]
+
+
+def test_full_queue_blocks_the_producer_until_the_stage_drains():
+    handled = []
+    stage = Stage("slow", lambda job: handled.append(job[1]["title"]), workers=1, queue_size=1)
+    stage.put(("bbc", {"title": "first"}))
+
+    producer = threading.Thread(target=stage.put, args=(("bbc", {"title": "second"}),))
+    producer.start()
+    producer.join(0.2)
+    assert producer.is_alive()
+
+    stage.start()
+    producer.join(5)
+    stage.stop()
+
+    assert not producer.is_alive()
+    assert handled == ["first", "second"]
+
+
+def test_batch_stage_groups_jobs_and_drains_on_stop():
+    batches = []
+    downstream = Stage("sink", lambda job: None, workers=1, queue_size=10)
+    stage = BatchStage(
+        "analyze", lambda batch: batches.append([job[1]["title"] for job in batch]) or batch,
+        workers=1, queue_size=10, batch_size=2, max_wait=0.05, downstream=downstream
+    )
+    for job in _jobs(5):
+        stage.put(job)
+
+    stage.start()
+    stage.stop()
+
+    assert batches == [["Story 0", "Story 1"], ["Story 2", "Story 3"], ["Story 4"]]
+    assert [downstream.queue.get()[1]["title"] for _ in range(5)] == [f"Story {i}" for i in range(5)]
+
+
+def test_failed_batch_reports_every_job_and_forwards_nothing():
+    failed = []
+    downstream = Stage("sink", lambda job: None, workers=1, queue_size=10)
+
+    def broken(batch):
+        raise RuntimeError("quota")
+
+    stage = BatchStage(
+        "analyze", broken, workers=1, queue_size=10, batch_size=3, max_wait=0.05,
+        downstream=downstream, on_error=failed.append
+    )
+    for job in _jobs(2, "bbc") + _jobs(1, "tbs"):
+        stage.put(job)
+
+    stage.start()
+    stage.stop()
+
+    assert sorted(failed) == ["bbc", "bbc", "tbs"]
+    assert downstream.queue.empty()
+
+
+@pytest.fixture
+def events(monkeypatch):
+    events = []
+    lock = threading.Lock()
+
+    def record(*event):
+        with lock:
+            events.append(event)
+
+    def analyze(articles):
+        for title, _ in articles:
+            record("analyze", title)
+        return [None if "fails" in title else {"summary_60_bn": "সারাংশ"} for title, _ in articles]
+
+    monkeypatch.setattr(config, "GEMINI_BATCH_SIZE", 2)
+    monkeypatch.setattr(config, "GEMINI_BATCH_WAIT", 0.01)
+    monkeypatch.setattr(pipeline_module, "generate_summaries_with_gemini", analyze)
+    monkeypatch.setattr(pipeline_module, "db_handler", SimpleNamespace(
+        batch_size=1, flush=lambda: 0,
+        create_article=lambda article: record("persist", article["title"])
+    ))
+    monkeypatch.setattr(pipeline_module, "send_to_telegram", lambda article: record("notify", article["title"]))
+    monkeypatch.setattr(pipeline_module.result_sink, "write", lambda name, article: None)
+    return events
+
+
+def _run(articles, callbacks=()):
+    pipeline = ArticlePipeline(analyze_workers=2, persist_workers=2, notify_workers=1, queue_size=2).start()
+    for name, callback in callbacks:
+        pipeline.on_success(name, callback)
+    for name, title in articles:
+        pipeline.channel(name).submit({"title": title, "full_text": "body"})
+    return pipeline, pipeline.close()
+
+
+def test_close_drains_every_stage_in_order(events):
+    articles = [("bbc" if i % 2 else "tbs", f"Story {i}") for i in range(7)]
+
+    _, results = _run(articles)
+
+    assert sorted(article["title"] for found in results.values() for article in found) == \
+        sorted(title for _, title in articles)
+    for _, title in articles:
+        stages = [stage for stage, event_title in events if event_title == title]
+        assert stages == ["analyze", "persist", "notify"]
+
+
+def test_success_callbacks_only_run_for_channels_without_failures(events):
+    marked = []
+
+    pipeline, results = _run(
+        [("bbc", "Story 1"), ("tbs", "Story fails"), ("tbs", "Story 2")],
+        callbacks=[("bbc", lambda: marked.append("bbc")), ("tbs", lambda: marked.append("tbs"))]
+    )
+
+    assert marked == ["bbc"]
+    assert pipeline.failures == {"tbs": 1}
+    assert [article["title"] for article in results["tbs"]] == ["Story 2"]
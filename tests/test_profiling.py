@@ -0,0 +1,99 @@
+"""Per-source time breakdown of a profiled run"""
+
+import utils.database as database
+import utils.pipeline as pipeline_module
+from utils.config import config
+from utils.metrics import MetricsRegistry, source_context
+from utils.pipeline import BatchStage
+from utils.profiling import source_breakdown
+
+
+def _registry():
+    registry = MetricsRegistry()
+    registry.enabled = True
+    return registry
+
+
+def test_serial_run_subtracts_inline_work(monkeypatch):
+    monkeypatch.setattr(config, "TELEGRAM_ASYNC", False)
+    registry = _registry()
+    with source_context("bbc"):
+        registry.observe("source_seconds", 10.0)
+        registry.inc("source_cpu_seconds_total", 1.0)
+        registry.observe("fetch_seconds", 2.0)
+        registry.observe("gemini_analysis_seconds", 4.0)
+        registry.observe("mongo_seconds", 0.5, op="insert_one")
+        registry.observe("telegram_send_seconds", 0.5, method="sendPhoto")
+        registry.inc("sleep_seconds_total", 1.0)
+
+    row = source_breakdown(registry.snapshot())["bbc"]
+
+    assert row["background"] == []
+    assert row["other"] == 1.0
+
+
+def test_pipelined_run_reports_stage_time_as_background(monkeypatch):
+    monkeypatch.setattr(config, "TELEGRAM_ASYNC", True)
+    registry = _registry()
+    with source_context("bbc"):
+        registry.observe("source_seconds", 10.0)
+        registry.inc("source_cpu_seconds_total", 1.0)
+        registry.observe("fetch_seconds", 5.0)
+        registry.observe("mongo_seconds", 0.5, op="find_existing")
+    # Work done for bbc on other threads, longer than its scraper ran
+    registry.inc("pipeline_stage_share_seconds_total", 30.0, stage="analyze", source="bbc")
+    registry.observe("gemini_analysis_seconds", 50.0, source="mixed")
+    registry.observe("mongo_seconds", 2.0, op="insert_many", source="bbc")
+    registry.observe("telegram_send_seconds", 1.0, method="sendPhoto", source="bbc")
+
+    row = source_breakdown(registry.snapshot())["bbc"]
+
+    assert row["gemini"] == 30.0
+    assert row["mongo"] == 2.5
+    assert row["telegram"] == 1.0
+    assert sorted(row["background"]) == ["gemini", "mongo", "telegram"]
+    # Only scraper-thread time is taken from wall
+    assert row["other"] == 3.5
+
+
+def test_mixed_batch_time_is_shared_by_article_count(monkeypatch):
+    registry = _registry()
+    monkeypatch.setattr(pipeline_module, "metrics", registry)
+    stage = BatchStage("analyze", lambda jobs: [], workers=1, queue_size=10, batch_size=10, max_wait=0.5)
+    for name in ("bbc", "bbc", "bbc", "tbs"):
+        stage.put((name, {}))
+    stage.start()
+    stage.stop()
+
+    shares = {
+        row["labels"]["source"]: row["value"]
+        for row in registry.snapshot()["counters"] if row["name"] == "pipeline_stage_share_seconds_total"
+    }
+    assert set(shares) == {"bbc", "tbs"}
+    assert abs(shares["bbc"] - 3 * shares["tbs"]) < 1e-9
+
+
+def test_bulk_flush_is_charged_to_buffering_sources(monkeypatch):
+    class FakeCollection:
+        def insert_many(self, documents, ordered):
+            return None
+
+    registry = _registry()
+    handler = database.db_handler
+    monkeypatch.setattr(database, "metrics", registry)
+    monkeypatch.setattr(handler, "articles_collection", FakeCollection())
+    monkeypatch.setattr(handler, "client", object())
+    monkeypatch.setattr(handler, "batch_size", 100)
+    monkeypatch.setattr(handler, "flush_interval", 0)
+    monkeypatch.setattr(handler, "_remember", lambda urls: list(urls))
+    for name in ("bbc", "tbs", "tbs"):
+        with source_context(name):
+            handler.buffer_article({"title": "t", "link": f"https://{name}", "published": "2024-01-01T00:00:00"})
+
+    assert handler.flush() == 3
+
+    documents = {
+        (row["labels"]["source"], row["labels"]["status"]): row["value"]
+        for row in registry.snapshot()["counters"] if row["name"] == "mongo_documents_total"
+    }
+    assert documents == {("bbc", "saved"): 1, ("tbs", "saved"): 2}
@@ -0,0 +1,92 @@
+"""Local repair of Gemini analysis and triage objects"""
+
+import pytest
+
+from utils.gemini_ai import _validator, repair_analysis, repair_triage
+
+
+def _mcq(answer="Dhaka"):
+    return {"question": "Where?", "options": ["Dhaka", "Sylhet", "Khulna", "Rajshahi"], "correct_answer": answer}
+
+
+def _analysis(**overrides):
+    analysis = {
+        "category": "politics",
+        "summary_60_bn": "বাংলা সারাংশ",
+        "summary_60_en": "English summary",
+        "importance": 7,
+        "clickbait_score": 1,
+        "clickbait_reason": "",
+        "corrected_title": "",
+        "keywords": ["election", "dhaka"],
+        "mcqs": [_mcq()],
+    }
+    analysis.update(overrides)
+    return analysis
+
+
+def test_valid_analysis_is_kept():
+    repaired = repair_analysis(_analysis())
+
+    assert repaired["category"] == "Politics"
+    assert repaired["importance"] == 7
+    assert repaired["mcqs"] == [_mcq()]
+
+
+def test_numbers_are_coerced_and_clamped():
+    repaired = repair_analysis(_analysis(importance="12", clickbait_score="4.6"))
+
+    assert repaired["importance"] == 10
+    assert repaired["clickbait_score"] == 5
+
+
+def test_missing_importance_defaults_and_bad_clickbait_is_zero():
+    repaired = repair_analysis(_analysis(importance="high", clickbait_score=None))
+
+    assert repaired["importance"] == 5
+    assert repaired["clickbait_score"] == 0
+
+
+def test_corrected_title_only_kept_for_clickbait():
+    assert repair_analysis(_analysis(clickbait_score=1, corrected_title="Calmer"))["corrected_title"] == ""
+    assert repair_analysis(_analysis(clickbait_score=4, corrected_title="Calmer"))["corrected_title"] == "Calmer"
+
+
+def test_keywords_are_normalised():
+    repaired = repair_analysis(_analysis(keywords="Election!, ঢাকা, #Vote, , a, b, c"))
+
+    assert repaired["keywords"] == ["election", "ঢাকা", "vote", "a"]
+
+
+def test_mcq_letter_answers_are_resolved_and_bad_mcqs_dropped():
+    broken = {"question": "Bad", "options": ["only", "two"], "correct_answer": "only"}
+    repaired = repair_analysis(_analysis(mcqs=[_mcq("B)"), broken, _mcq("E")]))
+
+    assert [mcq["correct_answer"] for mcq in repaired["mcqs"]] == ["Sylhet"]
+
+
+@pytest.mark.parametrize("broken", [
+    None,
+    [],
+    _analysis(category=""),
+    _analysis(summary_60_en="  "),
+    _analysis(mcqs=[{"question": "Q", "options": ["a", "b", "c", "d"], "correct_answer": "z"}]),
+])
+def test_unrepairable_analysis_returns_none(broken):
+    assert repair_analysis(broken) is None
+
+
+def test_repair_triage():
+    assert repair_triage({"category": "sports news", "importance": "3", "keywords": ["Cricket"]}) == {
+        "category": "Sports", "importance": 3, "keywords": ["cricket"]
+    }
+    assert repair_triage({"category": "Sports"}) is None
+    assert repair_triage("not an object") is None
+
+
+def test_validator_raises_so_the_next_model_is_tried():
+    validate = _validator(repair_triage)
+
+    assert validate({"category": "World", "importance": 2})["importance"] == 2
+    with pytest.raises(ValueError):
+        validate({"importance": 2})
@@ -0,0 +1,75 @@
+"""Per-source NDJSON result files, written only for saved articles"""
+
+import gzip
+import json
+
+import pytest
+from pymongo.errors import DuplicateKeyError
+
+import scrapers.engine as engine
+from utils.result_sink import ResultSink
+
+
+def _lines(path, opener=open):
+    with opener(path, "rt", encoding="utf-8") as f:
+        return [json.loads(line) for line in f]
+
+
+def test_writes_one_line_per_article(tmp_path):
+    sink = ResultSink(str(tmp_path), "none")
+    sink.write("bbc", {"title": "One", "published": "2024-01-01"})
+    sink.write("bbc", {"title": "Two"})
+
+    output = sink.output("bbc")
+    assert output["count"] == 2
+    # Uncompressed lines are readable before close
+    assert [row["title"] for row in _lines(output["path"])] == ["One", "Two"]
+    assert sink.output("tbs") is None
+    sink.close()
+
+
+def test_gzip_appends_after_close(tmp_path):
+    sink = ResultSink(str(tmp_path), "gzip")
+    sink.write("tbs", {"title": "First"})
+    sink.close()
+    sink.write("tbs", {"title": "Second"})
+    sink.close()
+
+    path = sink.output("tbs")["path"]
+    assert path.endswith(".ndjson.gz")
+    assert [row["title"] for row in _lines(path, gzip.open)] == ["First", "Second"]
+
+
+def test_unknown_compression_falls_back_to_plain(tmp_path):
+    assert ResultSink(str(tmp_path), "brotli").compression == "none"
+
+
+@pytest.fixture
+def serial(monkeypatch):
+    written, notified = [], []
+    monkeypatch.setattr(engine, "generate_summary_with_gemini", lambda title, text: {"summary_60_en": "s"})
+    monkeypatch.setattr(engine, "send_to_telegram", notified.append)
+    monkeypatch.setattr(engine.result_sink, "write", lambda name, article: written.append(article))
+    return written, notified
+
+
+def test_process_article_reports_saved(monkeypatch, serial):
+    monkeypatch.setattr(engine.db_handler, "create_article", lambda article: {"data": {"id": "1"}})
+
+    assert engine.process_article({"title": "t", "full_text": "x"}) is True
+    assert len(serial[1]) == 1
+
+
+def test_duplicate_is_not_saved_or_written(monkeypatch, serial):
+    def duplicate(article):
+        raise DuplicateKeyError("E11000")
+
+    monkeypatch.setattr(engine.db_handler, "create_article", duplicate)
+    monkeypatch.setattr(engine, "_feed_entries", lambda spec: [{"link": "https://a", "title": "A"}])
+    monkeypatch.setattr(engine.db_handler, "get_existing_urls", lambda links: set())
+    monkeypatch.setattr(engine, "sleep_random", lambda *args: None)
+    monkeypatch.setattr(engine, "mark_feed_processed", lambda url: None)
+    spec = engine.SourceSpec(name="t", label="T", source_name="T", feed_url="https://f", image="guid")
+
+    assert engine._run_source(spec) == []
+    assert serial == ([], [])
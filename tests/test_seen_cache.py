@@ -0,0 +1,30 @@
+"""Persistent seen-URL cache in front of MongoDB lookups"""
+
+import sqlite3
+
+from utils.seen_cache import SeenURLCache
+
+
+def test_added_urls_are_seen_after_reopening(tmp_path):
+    path = str(tmp_path / "seen.sqlite3")
+    cache = SeenURLCache(path, ttl_days=30, capacity=100)
+    cache.add_many(["https://a", "https://b", ""])
+    cache.close()
+
+    reopened = SeenURLCache(path, ttl_days=30, capacity=100)
+    assert reopened.filter_seen(["https://a", "https://b", "https://c"]) == {"https://a", "https://b"}
+    assert not reopened.contains("https://c")
+
+
+def test_expired_entries_are_evicted(tmp_path):
+    path = str(tmp_path / "seen.sqlite3")
+    cache = SeenURLCache(path, ttl_days=1, capacity=100)
+    cache.add("https://old")
+    cache.close()
+
+    conn = sqlite3.connect(path)
+    conn.execute("UPDATE seen_urls SET seen_at = 0")
+    conn.commit()
+    conn.close()
+
+    assert SeenURLCache(path, ttl_days=1, capacity=100).filter_seen(["https://old"]) == set()
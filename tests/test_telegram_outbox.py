@@ -0,0 +1,180 @@
+"""Telegram outbox persistence and dispatcher send outcomes"""
+
+import sqlite3
+
+import pytest
+
+import utils.telegram as telegram
+from utils.config import config
+from utils.metrics import MetricsRegistry
+from utils.telegram import TelegramDispatcher, TelegramOutbox
+
+
+class FakeResponse:
+    def __init__(self, status_code, body=None, text=""):
+        self.status_code = status_code
+        self._body = body or {}
+        self.text = text
+
+    def json(self):
+        return self._body
+
+    def raise_for_status(self):
+        if self.status_code >= 400:
+            raise RuntimeError(f"HTTP {self.status_code}")
+
+
+@pytest.fixture
+def outbox(tmp_path):
+    return TelegramOutbox(str(tmp_path / "outbox.sqlite3"))
+
+
+@pytest.fixture
+def dispatcher(outbox):
+    return TelegramDispatcher(outbox)
+
+
+def test_outbox_survives_reopening(outbox):
+    outbox.add("chat", "message", "sendMessage", {"text": "hello"}, "bbc")
+    outbox.add("chat", "digest", "sendMessage", {"title": "small story"}, "tbs")
+
+    reopened = TelegramOutbox(outbox.path)
+    row_id, chat_id, method, payload, attempts, source = reopened.next_message(now=float("inf"))
+
+    assert (chat_id, method, payload, attempts, source) == ("chat", "sendMessage", {"text": "hello"}, 0, "bbc")
+    assert [(item, source) for _, item, _, source in reopened.digest_items()["chat"]] == [({"title": "small story"}, "tbs")]
+    assert reopened.count() == 2
+
+    reopened.delete([row_id])
+    assert reopened.next_message(now=float("inf")) is None
+
+
+def test_rescheduled_message_waits_until_due(outbox):
+    outbox.add("chat", "message", "sendMessage", {"text": "hello"})
+    row_id = outbox.next_message(now=0)[0]
+
+    outbox.reschedule(row_id, {"text": "plain"}, attempts=1, next_attempt=100)
+
+    assert outbox.next_message(now=50) is None
+    assert outbox.next_message(now=100)[3:] == ({"text": "plain"}, 1, "-")
+    assert outbox.next_due_at() == 100
+
+
+def test_successful_send_deletes_the_message(monkeypatch, outbox, dispatcher):
+    monkeypatch.setattr(telegram, "_post", lambda method, payload: FakeResponse(200))
+    outbox.add("chat", "message", "sendMessage", {"text": "hello"})
+
+    dispatcher._send(*dispatcher._next_job())
+
+    assert outbox.count() == 0
+    assert dispatcher.sent == 1
+
+
+def test_rate_limit_keeps_the_message_and_pauses_the_chat(monkeypatch, outbox, dispatcher):
+    monkeypatch.setattr(
+        telegram, "_post",
+        lambda method, payload: FakeResponse(429, {"parameters": {"retry_after": 30}})
+    )
+    outbox.add("chat", "message", "sendMessage", {"text": "hello"})
+
+    dispatcher._send(*dispatcher._next_job())
+
+    assert outbox.count() == 1
+    assert dispatcher._chat_ready["chat"] > telegram.time.monotonic() + 25
+
+
+def test_rejected_message_is_dropped(monkeypatch, outbox, dispatcher):
+    monkeypatch.setattr(telegram, "_post", lambda method, payload: FakeResponse(400, text="chat not found"))
+    outbox.add("chat", "message", "sendMessage", {"text": "hello"})
+
+    dispatcher._send(*dispatcher._next_job())
+
+    assert outbox.count() == 0
+    assert dispatcher.dropped == 1
+
+
+def test_failed_send_is_retried_with_backoff(monkeypatch, outbox, dispatcher):
+    def fail(method, payload):
+        raise ConnectionError("offline")
+
+    monkeypatch.setattr(telegram, "_post", fail)
+    outbox.add("chat", "message", "sendMessage", {"text": "hello"})
+
+    dispatcher._send(*dispatcher._next_job())
+
+    assert outbox.next_message(now=telegram.time.time()) is None
+    assert outbox.next_message(now=float("inf"))[4] == 1
+
+
+def test_digest_waits_until_full(monkeypatch, outbox, dispatcher):
+    monkeypatch.setattr(config, "TELEGRAM_DIGEST_SIZE", 2)
+    monkeypatch.setattr(config, "TELEGRAM_DIGEST_MAX_WAIT", 3600)
+    outbox.add("chat", "digest", "sendMessage", {"title": "One [x]", "link": "https://a", "source": "A"})
+    assert dispatcher._next_job() is None
+
+    outbox.add("chat", "digest", "sendMessage", {"title": "Two", "link": "https://b", "source": "B"})
+    chat_id, send = dispatcher._next_job()
+
+    assert send["digest"] and len(send["ids"]) == 2
+    assert "One \\[x]" in send["payload"]["text"]
+
+
+def test_close_sends_pending_digest(monkeypatch, outbox, dispatcher):
+    sent = []
+    monkeypatch.setattr(config, "TELEGRAM_DIGEST_SIZE", 10)
+    monkeypatch.setattr(config, "TELEGRAM_DIGEST_MAX_WAIT", 3600)
+    monkeypatch.setattr(telegram, "_post", lambda method, payload: sent.append(payload) or FakeResponse(200))
+    outbox.add("chat", "digest", "sendMessage", {"title": "Only one", "link": "https://a", "source": "A"})
+
+    assert dispatcher.close(timeout=5) == 0
+    assert len(sent) == 1
+
+
+def test_rate_limited_plain_digest_resend_keeps_the_items(monkeypatch, outbox, dispatcher):
+    responses = [
+        FakeResponse(400, text="Bad Request: can't parse entities"),
+        FakeResponse(429, {"parameters": {"retry_after": 30}}),
+    ]
+    sent = []
+    monkeypatch.setattr(config, "TELEGRAM_DIGEST_SIZE", 1)
+    monkeypatch.setattr(telegram, "_post", lambda method, payload: sent.append(payload) or responses.pop(0))
+    outbox.add("chat", "digest", "sendMessage", {"title": "Broken *markdown", "link": "https://a", "source": "A"})
+
+    dispatcher._send(*dispatcher._next_job())
+
+    assert "parse_mode" not in sent[1]
+    assert outbox.count() == 1 and dispatcher.dropped == 0
+    assert dispatcher._chat_ready["chat"] > telegram.time.monotonic() + 20
+
+
+def test_outbox_from_older_runs_gets_a_source_column(tmp_path):
+    path = str(tmp_path / "old.sqlite3")
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE outbox (id INTEGER PRIMARY KEY AUTOINCREMENT, chat_id TEXT NOT NULL, kind TEXT NOT NULL, "
+        "method TEXT NOT NULL, payload TEXT NOT NULL, created_at REAL NOT NULL, "
+        "attempts INTEGER NOT NULL DEFAULT 0, next_attempt REAL NOT NULL DEFAULT 0)"
+    )
+    conn.execute("INSERT INTO outbox (chat_id, kind, method, payload, created_at) VALUES ('c', 'message', 'sendMessage', '{}', 0)")
+    conn.commit()
+    conn.close()
+
+    assert TelegramOutbox(path).next_message(now=1)[5] == "-"
+
+
+def test_send_time_is_charged_to_the_queueing_sources(monkeypatch, outbox, dispatcher):
+    registry = MetricsRegistry()
+    registry.enabled = True
+    monkeypatch.setattr(telegram, "metrics", registry)
+    monkeypatch.setattr(config, "TELEGRAM_DIGEST_SIZE", 3)
+    monkeypatch.setattr(telegram, "_post", lambda method, payload: FakeResponse(200))
+    for source in ("bbc", "bbc", "tbs"):
+        outbox.add("chat", "digest", "sendMessage", {"title": "t", "link": "l", "source": "s"}, source)
+
+    dispatcher._send(*dispatcher._next_job())
+
+    snapshot = registry.snapshot()
+    sends = {row["labels"]["source"]: row["count"] for row in snapshot["histograms"]}
+    sent = {row["labels"]["source"]: row["value"] for row in snapshot["counters"]}
+    assert sends == {"bbc": 1, "tbs": 1}
+    assert sent == {"bbc": 2, "tbs": 1}
@@ -0,0 +1,105 @@
+"""Paragraph trimming and the input token cap applied before Gemini requests"""
+
+import pytest
+
+from utils.text_budget import TokenBudget, apply_token_budget, estimate_tokens, truncate_to_tokens
+
+
+@pytest.fixture
+def budget():
+    return TokenBudget(max_tokens=0, trim_boilerplate=True)
+
+
+@pytest.mark.parametrize("paragraph", [
+    "Read more: Floods hit Sylhet again",
+    "Related stories",
+    "Subscribe to our newsletter",
+    "Sign up for breaking news alerts!",
+    "Follow us on Facebook and Twitter",
+    "© 2024 The Daily Star. All rights reserved.",
+    "Copyright 2024 BBC",
+    "Advertisement",
+    "Share this article",
+    "আরও পড়ুন: বন্যায় ক্ষতিগ্রস্ত সিলেট",
+    "বিজ্ঞাপন",
+    "আমাদের ফেসবুক পেজ ফলো করুন",
+    "সর্বস্বত্ব সংরক্ষিত",
+])
+def test_page_furniture_is_dropped(budget, paragraph):
+    text = budget.apply(f"The story starts here.\n\n{paragraph}")
+    assert text == "The story starts here."
+
+
+@pytest.mark.parametrize("paragraph", [
+    "The minister said copyright law will be amended next year.",
+    "A newsletter ban for students was also proposed.",
+    "Police urged residents to follow us-issued guidance on evacuation routes.",
+    "Related talks will continue in Dhaka next week.",
+    "সম্পর্কিত মন্ত্রণালয় বিষয়টি খতিয়ে দেখছে।",
+])
+def test_story_sentences_mentioning_furniture_words_are_kept(budget, paragraph):
+    text = budget.apply(f"The story starts here.\n\n{paragraph}")
+    assert paragraph in text
+
+
+def test_repeats_inside_one_article_are_dropped(budget):
+    text = budget.apply("First.\n\nSecond.\n\n  first.  \n\nThird.")
+    assert text == "First.\n\nSecond.\n\nThird."
+
+
+def test_updated_story_keeps_paragraphs_seen_in_earlier_article(budget):
+    body = "Rescue teams reached the site.\n\nRoads remain closed.\n\nOfficials gave no cause."
+    budget.apply(f"Death toll rises to five.\n\n{body}")
+
+    updated = budget.apply(f"UPDATE: death toll rises to seven.\n\n{body}")
+
+    assert updated == f"UPDATE: death toll rises to seven.\n\n{body}"
+
+
+def test_token_cap_keeps_lead_paragraphs():
+    budget = TokenBudget(max_tokens=10, trim_boilerplate=False)
+    lead, second = "a" * 24, "b" * 24
+
+    assert budget.apply(f"{lead}\n\n{second}") == lead
+
+
+def test_oversized_lead_is_cut_not_dropped():
+    budget = TokenBudget(max_tokens=5, trim_boilerplate=False)
+    assert budget.apply("x" * 100) == "x" * 20
+    assert budget.apply("ক" * 100) == "ক" * 5
+
+
+def test_bangla_counts_a_token_per_character():
+    assert estimate_tokens("a" * 40) == 10
+    assert estimate_tokens("ক" * 40) == 40
+    # Spaces and punctuation between Bangla words stay cheap
+    assert estimate_tokens("বন্যা " * 8) == 5 * 8 + 8 // 4
+
+
+def test_truncation_fits_the_estimate():
+    text = "Dhaka ঢাকা " * 50
+    cut = truncate_to_tokens(text, 30)
+
+    assert text.startswith(cut) and estimate_tokens(cut) <= 30
+    # Five repeats (115 quarter tokens) fit in the 120 quarter-token budget
+    assert len(cut) >= 5 * len("Dhaka ঢাকা ")
+
+
+def test_bangla_cap_keeps_fewer_characters_than_english():
+    budget = TokenBudget(max_tokens=10, trim_boilerplate=False)
+    lead, second = "ক" * 8, "খ" * 8
+
+    assert budget.apply(f"{lead}\n\n{second}") == lead
+
+
+def test_stats_and_tokens_saved():
+    budget = TokenBudget(max_tokens=0, trim_boilerplate=True)
+    budget.apply("Story.\n\nAdvertisement")
+
+    stats = budget.stats.snapshot()
+    assert stats["articles"] == 1
+    assert stats["paragraphs_dropped"] == 1
+
+    text, saved = apply_token_budget("Story text.\n\n" + "Advertisement\n\n" * 20)
+    assert text == "Story text."
+    assert saved == estimate_tokens("Story text.\n\n" + "Advertisement\n\n" * 20) - estimate_tokens(text)
@@ -0,0 +1,103 @@
+"""Tiered analysis: triage routing, notification of triage-only articles and --complete-triaged"""
+
+import pytest
+
+import main
+import utils.gemini_ai as gemini_ai
+import utils.telegram as telegram
+from utils.config import config
+from utils.telegram import TelegramDispatcher, TelegramOutbox
+
+ARTICLES = [(f"Story {i}", f"Body {i}") for i in range(3)]
+
+
+@pytest.fixture
+def tiered(monkeypatch):
+    monkeypatch.setattr(config, "GEMINI_ANALYSIS_MODE", "tiered")
+    monkeypatch.setattr(config, "GEMINI_FULL_ANALYSIS_THRESHOLD", 6)
+    monkeypatch.setattr(gemini_ai, "analysis_cache", None)
+
+
+def _fake_tiers(monkeypatch, importances, calls):
+    def analyze_tier(tier, articles, indices, prompt_text):
+        calls.append((tier.name, list(indices)))
+        if tier is gemini_ai.TRIAGE_TIER:
+            return {idx: {"category": "national", "importance": importances[idx], "keywords": []} for idx in indices}
+        return {idx: {"summary_60_bn": f"সারাংশ {idx}", "importance": importances[idx]} for idx in indices}
+
+    monkeypatch.setattr(gemini_ai, "_analyze_tier", analyze_tier)
+
+
+def test_only_important_articles_get_the_full_analysis(monkeypatch, tiered):
+    calls = []
+    _fake_tiers(monkeypatch, [3, 5, 8], calls)
+
+    results = gemini_ai._analyze_articles(ARTICLES)
+
+    assert calls == [("triage", [0, 1, 2]), ("full", [2])]
+    assert [result["analysis_tier"] for result in results] == ["triage", "triage", "full"]
+    assert results[1]["summary_60_bn"] == "" and results[1]["mcqs"] == []
+    assert results[2]["summary_60_bn"] == "সারাংশ 2"
+
+
+def test_failed_triage_falls_back_to_the_full_analysis(monkeypatch, tiered):
+    calls = []
+
+    def analyze_tier(tier, articles, indices, prompt_text):
+        calls.append((tier.name, list(indices)))
+        if tier is gemini_ai.TRIAGE_TIER:
+            return {idx: None for idx in indices}
+        return {idx: {"summary_60_bn": "সারাংশ", "importance": 4} for idx in indices}
+
+    monkeypatch.setattr(gemini_ai, "_analyze_tier", analyze_tier)
+
+    results = gemini_ai._analyze_articles(ARTICLES[:1])
+
+    assert calls == [("triage", [0]), ("full", [0])]
+    assert results[0]["analysis_tier"] == "full"
+
+
+def test_triage_only_articles_go_to_the_digest(monkeypatch, tmp_path):
+    monkeypatch.setattr(config, "TELEGRAM_DIGEST_THRESHOLD", 4)
+    outbox = TelegramOutbox(str(tmp_path / "outbox.sqlite3"))
+    dispatcher = TelegramDispatcher(outbox)
+    monkeypatch.setattr(dispatcher, "start", lambda: None)
+
+    dispatcher.submit({"title": "Triaged", "importance": 5, "analysis_tier": "triage", "summary_60_bn": ""})
+    dispatcher.submit({"title": "Analysed", "importance": 5, "analysis_tier": "full", "summary_60_bn": "সারাংশ"})
+
+    digest = [item["title"] for _, item, _, _ in outbox.digest_items()[str(config.TELEGRAM_CHAT_ID)]]
+    message = outbox.next_message(now=float("inf"))
+    assert digest == ["Triaged"]
+    assert "Analysed" in message[3]["text"]
+
+
+def test_inline_send_skips_triage_only_articles(monkeypatch):
+    monkeypatch.setattr(config, "TELEGRAM_BOT_TOKEN", "token")
+    monkeypatch.setattr(config, "TELEGRAM_CHAT_ID", "chat")
+    monkeypatch.setattr(config, "TELEGRAM_ASYNC", False)
+    posted = []
+    monkeypatch.setattr(telegram, "_post", lambda method, payload: posted.append(payload))
+
+    assert telegram.send_to_telegram({"title": "Triaged", "importance": 5, "analysis_tier": "triage"}) is False
+    assert posted == []
+
+
+def test_complete_triaged_updates_each_completed_article(monkeypatch):
+    stored = [
+        {"source_url": "https://a", "title": "A", "content": "body a"},
+        {"source_url": "https://b", "title": "B", "content": "body b"},
+    ]
+    updated = []
+
+    def complete(title, content):
+        if title == "B":
+            raise ValueError("AI analysis failed")
+        return {"summary_60_bn": "সারাংশ", "analysis_tier": "full"}
+
+    monkeypatch.setattr(main.db_handler, "find_triaged_articles", lambda limit: stored[:limit])
+    monkeypatch.setattr(main.db_handler, "update_analysis", lambda url, analysis: updated.append((url, analysis)))
+    monkeypatch.setattr(main, "complete_analysis", complete)
+
+    assert main.complete_triaged_articles(5) == 1
+    assert updated == [("https://a", {"summary_60_bn": "সারাংশ", "analysis_tier": "full"})]
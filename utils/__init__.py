@@ -4,27 +4,67 @@ Common utilities for news scrapers
 """
 
 from .config import config
+from .metrics import metrics, source_context
+from .http_client import http_client
 from .helpers import (
     sleep_random,
     fetch_url,
+    fetch_meta,
+    fetch_until,
     parse_html,
     extract_og_image,
     extract_paragraphs,
+    select_texts,
+    select_first_text,
+    select_attr,
+    select_attrs,
     convert_to_utc_plus_6
 )
-from .gemini_ai import generate_summary_with_gemini
+from .feeds import fetch_feed, mark_feed_processed
+from .gemini_ai import (
+    generate_summary_with_gemini,
+    generate_summaries_with_gemini,
+    complete_analysis,
+    export_gemini_stats
+)
 from .database import db_handler
-from .telegram import send_to_telegram
+from .telegram import send_to_telegram, telegram_dispatcher
+from .http_sessions import http_sessions, get_session
+from .result_sink import ResultSink, result_sink
+from .pipeline import ArticlePipeline, PipelineChannel
+from .profiling import RunProfiler
 
 __all__ = [
     'config',
+    'metrics',
+    'source_context',
+    'http_client',
     'sleep_random',
     'fetch_url',
+    'fetch_meta',
+    'fetch_until',
     'parse_html',
     'extract_og_image',
     'extract_paragraphs',
+    'select_texts',
+    'select_first_text',
+    'select_attr',
+    'select_attrs',
     'convert_to_utc_plus_6',
+    'fetch_feed',
+    'mark_feed_processed',
     'generate_summary_with_gemini',
+    'generate_summaries_with_gemini',
+    'complete_analysis',
+    'export_gemini_stats',
     'db_handler',
     'send_to_telegram',
+    'telegram_dispatcher',
+    'http_sessions',
+    'get_session',
+    'ResultSink',
+    'result_sink',
+    'ArticlePipeline',
+    'PipelineChannel',
+    'RunProfiler',
 ]
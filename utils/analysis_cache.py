@@ -0,0 +1,96 @@
+"""
+Gemini Analysis Cache
+Persistent content-hash cache so the same story is never analysed twice
+"""
+
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+import unicodedata
+from typing import Dict, Optional
+
+from .config import config
+
+
+def _normalize(text: str) -> str:
+    text = unicodedata.normalize("NFKC", text or "")
+    return re.sub(r"\s+", " ", text).strip().lower()
+
+
+def content_key(title: str, full_text: str, prompt_version: str) -> str:
+    """Hash of the normalized title and text plus the prompt version"""
+    payload = "\x1f".join([prompt_version, _normalize(title), _normalize(full_text)])
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+
+class AnalysisCache:
+    """SQLite-backed LRU cache of analysis results keyed by content hash"""
+
+    def __init__(self, path: str = None, max_entries: int = None):
+        self.path = path or config.ANALYSIS_CACHE_PATH
+        self.max_entries = max_entries or config.ANALYSIS_CACHE_MAX_ENTRIES
+        self.lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _open(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS analyses ("
+                "key TEXT PRIMARY KEY, result TEXT NOT NULL, last_used REAL NOT NULL)"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS analyses_last_used ON analyses (last_used)")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def get(self, key: str) -> Optional[Dict]:
+        """Return a cached analysis and mark it as recently used"""
+        with self.lock:
+            try:
+                conn = self._open()
+                row = conn.execute("SELECT result FROM analyses WHERE key = ?", (key,)).fetchone()
+                if row is None:
+                    return None
+                conn.execute("UPDATE analyses SET last_used = ? WHERE key = ?", (time.time(), key))
+                conn.commit()
+                return json.loads(row[0])
+            except Exception as e:
+                print(f"⚠️  Analysis cache lookup failed: {e}")
+                return None
+
+    def put(self, key: str, result: Dict) -> None:
+        """Store an analysis, evicting the least recently used beyond the size limit"""
+        with self.lock:
+            try:
+                conn = self._open()
+                conn.execute(
+                    "INSERT OR REPLACE INTO analyses (key, result, last_used) VALUES (?, ?, ?)",
+                    (key, json.dumps(result, ensure_ascii=False), time.time())
+                )
+                conn.execute(
+                    "DELETE FROM analyses WHERE key IN ("
+                    "SELECT key FROM analyses ORDER BY last_used DESC LIMIT -1 OFFSET ?)",
+                    (self.max_entries,)
+                )
+                conn.commit()
+            except Exception as e:
+                print(f"⚠️  Analysis cache update failed: {e}")
+
+    def close(self) -> None:
+        with self.lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+
+
+# Global analysis cache instance (None when disabled)
+analysis_cache = AnalysisCache() if config.ANALYSIS_CACHE_ENABLED else None
@@ -4,7 +4,7 @@ Load configuration from environment variables
 """
 
 import os
-from typing import List
+from typing import Dict, List
 from dotenv import load_dotenv
 
 # Load environment variables
@@ -17,19 +17,121 @@ class Config:
     # MongoDB Configuration
     MONGODB_URI: str = os.getenv("MONGODB_URI", "")
     MONGODB_DATABASE: str = os.getenv("MONGODB_DATABASE", "briefly60")
+    MONGO_WRITE_BATCH_SIZE: int = int(os.getenv("MONGO_WRITE_BATCH_SIZE", "10"))
+    MONGO_FLUSH_INTERVAL: float = float(os.getenv("MONGO_FLUSH_INTERVAL", "5"))
+    
+    # Local Cache Configuration (persisted between runs)
+    CACHE_DIR: str = os.getenv("CACHE_DIR", ".cache")
+    SEEN_CACHE_ENABLED: bool = os.getenv("SEEN_CACHE_ENABLED", "true").lower() == "true"
+    SEEN_CACHE_PATH: str = os.getenv("SEEN_CACHE_PATH", os.path.join(CACHE_DIR, "seen_urls.sqlite3"))
+    SEEN_CACHE_TTL_DAYS: float = float(os.getenv("SEEN_CACHE_TTL_DAYS", "7"))
+    SEEN_CACHE_CAPACITY: int = int(os.getenv("SEEN_CACHE_CAPACITY", "50000"))
+    ANALYSIS_CACHE_ENABLED: bool = os.getenv("ANALYSIS_CACHE_ENABLED", "true").lower() == "true"
+    ANALYSIS_CACHE_PATH: str = os.getenv("ANALYSIS_CACHE_PATH", os.path.join(CACHE_DIR, "gemini_analyses.sqlite3"))
+    ANALYSIS_CACHE_MAX_ENTRIES: int = int(os.getenv("ANALYSIS_CACHE_MAX_ENTRIES", "5000"))
+    GEMINI_HEALTH_ENABLED: bool = os.getenv("GEMINI_HEALTH_ENABLED", "true").lower() == "true"
+    GEMINI_HEALTH_PATH: str = os.getenv("GEMINI_HEALTH_PATH", os.path.join(CACHE_DIR, "gemini_health.json"))
+    FEED_CACHE_ENABLED: bool = os.getenv("FEED_CACHE_ENABLED", "true").lower() == "true"
+    FEED_CACHE_PATH: str = os.getenv("FEED_CACHE_PATH", os.path.join(CACHE_DIR, "feed_validators.json"))
     
     # Telegram Configuration
     TELEGRAM_BOT_TOKEN: str = os.getenv("TELEGRAM_BOT_TOKEN", "")
     TELEGRAM_CHAT_ID: int = int(os.getenv("TELEGRAM_CHAT_ID", "0")) if os.getenv("TELEGRAM_CHAT_ID") else 0
+    TELEGRAM_ASYNC: bool = os.getenv("TELEGRAM_ASYNC", "true").lower() == "true"
+    TELEGRAM_OUTBOX_PATH: str = os.getenv("TELEGRAM_OUTBOX_PATH", os.path.join(CACHE_DIR, "telegram_outbox.sqlite3"))
+    TELEGRAM_PER_CHAT_PER_MINUTE: int = int(os.getenv("TELEGRAM_PER_CHAT_PER_MINUTE", "20"))
+    TELEGRAM_GLOBAL_PER_SECOND: int = int(os.getenv("TELEGRAM_GLOBAL_PER_SECOND", "30"))
+    TELEGRAM_DIGEST_THRESHOLD: int = int(os.getenv("TELEGRAM_DIGEST_THRESHOLD", "4"))  # importance below this goes to a digest
+    TELEGRAM_DIGEST_SIZE: int = int(os.getenv("TELEGRAM_DIGEST_SIZE", "5"))
+    TELEGRAM_DIGEST_MAX_WAIT: float = float(os.getenv("TELEGRAM_DIGEST_MAX_WAIT", "600"))
+    TELEGRAM_MAX_ATTEMPTS: int = int(os.getenv("TELEGRAM_MAX_ATTEMPTS", "5"))
+    TELEGRAM_DRAIN_TIMEOUT: float = float(os.getenv("TELEGRAM_DRAIN_TIMEOUT", "180"))
     
     # Gemini API Keys (comma-separated in env)
     GEMINI_API_KEYS: List[str] = os.getenv("GEMINI_API_KEYS", "").split(",")
     GEMINI_API_KEYS = [key.strip() for key in GEMINI_API_KEYS if key.strip()]
     
+    # API endpoint (point at benchmarks/mock_gemini_server.py for offline load tests)
+    GEMINI_API_BASE: str = os.getenv("GEMINI_API_BASE", "https://generativelanguage.googleapis.com").rstrip("/")
+    
+    # Articles per Gemini request in pipeline mode, and how long to wait for a batch to fill
+    GEMINI_BATCH_SIZE: int = int(os.getenv("GEMINI_BATCH_SIZE", "5"))
+    GEMINI_BATCH_WAIT: float = float(os.getenv("GEMINI_BATCH_WAIT", "3"))
+    
+    # Concurrent requests per key and each key's per-minute budget (0 = unlimited)
+    GEMINI_CONCURRENCY_PER_KEY: int = int(os.getenv("GEMINI_CONCURRENCY_PER_KEY", "1"))
+    GEMINI_KEY_RPM: int = int(os.getenv("GEMINI_KEY_RPM", "15"))
+    GEMINI_KEY_TPM: int = int(os.getenv("GEMINI_KEY_TPM", "250000"))
+    
+    # Requests per minute per key for each model ("model:rpm,..."; unlisted = unlimited)
+    GEMINI_MODEL_RPM: Dict[str, int] = {
+        model.strip(): int(rpm)
+        for model, _, rpm in (
+            item.partition(":") for item in os.getenv(
+                "GEMINI_MODEL_RPM",
+                "gemini-2.5-flash-lite:15,gemini-2.5-flash:10,gemini-3-flash:10"
+            ).split(",")
+        )
+        if model.strip() and rpm.strip()
+    }
+    # Back-off for a 429 without retry details, longest local bucket wait before
+    # switching keys, and longest park a queued request will wait for
+    GEMINI_DEFAULT_RETRY_AFTER: float = float(os.getenv("GEMINI_DEFAULT_RETRY_AFTER", "60"))
+    GEMINI_BUCKET_WAIT: float = float(os.getenv("GEMINI_BUCKET_WAIT", "5"))
+    GEMINI_MAX_PARK_WAIT: float = float(os.getenv("GEMINI_MAX_PARK_WAIT", "120"))
+    # Longest a caller waits for a pooled Gemini request before giving up
+    GEMINI_REQUEST_TIMEOUT: float = float(os.getenv("GEMINI_REQUEST_TIMEOUT", "300"))
+    
+    # "full" = one complete analysis per article; "tiered" = cheap triage first,
+    # full analysis only at or above the importance threshold
+    GEMINI_ANALYSIS_MODE: str = os.getenv("GEMINI_ANALYSIS_MODE", "full").lower()
+    GEMINI_TRIAGE_MODEL: str = os.getenv("GEMINI_TRIAGE_MODEL", "gemini-2.5-flash-lite")
+    GEMINI_FULL_ANALYSIS_THRESHOLD: int = int(os.getenv("GEMINI_FULL_ANALYSIS_THRESHOLD", "6"))
+    
+    # Ask Gemini for schema-constrained JSON (responseMimeType / responseSchema)
+    GEMINI_STRUCTURED_OUTPUT: bool = os.getenv("GEMINI_STRUCTURED_OUTPUT", "true").lower() == "true"
+    
+    # Input token cap per article (0 = no cap) and boilerplate/repeated paragraph trimming
+    GEMINI_MAX_INPUT_TOKENS: int = int(os.getenv("GEMINI_MAX_INPUT_TOKENS", "1500"))
+    GEMINI_TRIM_BOILERPLATE: bool = os.getenv("GEMINI_TRIM_BOILERPLATE", "true").lower() == "true"
+    
+    # Model routing: rolling window per model/key, circuit breaker, stats output
+    GEMINI_STATS_WINDOW: int = int(os.getenv("GEMINI_STATS_WINDOW", "50"))
+    GEMINI_ROUTING_MIN_SAMPLES: int = int(os.getenv("GEMINI_ROUTING_MIN_SAMPLES", "3"))
+    GEMINI_CIRCUIT_FAILURES: int = int(os.getenv("GEMINI_CIRCUIT_FAILURES", "3"))
+    GEMINI_CIRCUIT_COOLDOWN: float = float(os.getenv("GEMINI_CIRCUIT_COOLDOWN", "300"))
+    GEMINI_STATS_PATH: str = os.getenv("GEMINI_STATS_PATH", "gemini_stats.json")
+    
     # Scraper Configuration
     MAX_ARTICLES: int = int(os.getenv("MAX_ARTICLES", "10"))
     REQUEST_TIMEOUT: int = int(os.getenv("REQUEST_TIMEOUT", "30"))
     USER_AGENT: str = os.getenv("USER_AGENT", "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36")
+    HTTP_MAX_PER_HOST: int = int(os.getenv("HTTP_MAX_PER_HOST", "4"))
+    API_HTTP2: bool = os.getenv("API_HTTP2", "true").lower() == "true"  # Telegram/Gemini over HTTP/2 when httpx[http2] is installed
+    HTML_PARSER: str = os.getenv("HTML_PARSER", "html.parser")  # html.parser, lxml or selectolax
+    
+    # Orchestrator Configuration
+    SCRAPER_PARALLELISM: int = int(os.getenv("SCRAPER_PARALLELISM", "1"))
+    
+    # Run Metrics (JSON dump and Prometheus textfile written at the end of a run)
+    METRICS_ENABLED: bool = os.getenv("METRICS_ENABLED", "true").lower() == "true"
+    METRICS_JSON_PATH: str = os.getenv("METRICS_JSON_PATH", "metrics.json")
+    METRICS_PROM_PATH: str = os.getenv("METRICS_PROM_PATH", "metrics.prom")
+    
+    # Profiling (main.py --profile)
+    PROFILE_DIR: str = os.getenv("PROFILE_DIR", "profile")
+    PROFILE_INTERVAL: float = float(os.getenv("PROFILE_INTERVAL", "0.01"))  # seconds between stack samples
+    
+    # Result Output (one NDJSON file per source, streamed as articles are saved)
+    RESULTS_DIR: str = os.getenv("RESULTS_DIR", ".")
+    RESULTS_COMPRESSION: str = os.getenv("RESULTS_COMPRESSION", "none")  # none, gzip or zstd
+    
+    # Pipeline Configuration (workers per stage, bounded queue size)
+    USE_PIPELINE: bool = os.getenv("USE_PIPELINE", "false").lower() == "true"
+    PIPELINE_QUEUE_SIZE: int = int(os.getenv("PIPELINE_QUEUE_SIZE", "20"))
+    PIPELINE_ANALYZE_WORKERS: int = int(os.getenv("PIPELINE_ANALYZE_WORKERS", "0"))  # 0 = one per Gemini slot
+    PIPELINE_PERSIST_WORKERS: int = int(os.getenv("PIPELINE_PERSIST_WORKERS", "2"))
+    PIPELINE_NOTIFY_WORKERS: int = int(os.getenv("PIPELINE_NOTIFY_WORKERS", "1"))
     
     @classmethod
     def validate(cls) -> bool:
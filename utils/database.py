@@ -3,12 +3,25 @@ MongoDB Database Integration
 Handle database connections and operations
 """
 
+import threading
+import time
+from collections import Counter
 from datetime import datetime
-from typing import Dict, Optional
-from pymongo import MongoClient
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+from pymongo import ASCENDING, DESCENDING, MongoClient
+from pymongo.errors import BulkWriteError, DuplicateKeyError
 
 from .config import config
 from .helpers import convert_to_utc_plus_6
+from .metrics import metrics, current_source
+from .seen_cache import SeenURLCache
+
+
+# Called with (article_data, outcome) once a buffered write is flushed;
+# outcome is "saved", "duplicate" (already stored) or "failed"
+SaveCallback = Callable[[Dict, str], None]
+
+DUPLICATE_KEY_ERROR = 11000
 
 
 class MongoDBHandler:
@@ -18,6 +31,20 @@ class MongoDBHandler:
         self.client = None
         self.db = None
         self.articles_collection = None
+        
+        # Buffered write path
+        self.batch_size = max(1, config.MONGO_WRITE_BATCH_SIZE)
+        self.flush_interval = config.MONGO_FLUSH_INTERVAL
+        # (document, article_data, on_saved, source that buffered it)
+        self._buffer: List[Tuple[Dict, Dict, Optional[SaveCallback], str]] = []
+        self._buffer_lock = threading.Lock()
+        self._flush_lock = threading.Lock()
+        self._flush_timer: Optional[threading.Thread] = None
+        self._stop_timer = threading.Event()
+        
+        # Local dedup layer in front of MongoDB lookups
+        self.seen_cache = SeenURLCache() if config.SEEN_CACHE_ENABLED else None
+        
         self._connect()
     
     def _connect(self):
@@ -30,19 +57,127 @@ class MongoDBHandler:
         except Exception as e:
             print(f"❌ MongoDB connection failed: {e}")
             self.client = None
+            return
+        
+        self._ensure_indexes()
     
-    def check_article_exists(self, source_url: str) -> bool:
-        """Check if article already exists in MongoDB"""
+    def _ensure_indexes(self):
+        """Create the dedup and query indexes if they do not exist yet"""
+        try:
+            # Unique source_url makes dedup race-free across overlapping runs
+            self.articles_collection.create_index(
+                [("source_url", ASCENDING)], unique=True, name="source_url_unique"
+            )
+        except Exception as e:
+            print(f"⚠️  Could not create unique source_url index: {e}")
+        
+        try:
+            self.articles_collection.create_index([("published_at", DESCENDING)], name="published_at")
+            self.articles_collection.create_index([("category", ASCENDING)], name="category")
+        except Exception as e:
+            print(f"⚠️  Could not create secondary indexes: {e}")
+    
+    def get_existing_urls(self, source_urls: Iterable[str]) -> Set[str]:
+        """Return the subset of source URLs already stored
+        
+        URLs in the local seen-URL cache are answered without a round trip;
+        the rest are checked with a single MongoDB $in query.
+        """
+        urls = {url for url in source_urls if url}
+        if not urls:
+            return set()
+        
+        existing = self.seen_cache.filter_seen(urls) if self.seen_cache else set()
+        remaining = list(urls - existing)
+        if not remaining:
+            return existing
+        
         if not self.client:
             print("⚠️  MongoDB not connected")
-            return False
+            return existing
         
         try:
-            existing = self.articles_collection.find_one({"source_url": source_url})
-            return existing is not None
+            with metrics.timer("mongo_seconds", op="find_existing"):
+                cursor = self.articles_collection.find(
+                    {"source_url": {"$in": remaining}},
+                    {"source_url": 1, "_id": 0}
+                )
+                found = {doc["source_url"] for doc in cursor}
         except Exception as e:
             print(f"⚠️  Error checking existence: {e}")
-            return False
+            return existing
+        
+        self._remember(found)
+        return existing | found
+    
+    def _remember(self, source_urls: Iterable[str]) -> None:
+        """Record stored URLs in the local seen-URL cache"""
+        if self.seen_cache:
+            self.seen_cache.add_many(source_urls)
+    
+    def _build_document(self, article_data: Dict) -> Dict:
+        """Prepare document according to Article model"""
+        now = datetime.utcnow()
+        return {
+            "status": "published",
+            "source_name": article_data.get("source", ""),
+            "source_url": article_data.get("link", ""),
+            "title": article_data.get("title", ""),
+            "content": article_data.get("full_text", ""),
+            "banner": article_data.get("image") if article_data.get("image") != "NO IMAGE" else None,
+            "published_at": datetime.fromisoformat(convert_to_utc_plus_6(article_data.get("published", ""))),
+            
+            **self._analysis_fields(article_data),
+            
+            # Timestamps
+            "createdAt": now,
+            "updatedAt": now,
+        }
+    
+    def _analysis_fields(self, analysis: Dict) -> Dict:
+        """Document fields filled in by the AI analysis"""
+        return {
+            "corrected_title": analysis.get("corrected_title") or None,
+            
+            # Summaries
+            "summary_60_bn": analysis.get("summary_60_bn", ""),
+            "summary_60_en": analysis.get("summary_60_en", ""),
+            
+            # Classification
+            "category": analysis.get("category", ""),
+            "importance": analysis.get("importance", 5),
+            "keywords": analysis.get("keywords", []),
+            "clickbait_score": analysis.get("clickbait_score", 0),
+            "clickbait_reason": analysis.get("clickbait_reason") or None,
+            
+            # Quiz questions
+            "quiz_questions": analysis.get("mcqs", []),
+            
+            # "triage" documents still lack summaries, clickbait analysis and MCQs
+            "analysis_tier": analysis.get("analysis_tier", "full"),
+        }
+    
+    def find_triaged_articles(self, limit: int = 10) -> List[Dict]:
+        """Most important articles that only got the triage analysis"""
+        if not self.client:
+            raise ValueError("MongoDB not connected")
+        
+        cursor = self.articles_collection.find(
+            {"analysis_tier": "triage"},
+            {"source_url": 1, "title": 1, "content": 1, "_id": 0}
+        ).sort([("importance", DESCENDING), ("published_at", DESCENDING)]).limit(limit)
+        return list(cursor)
+    
+    def update_analysis(self, source_url: str, analysis: Dict) -> bool:
+        """Replace the AI fields of a stored article"""
+        if not self.client:
+            raise ValueError("MongoDB not connected")
+        
+        result = self.articles_collection.update_one(
+            {"source_url": source_url},
+            {"$set": {**self._analysis_fields(analysis), "updatedAt": datetime.utcnow()}}
+        )
+        return result.modified_count > 0
     
     def create_article(self, article_data: Dict) -> Dict:
         """Create article in MongoDB"""
@@ -50,46 +185,132 @@ class MongoDBHandler:
             raise ValueError("MongoDB not connected")
         
         try:
-            # Prepare document according to Article model
-            document = {
-                "status": "published",
-                "source_name": article_data.get("source", ""),
-                "source_url": article_data.get("link", ""),
-                "title": article_data.get("title", ""),
-                "corrected_title": article_data.get("corrected_title") or None,
-                "content": article_data.get("full_text", ""),
-                "banner": article_data.get("image") if article_data.get("image") != "NO IMAGE" else None,
-                "published_at": datetime.fromisoformat(convert_to_utc_plus_6(article_data.get("published", ""))),
-                
-                # Summaries
-                "summary_60_bn": article_data.get("summary_60_bn", ""),
-                "summary_60_en": article_data.get("summary_60_en", ""),
-                
-                # Classification
-                "category": article_data.get("category", ""),
-                "importance": article_data.get("importance", 5),
-                "keywords": article_data.get("keywords", []),
-                "clickbait_score": article_data.get("clickbait_score", 0),
-                "clickbait_reason": article_data.get("clickbait_reason") or None,
-                
-                # Quiz questions
-                "quiz_questions": article_data.get("mcqs", []),
-                
-                # Timestamps
-                "createdAt": datetime.utcnow(),
-                "updatedAt": datetime.utcnow(),
-            }
+            document = self._build_document(article_data)
             
             # Insert into MongoDB
-            result = self.articles_collection.insert_one(document)
+            with metrics.timer("mongo_seconds", op="insert_one"):
+                result = self.articles_collection.insert_one(document)
             article_id = str(result.inserted_id)
+            self._remember([document["source_url"]])
+            metrics.inc("mongo_documents_total", op="insert_one", status="saved")
             
             print(f"   ✓ Created in MongoDB (ID: {article_id})")
             return {"data": {"id": article_id}}
             
+        except DuplicateKeyError:
+            metrics.inc("mongo_documents_total", op="insert_one", status="duplicate")
+            self._remember([article_data.get("link", "")])
+            print(f"   ⏭️  Already in MongoDB: {article_data.get('link', '')}")
+            raise
         except Exception as e:
+            metrics.inc("mongo_documents_total", op="insert_one", status="failed")
             print(f"   ❌ Failed to create article: {e}")
             raise
+    
+    # ---------- Buffered writes ----------
+    
+    def buffer_article(self, article_data: Dict, on_saved: Optional[SaveCallback] = None) -> None:
+        """Queue an article for a bulk insert
+        
+        The buffer is flushed with insert_many(ordered=False) once it holds
+        ``MONGO_WRITE_BATCH_SIZE`` documents or every ``MONGO_FLUSH_INTERVAL``
+        seconds. ``on_saved`` is called with the outcome after the flush.
+        """
+        if not self.client:
+            raise ValueError("MongoDB not connected")
+        
+        document = self._build_document(article_data)
+        
+        with self._buffer_lock:
+            self._buffer.append((document, article_data, on_saved, current_source()))
+            should_flush = len(self._buffer) >= self.batch_size
+            self._start_flush_timer()
+        
+        if should_flush:
+            self.flush()
+    
+    def _start_flush_timer(self) -> None:
+        """Start the periodic flush thread (caller holds the buffer lock)"""
+        if self._flush_timer is not None or self.flush_interval <= 0:
+            return
+        
+        self._stop_timer.clear()
+        self._flush_timer = threading.Thread(target=self._flush_periodically, name="mongo-flush", daemon=True)
+        self._flush_timer.start()
+    
+    def _flush_periodically(self) -> None:
+        while not self._stop_timer.wait(self.flush_interval):
+            self.flush()
+    
+    def flush(self) -> int:
+        """Write buffered articles in one unordered bulk insert; returns number saved"""
+        with self._flush_lock:
+            with self._buffer_lock:
+                batch, self._buffer = self._buffer, []
+            
+            if not batch:
+                return 0
+            
+            failed: Dict[int, str] = {}
+            started = time.perf_counter()
+            try:
+                self.articles_collection.insert_many(
+                    [document for document, _, _, _ in batch], ordered=False
+                )
+            except BulkWriteError as e:
+                for error in e.details.get("writeErrors", []):
+                    failed[error["index"]] = (
+                        "duplicate" if error.get("code") == DUPLICATE_KEY_ERROR else error.get("errmsg", "")
+                    )
+            except Exception as e:
+                print(f"   ❌ Bulk insert failed: {e}")
+                failed = {idx: str(e) for idx in range(len(batch))}
+            
+            outcomes = [
+                "saved" if idx not in failed else "duplicate" if failed[idx] == "duplicate" else "failed"
+                for idx in range(len(batch))
+            ]
+            self._remember(
+                document["source_url"] for (document, _, _, _), outcome in zip(batch, outcomes)
+                if outcome != "failed"
+            )
+            
+            saved = outcomes.count("saved")
+            duplicates = outcomes.count("duplicate")
+            
+            # A bulk batch mixes sources: each is charged its share of the write
+            elapsed = time.perf_counter() - started
+            for source, count in Counter(source for _, _, _, source in batch).items():
+                metrics.observe("mongo_seconds", elapsed * count / len(batch), op="insert_many", source=source)
+            counts = Counter((source, outcome) for (_, _, _, source), outcome in zip(batch, outcomes))
+            for (source, status), count in counts.items():
+                metrics.inc("mongo_documents_total", count, op="insert_many", status=status, source=source)
+            print(f"   ✓ Bulk saved {saved}/{len(batch)} articles to MongoDB"
+                  + (f" ({duplicates} already existed)" if duplicates else ""))
+            
+            # Callbacks run under the flush lock so a concurrent flush() only
+            # returns once every earlier batch has been handed on
+            for (_, article_data, on_saved, _), outcome in zip(batch, outcomes):
+                if on_saved is None:
+                    continue
+                try:
+                    on_saved(article_data, outcome)
+                except Exception as e:
+                    print(f"   ⚠️  Save callback failed: {e}")
+            
+            return saved
+    
+    def close(self) -> None:
+        """Flush pending writes and stop the periodic flush thread"""
+        self._stop_timer.set()
+        with self._buffer_lock:
+            timer, self._flush_timer = self._flush_timer, None
+        if timer is not None:
+            timer.join(timeout=self.flush_interval + 1)
+        if self.client:
+            self.flush()
+        if self.seen_cache:
+            self.seen_cache.close()
 
 
 # Global database handler instance
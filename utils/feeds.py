@@ -0,0 +1,111 @@
+"""
+RSS Feed Fetching
+Conditional GET (ETag / Last-Modified) with validators persisted between runs
+"""
+
+import json
+import os
+import threading
+from typing import Dict, Optional
+
+import feedparser
+
+from .config import config
+from .metrics import metrics
+
+
+class FeedValidatorStore:
+    """ETag/Last-Modified values per feed URL, stored as a small JSON file"""
+
+    def __init__(self, path: str = None):
+        self.path = path or config.FEED_CACHE_PATH
+        self.lock = threading.Lock()
+        self._validators: Optional[Dict[str, Dict[str, str]]] = None
+
+        # Validators of feeds fetched this run but not fully processed yet
+        self._pending: Dict[str, Dict[str, str]] = {}
+
+    def _load(self) -> Dict[str, Dict[str, str]]:
+        if self._validators is None:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    self._validators = json.load(f)
+            except FileNotFoundError:
+                self._validators = {}
+            except Exception as e:
+                print(f"⚠️  Could not read feed cache: {e}")
+                self._validators = {}
+        return self._validators
+
+    def get(self, url: str) -> Dict[str, str]:
+        with self.lock:
+            return dict(self._load().get(url, {}))
+
+    def set_pending(self, url: str, validators: Dict[str, str]) -> None:
+        with self.lock:
+            self._pending[url] = validators
+
+    def commit(self, url: str) -> None:
+        """Persist the pending validators for a feed"""
+        with self.lock:
+            validators = self._pending.pop(url, None)
+            if not validators:
+                return
+
+            self._load()[url] = validators
+            try:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                tmp_path = f"{self.path}.tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(self._validators, f, indent=2)
+                os.replace(tmp_path, self.path)
+            except Exception as e:
+                print(f"⚠️  Could not write feed cache: {e}")
+
+
+# Global validator store
+feed_validators = FeedValidatorStore()
+
+
+def fetch_feed(url: str):
+    """Parse an RSS feed, sending the validators saved by the last run
+
+    Returns None when the server answers 304 Not Modified, meaning the
+    whole source can be skipped.
+    """
+    validators = feed_validators.get(url) if config.FEED_CACHE_ENABLED else {}
+
+    with metrics.timer("feed_parse_seconds"):
+        feed = feedparser.parse(
+            url,
+            etag=validators.get("etag"),
+            modified=validators.get("modified")
+        )
+
+    if getattr(feed, "status", None) == 304:
+        metrics.inc("feed_fetches_total", status="not_modified")
+        print(f"⏭️  Feed not modified since last run: {url}")
+        return None
+
+    metrics.inc("feed_fetches_total", status="error" if feed.get("bozo") and not feed.entries else "ok")
+    metrics.inc("feed_entries_total", len(feed.entries))
+
+    new_validators = {
+        key: feed.get(key) for key in ("etag", "modified") if feed.get(key)
+    }
+    if config.FEED_CACHE_ENABLED and new_validators:
+        feed_validators.set_pending(url, new_validators)
+
+    return feed
+
+
+def mark_feed_processed(url: str) -> None:
+    """Save validators once every entry of the fetched feed has been handled
+
+    Committing only after a full pass means a feed cut short by
+    MAX_ARTICLES is downloaded again next run instead of answering 304.
+    """
+    if config.FEED_CACHE_ENABLED:
+        feed_validators.commit(url)
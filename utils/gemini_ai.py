@@ -4,31 +4,169 @@ Manages multiple API keys with rotation and provides AI analysis
 """
 
 import json
-import requests
+import atexit
+import unicodedata
+import time
+import queue
+import threading
+from collections import deque
 from threading import Lock
+from concurrent.futures import Future, InvalidStateError
 from datetime import datetime, timedelta
 from zoneinfo import ZoneInfo
-from typing import List, Dict, Optional
+from typing import Callable, List, Dict, Optional, Tuple
 
 from .config import config
+from .analysis_cache import analysis_cache, content_key
+from .gemini_health import GeminiHealthStore, key_fingerprint
+from .http_sessions import get_session
+from .metrics import metrics
+from .text_budget import apply_token_budget, estimate_tokens, token_budget
+
+# Bump whenever the prompt or response format changes, so cached analyses
+# produced by an older prompt are not reused
+PROMPT_VERSION = "2"
+
+
+class GeminiQuotaError(Exception):
+    """HTTP 429 from Gemini, with how long the API asked us to back off"""
+    
+    def __init__(self, message: str, retry_after: Optional[float] = None, per_day: bool = False):
+        super().__init__(message)
+        self.retry_after = retry_after
+        self.per_day = per_day
+
+
+class GeminiKeyUnavailable(Exception):
+    """Every model of a key is parked or out of budget; try another key"""
+    
+    def __init__(self, wait: float):
+        super().__init__(f"key unavailable for {wait:.0f}s")
+        self.wait = wait
+
+
+class TokenBucket:
+    """Allows ``rpm`` requests per minute, refilled continuously (0 = unlimited)"""
+    
+    def __init__(self, rpm: int):
+        self.rate = rpm / 60.0
+        self.capacity = max(1, rpm)
+        self.tokens = float(self.capacity)
+        self.updated = time.monotonic()
+    
+    def try_acquire(self) -> float:
+        """Take a token; returns 0 on success or the seconds until one is available"""
+        if self.rate <= 0:
+            return 0.0
+        
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+        
+        if self.tokens >= 1:
+            self.tokens -= 1
+            return 0.0
+        return (1 - self.tokens) / self.rate
+    
+    def drain(self) -> None:
+        """Empty the bucket after the server rejected a request"""
+        self.tokens = 0.0
+        self.updated = time.monotonic()
+
+
+# Seconds-per-success assumed for a model without enough samples yet; keeps
+# unmeasured models in configured order behind proven fast ones
+_PRIOR_SECONDS_PER_SUCCESS = 30.0
+
+
+class RollingStats:
+    """Success rate and latency percentiles over the last ``window`` requests"""
+    
+    def __init__(self, window: int):
+        self.samples: deque = deque(maxlen=max(1, window))  # (ok, latency)
+        self.requests = 0
+        self.failures = 0
+        self.consecutive_failures = 0
+        self.open_until = 0.0  # monotonic time until which the circuit is open
+    
+    def record(self, ok: bool, latency: float) -> None:
+        self.samples.append((ok, latency))
+        self.requests += 1
+        if ok:
+            self.consecutive_failures = 0
+        else:
+            self.failures += 1
+            self.consecutive_failures += 1
+    
+    def success_rate(self) -> float:
+        """Laplace-smoothed, so a single failure does not zero a model out"""
+        ok = sum(1 for success, _ in self.samples if success)
+        return (ok + 1) / (len(self.samples) + 2)
+    
+    def percentile(self, pct: float) -> float:
+        latencies = sorted(latency for _, latency in self.samples)
+        if not latencies:
+            return 0.0
+        return latencies[min(len(latencies) - 1, int(pct / 100 * len(latencies)))]
+    
+    def seconds_per_success(self) -> float:
+        """Expected time spent per successful answer"""
+        return self.percentile(50) / self.success_rate()
+    
+    def snapshot(self) -> Dict:
+        return {
+            "requests": self.requests,
+            "failures": self.failures,
+            "success_rate": round(self.success_rate(), 3) if self.samples else None,
+            "p50_seconds": round(self.percentile(50), 3),
+            "p95_seconds": round(self.percentile(95), 3),
+            "circuit_open": self.open_until > time.monotonic(),
+        }
 
 
 class GeminiAPIManager:
-    """Manages multiple Gemini API keys with rotation"""
+    """Manages multiple Gemini API keys with rotation
+    
+    Each (key, model) pair has a token bucket sized to the model's RPM.
+    Quota errors park only that pair, for as long as the API asks: a
+    per-minute limit for the given retry delay, a daily quota until the
+    delay or, without one, the next quota reset at Pacific midnight.
     
-    def __init__(self, api_keys: List[str], tz: str = "Asia/Dhaka"):
+    Rolling success rate and latency are kept per model, per key and per
+    (key, model). Each request tries the models of its key in order of
+    expected time per success, and a pair that fails repeatedly has its
+    circuit opened for a cooldown so no timeout is spent on it.
+    """
+    
+    def __init__(
+        self,
+        api_keys: List[str],
+        tz: str = "Asia/Dhaka",
+        model_rpm: Optional[Dict[str, int]] = None,
+        quota_tz: str = "America/Los_Angeles"
+    ):
         self.api_keys = api_keys or []
         self.models = [
             "gemini-2.5-flash-lite",
             "gemini-2.5-flash",
             "gemini-3-flash",
         ]
-        self.current_index = 0
         self.lock = Lock()
         self.tz = ZoneInfo(tz)
+        self.quota_tz = ZoneInfo(quota_tz)
+        self.model_rpm = model_rpm or {}
         
-        # key -> datetime until which it is disabled
+        # key -> datetime until which it is disabled (invalid key)
         self.disabled_until: Dict[str, datetime] = {}
+        
+        # (key, model) -> datetime until which the pair is parked (quota)
+        self.parked_until: Dict[Tuple[str, str], datetime] = {}
+        self.buckets: Dict[Tuple[str, str], TokenBucket] = {}
+        
+        # Rolling request outcomes for routing and reporting
+        self.model_stats: Dict[str, RollingStats] = {}
+        self.key_stats: Dict[str, RollingStats] = {}
+        self.pair_stats: Dict[Tuple[str, str], RollingStats] = {}
     
     def _now(self) -> datetime:
         return datetime.now(self.tz)
@@ -45,45 +183,491 @@ class GeminiAPIManager:
         )
         self.disabled_until[key] = next_day_midnight
     
-    def get_all_keys(self) -> List[str]:
-        return self.api_keys
+    def next_quota_reset(self) -> datetime:
+        """Daily Gemini quotas reset at midnight Pacific time"""
+        now = datetime.now(self.quota_tz)
+        return (now + timedelta(days=1)).replace(hour=0, minute=0, second=0, microsecond=0)
     
-    def get_all_models(self) -> List[str]:
-        return self.models
+    def park(self, key: str, model: str, seconds: Optional[float] = None, until: Optional[datetime] = None) -> datetime:
+        """Stop using a (key, model) pair for ``seconds`` or until ``until``"""
+        with self.lock:
+            if until is None:
+                until = self._now() + timedelta(seconds=seconds or 0)
+            self.parked_until[(key, model)] = until
+            bucket = self.buckets.get((key, model))
+            if bucket is not None:
+                bucket.drain()
+            return until
+    
+    def acquire(self, key: str, model: str) -> float:
+        """Reserve one request for (key, model); returns 0 or seconds to wait"""
+        with self.lock:
+            if self._is_disabled(key):
+                return (self.disabled_until[key] - self._now()).total_seconds()
+            
+            until = self.parked_until.get((key, model))
+            if until is not None:
+                remaining = (until - self._now()).total_seconds()
+                if remaining > 0:
+                    return remaining
+                del self.parked_until[(key, model)]
+            
+            bucket = self.buckets.get((key, model))
+            if bucket is None:
+                bucket = self.buckets[(key, model)] = TokenBucket(self.model_rpm.get(model, 0))
+            return bucket.try_acquire()
+    
+    def seconds_until_available(self, key: str) -> float:
+        """0 if some model of the key can be used now, else the shortest park"""
+        with self.lock:
+            now = self._now()
+            if self._is_disabled(key):
+                return (self.disabled_until[key] - now).total_seconds()
+            
+            waits = []
+            for model in self.models:
+                until = self.parked_until.get((key, model))
+                if until is None or until <= now:
+                    return 0.0
+                waits.append((until - now).total_seconds())
+            return min(waits) if waits else 0.0
+    
+    def _stats(self, table: Dict, name) -> RollingStats:
+        stats = table.get(name)
+        if stats is None:
+            stats = table[name] = RollingStats(config.GEMINI_STATS_WINDOW)
+        return stats
     
-    def get_next_key(self) -> str:
-        """Return next available (not-disabled) key in round-robin order (thread-safe)."""
+    def record(self, key: str, model: str, ok: bool, latency: float) -> None:
+        """Record the outcome of one request (quota rejections are not failures)"""
         with self.lock:
-            if not self.api_keys:
-                raise ValueError("No Gemini API keys configured")
+            self._stats(self.model_stats, model).record(ok, latency)
+            self._stats(self.key_stats, key).record(ok, latency)
             
-            n = len(self.api_keys)
+            pair = self._stats(self.pair_stats, (key, model))
+            pair.record(ok, latency)
+            if not ok and pair.consecutive_failures >= config.GEMINI_CIRCUIT_FAILURES:
+                pair.open_until = time.monotonic() + config.GEMINI_CIRCUIT_COOLDOWN
+                print(f"   🔌 Skipping {model} on {self.key_label(key)} for {config.GEMINI_CIRCUIT_COOLDOWN:.0f}s after {pair.consecutive_failures} failures")
+    
+    def _score(self, key: str, model: str) -> float:
+        pair = self.pair_stats.get((key, model))
+        if pair is not None and len(pair.samples) >= config.GEMINI_ROUTING_MIN_SAMPLES:
+            return pair.seconds_per_success()
+        stats = self.model_stats.get(model)
+        if stats is not None and len(stats.samples) >= config.GEMINI_ROUTING_MIN_SAMPLES:
+            return stats.seconds_per_success()
+        return _PRIOR_SECONDS_PER_SUCCESS
+    
+    def route(self, key: str, prefer: Optional[str] = None) -> List[str]:
+        """Models to try for ``key``, best first, without open circuits
+        
+        ``prefer`` goes first whenever its circuit is closed. When every
+        circuit is open the models are returned anyway, soonest to close
+        first, so requests are never refused outright.
+        """
+        with self.lock:
+            now = time.monotonic()
+            closed = [
+                model for model in self.models
+                if self.pair_stats.get((key, model)) is None
+                or self.pair_stats[(key, model)].open_until <= now
+            ]
+            if not closed:
+                return sorted(self.models, key=lambda model: self.pair_stats[(key, model)].open_until)
+            # sorted() is stable, so ties keep the configured order
+            ordered = sorted(closed, key=lambda model: self._score(key, model))
+            if prefer in ordered:
+                ordered.remove(prefer)
+                ordered.insert(0, prefer)
+            return ordered
+    
+    def key_label(self, key: str) -> str:
+        """Name a key in logs and stats without revealing it"""
+        try:
+            return f"key{self.api_keys.index(key) + 1}"
+        except ValueError:
+            return "key?"
+    
+    # ---------- Persistence between runs ----------
+    
+    def export_health(self) -> Dict:
+        """Quota parks, disabled keys and recent outcomes, keyed by key fingerprint"""
+        with self.lock:
+            now = self._now()
+            wall, mono = time.time(), time.monotonic()
+            keys: Dict[str, Dict] = {}
             
-            # Try at most n keys to find a non-disabled one
-            for _ in range(n):
-                key = self.api_keys[self.current_index % n]
-                self.current_index = (self.current_index + 1) % n
+            for key in self.api_keys:
+                entry: Dict = {"models": {}}
+                until = self.disabled_until.get(key)
+                if until is not None and until > now:
+                    entry["disabled_until"] = until.isoformat()
+                
+                for model in self.models:
+                    model_entry: Dict = {}
+                    parked = self.parked_until.get((key, model))
+                    if parked is not None and parked > now:
+                        model_entry["parked_until"] = parked.isoformat()
+                    
+                    stats = self.pair_stats.get((key, model))
+                    if stats is not None and stats.samples:
+                        model_entry["samples"] = [[ok, round(latency, 3)] for ok, latency in stats.samples]
+                        model_entry["consecutive_failures"] = stats.consecutive_failures
+                        if stats.open_until > mono:
+                            model_entry["circuit_open_until"] = wall + (stats.open_until - mono)
+                    
+                    if model_entry:
+                        entry["models"][model] = model_entry
                 
-                if not self._is_disabled(key):
-                    return key
+                keys[key_fingerprint(key)] = entry
+            
+            return {"saved_at": now.isoformat(), "keys": keys}
+    
+    def restore_health(self, state: Dict) -> int:
+        """Load state saved by a previous run; returns the number of parks restored
+        
+        Past parks are dropped. Restored latency samples feed routing and the
+        success rate window, but not this run's request counters.
+        """
+        by_fingerprint = {key_fingerprint(key): key for key in self.api_keys}
+        restored = 0
+        
+        with self.lock:
+            now = self._now()
+            wall, mono = time.time(), time.monotonic()
             
-            raise ValueError("All Gemini API keys are temporarily disabled")
+            for fingerprint, entry in (state.get("keys") or {}).items():
+                key = by_fingerprint.get(fingerprint)
+                if key is None:
+                    continue
+                
+                try:
+                    disabled = entry.get("disabled_until")
+                    if disabled and datetime.fromisoformat(disabled) > now:
+                        self.disabled_until[key] = datetime.fromisoformat(disabled)
+                        restored += 1
+                    
+                    for model, model_entry in (entry.get("models") or {}).items():
+                        if model not in self.models:
+                            continue
+                        
+                        parked = model_entry.get("parked_until")
+                        if parked and datetime.fromisoformat(parked) > now:
+                            self.parked_until[(key, model)] = datetime.fromisoformat(parked)
+                            restored += 1
+                        
+                        samples = model_entry.get("samples") or []
+                        if samples:
+                            for table, name in (
+                                (self.pair_stats, (key, model)),
+                                (self.model_stats, model),
+                                (self.key_stats, key),
+                            ):
+                                self._stats(table, name).samples.extend(
+                                    (bool(ok), float(latency)) for ok, latency in samples
+                                )
+                            pair = self.pair_stats[(key, model)]
+                            pair.consecutive_failures = int(model_entry.get("consecutive_failures", 0))
+                            open_until = model_entry.get("circuit_open_until")
+                            if open_until and open_until > wall:
+                                pair.open_until = mono + (open_until - wall)
+                except Exception as e:
+                    print(f"⚠️  Ignoring saved health for a Gemini key: {e}")
+        
+        return restored
+    
+    def get_stats(self) -> Dict:
+        """Snapshot of routing statistics per model, key and (key, model)"""
+        with self.lock:
+            return {
+                "models": {model: stats.snapshot() for model, stats in self.model_stats.items()},
+                "keys": {self.key_label(key): stats.snapshot() for key, stats in self.key_stats.items()},
+                "routes": {
+                    f"{self.key_label(key)}/{model}": stats.snapshot()
+                    for (key, model), stats in self.pair_stats.items()
+                },
+            }
+    
+    def get_all_keys(self) -> List[str]:
+        return self.api_keys
+    
+    def get_all_models(self) -> List[str]:
+        return self.models
 
 
 # Initialize global manager
-gemini_manager = GeminiAPIManager(config.GEMINI_API_KEYS)
+gemini_manager = GeminiAPIManager(config.GEMINI_API_KEYS, model_rpm=config.GEMINI_MODEL_RPM)
 
+def _save_gemini_health(store: GeminiHealthStore, previous: Dict) -> None:
+    state = gemini_manager.export_health()
+    # Keep entries of keys that are not configured in this run
+    state["keys"] = {**(previous.get("keys") or {}), **state["keys"]}
+    store.save(state)
 
-def generate_summary_with_gemini(title: str, full_text: str) -> Dict:
-    """Generate AI summary and analysis using Gemini API with key rotation"""
+
+# Start from the key/model health the previous run ended with
+if config.GEMINI_HEALTH_ENABLED and gemini_manager.get_all_keys():
+    gemini_health = GeminiHealthStore()
+    _previous_health = gemini_health.load()
+    _parks = gemini_manager.restore_health(_previous_health)
+    if _parks:
+        print(f"✓ Restored {_parks} Gemini key/model quota park(s) from last run")
+    atexit.register(_save_gemini_health, gemini_health, _previous_health)
+
+
+class RateBudget:
+    """Requests-per-minute and tokens-per-minute budget over a sliding window"""
     
-    prompt = f"""
-You are a professional news analyst AI.
+    def __init__(self, rpm: int, tpm: int, window: float = 60.0):
+        self.rpm = rpm
+        self.tpm = tpm
+        self.window = window
+        self.lock = Lock()
+        self._events: deque = deque()  # [timestamp, tokens]
+    
+    def _trim(self, now: float) -> None:
+        while self._events and self._events[0][0] <= now - self.window:
+            self._events.popleft()
+    
+    def acquire(self, tokens: int) -> List[float]:
+        """Block until the request fits the budget; returns its window entry"""
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self._trim(now)
+                used = sum(event[1] for event in self._events)
+                
+                rpm_ok = self.rpm <= 0 or len(self._events) < self.rpm
+                # An oversized request still goes through once the window is empty
+                tpm_ok = self.tpm <= 0 or used + tokens <= self.tpm or not self._events
+                if rpm_ok and tpm_ok:
+                    event = [now, tokens]
+                    self._events.append(event)
+                    return event
+                
+                wait = self._events[0][0] + self.window - now
+            time.sleep(max(0.05, wait))
+    
+    def settle(self, event: List[float], tokens: int) -> None:
+        """Replace the estimated token count with the one the API reported"""
+        with self.lock:
+            event[1] = tokens
+    
+    def release(self, event: List[float]) -> None:
+        """Give back a slot taken for a request the key could not serve"""
+        with self.lock:
+            try:
+                self._events.remove(event)
+            except ValueError:
+                pass  # already slid out of the window
 
-Analyze the following news and return ONLY a valid JSON object.
-DO NOT add explanations, markdown, comments, or extra text.
-STRICTLY follow the schema and rules.
 
+class _GeminiJob:
+    def __init__(
+        self,
+        prompt: str,
+        schema: Optional[Dict] = None,
+        validate: Optional[Callable] = None,
+        prefer: Optional[str] = None
+    ):
+        self.prompt = prompt
+        self.schema = schema
+        self.validate = validate
+        self.prefer = prefer
+        self.tokens = estimate_tokens(prompt)
+        self.future: Future = Future()
+        self.tried_keys = set()
+        # key -> monotonic time before which the key could not serve this job
+        self.skip_until: Dict[str, float] = {}
+    
+    def skip_wait(self, key: str) -> float:
+        return max(0.0, self.skip_until.get(key, 0.0) - time.monotonic())
+
+
+class GeminiWorkerPool:
+    """Runs Gemini requests concurrently across every configured key
+    
+    Each key gets ``concurrency_per_key`` worker threads that pull jobs from
+    one shared queue, so throughput grows with the number of keys. A key's
+    workers respect its RPM/TPM budget and sit idle while every model of
+    the key is parked; a job whose key fails or is rate limited is put back
+    for another key. A job fails instead of waiting when no key can take
+    it within GEMINI_MAX_PARK_WAIT, whether at submit time or while queued.
+    """
+    
+    def __init__(self, manager: GeminiAPIManager, concurrency_per_key: int, rpm: int, tpm: int):
+        self.manager = manager
+        self.concurrency_per_key = max(1, concurrency_per_key)
+        self.budgets = {key: RateBudget(rpm, tpm) for key in manager.get_all_keys()}
+        self.requests_per_key = {key: 0 for key in manager.get_all_keys()}
+        self.queue: "queue.Queue[_GeminiJob]" = queue.Queue()
+        self.lock = Lock()
+        self._reaping = Lock()
+        self._stop = threading.Event()
+        self._threads: List[threading.Thread] = []
+    
+    @property
+    def capacity(self) -> int:
+        """Requests that can be in flight at once"""
+        return max(1, len(self.budgets) * self.concurrency_per_key)
+    
+    def _start(self) -> None:
+        with self.lock:
+            if self._threads:
+                return
+            for n, key in enumerate(self.budgets):
+                for i in range(self.concurrency_per_key):
+                    thread = threading.Thread(
+                        target=self._work,
+                        args=(key,),
+                        name=f"gemini-key{n + 1}-{i + 1}",
+                        daemon=True
+                    )
+                    thread.start()
+                    self._threads.append(thread)
+    
+    def submit(
+        self,
+        prompt: str,
+        schema: Optional[Dict] = None,
+        validate: Optional[Callable] = None,
+        prefer: Optional[str] = None
+    ) -> Future:
+        """Queue a prompt; the future resolves to (parsed JSON, model)"""
+        if not self.budgets:
+            raise ValueError("No Gemini API keys configured")
+        self._start()
+        
+        job = _GeminiJob(prompt, schema, validate, prefer)
+        if self._exhausted(job):
+            # Every key is parked for longer than a request may wait
+            self._fail(job)
+        else:
+            self.queue.put(job)
+        return job.future
+    
+    def request(self, prompt: str, *args) -> Tuple[object, str]:
+        """Submit and wait at most GEMINI_REQUEST_TIMEOUT seconds for the answer"""
+        future = self.submit(prompt, *args)
+        try:
+            return future.result(timeout=config.GEMINI_REQUEST_TIMEOUT)
+        except TimeoutError:
+            # Workers drop cancelled jobs instead of sending them
+            future.cancel()
+            raise TimeoutError(f"No Gemini answer within {config.GEMINI_REQUEST_TIMEOUT:.0f}s")
+    
+    @staticmethod
+    def _resolve(job: _GeminiJob, result=None, error: Optional[Exception] = None) -> None:
+        """Complete the job's future unless the caller already gave up on it"""
+        try:
+            if error is not None:
+                job.future.set_exception(error)
+            else:
+                job.future.set_result(result)
+        except InvalidStateError:
+            pass
+    
+    def _fail(self, job: _GeminiJob) -> None:
+        self._resolve(job, error=ValueError("All Gemini models and keys failed"))
+    
+    def _exhausted(self, job: _GeminiJob) -> bool:
+        """True when no key can take the job within GEMINI_MAX_PARK_WAIT"""
+        return all(
+            key in job.tried_keys
+            or self.manager.seconds_until_available(key) > config.GEMINI_MAX_PARK_WAIT
+            or job.skip_wait(key) > config.GEMINI_MAX_PARK_WAIT
+            for key in self.budgets
+        )
+    
+    def _retry_or_fail(self, job: _GeminiJob, reason: str) -> None:
+        if self._exhausted(job):
+            self._fail(job)
+        else:
+            metrics.inc("gemini_retries_total", reason=reason)
+            self.queue.put(job)
+    
+    def _fail_exhausted(self) -> None:
+        """Fail queued jobs that no key can take within GEMINI_MAX_PARK_WAIT
+        
+        Run by workers whose key is parked, so jobs do not wait forever when
+        every key is.
+        """
+        if not self._reaping.acquire(blocking=False):
+            return
+        try:
+            waiting = []
+            while True:
+                try:
+                    job = self.queue.get_nowait()
+                except queue.Empty:
+                    break
+                if self._exhausted(job):
+                    self._fail(job)
+                elif not job.future.done():
+                    waiting.append(job)
+            for job in waiting:
+                self.queue.put(job)
+        finally:
+            self._reaping.release()
+    
+    def _work(self, key: str) -> None:
+        while not self._stop.is_set():
+            wait = self.manager.seconds_until_available(key)
+            if wait > 0:
+                self._fail_exhausted()
+                self._stop.wait(min(wait, 5))
+                continue
+            
+            try:
+                job = self.queue.get(timeout=1)
+            except queue.Empty:
+                continue
+            
+            if job.future.done():
+                # Cancelled after its caller timed out
+                continue
+            
+            skip = job.skip_wait(key)
+            if key in job.tried_keys or skip > 0:
+                # Failed on this key, or the key said when it can serve it
+                # again; leave it for the others meanwhile
+                if self._exhausted(job):
+                    self._fail(job)
+                else:
+                    self.queue.put(job)
+                    self._stop.wait(min(skip, 0.5) if skip > 0 else 0.05)
+                continue
+            
+            event = self.budgets[key].acquire(job.tokens)
+            with self.lock:
+                self.requests_per_key[key] += 1
+            
+            try:
+                result, model, used_tokens = _request_with_key(
+                    job.prompt, key, job.schema, job.validate, job.prefer
+                )
+                if used_tokens:
+                    self.budgets[key].settle(event, used_tokens)
+                self._resolve(job, (result, model))
+            except GeminiKeyUnavailable as e:
+                # Rate limited only: any key may take it, this one once the
+                # wait is over. The budget slot was not used, so return it.
+                self.budgets[key].release(event)
+                job.skip_until[key] = time.monotonic() + e.wait
+                self._retry_or_fail(job, "rate_limited")
+            except Exception:
+                job.tried_keys.add(key)
+                self._retry_or_fail(job, "key_failed")
+    
+    def close(self) -> None:
+        self._stop.set()
+        for thread in self._threads:
+            thread.join(timeout=2)
+        self._threads = []
+
+
+ANALYSIS_RULES = """
 General Rules:
 - All summaries must be fact-based, neutral, and concise.
 - If news language is Bangla, summary_60_bn must be Bangla and summary_60_en must be English.
@@ -118,20 +702,14 @@ Fields Rules:
   - Only one correct answer
 
 MCQ Structure:
-{{
+{
   "question": "",
   "options": ["", "", "", ""],
   "correct_answer": ""
-}}
-
-Title:
-"{title}"
-
-News:
-"{full_text}"
+}
+"""
 
-Return JSON in this EXACT format:
-{{
+ANALYSIS_FORMAT = """{
   "category": "",
   "summary_60_bn": "",
   "summary_60_en": "",
@@ -141,9 +719,349 @@ Return JSON in this EXACT format:
   "corrected_title": "",
   "keywords": [],
   "mcqs": []
-}}
+}"""
+
+# Cheap first pass of the tiered mode: classification only
+TRIAGE_RULES = """
+Fields Rules:
+- category: one English word only (Politics, Sports, Tech, Crime, Economy, Entertainment, World, Health, Science, etc.)
+- importance: integer from 1 to 10
+  - 1–3 = low public impact
+  - 4–6 = moderate relevance
+  - 7–8 = high national relevance
+  - 9–10 = critical or major public impact
+- keywords:
+  - 2–4 main keywords
+  - lowercase
+  - no punctuation
+  - array of strings
 """
+
+TRIAGE_FORMAT = """{
+  "category": "",
+  "importance": 0,
+  "keywords": []
+}"""
+
+BATCH_TRIAGE_FORMAT = TRIAGE_FORMAT.replace('  "keywords": []', '  "keywords": [],\n  "id": ""')
+
+BATCH_ANALYSIS_FORMAT = ANALYSIS_FORMAT.replace('  "mcqs": []', '  "mcqs": [],\n  "id": ""')
+
+# Field -> accepted type(s) of a single analysis object
+ANALYSIS_FIELDS = {
+    "category": str,
+    "summary_60_bn": str,
+    "summary_60_en": str,
+    "importance": int,
+    "clickbait_score": int,
+    "clickbait_reason": str,
+    "corrected_title": str,
+    "keywords": list,
+    "mcqs": list,
+}
+
+
+def _build_prompt(title: str, full_text: str) -> str:
+    """Prompt for analysing a single article"""
+    return f"""
+You are a professional news analyst AI.
+
+Analyze the following news and return ONLY a valid JSON object.
+DO NOT add explanations, markdown, comments, or extra text.
+STRICTLY follow the schema and rules.
+{ANALYSIS_RULES}
+Title:
+"{title}"
+
+News:
+"{full_text}"
+
+Return JSON in this EXACT format:
+{ANALYSIS_FORMAT}
+"""
+
+
+def _build_triage_prompt(title: str, full_text: str) -> str:
+    """Prompt for classifying a single article (tiered mode, first pass)"""
+    return f"""
+You are a professional news analyst AI.
+
+Classify the following news and return ONLY a valid JSON object.
+DO NOT add explanations, markdown, comments, or extra text.
+STRICTLY follow the schema and rules.
+{TRIAGE_RULES}
+Title:
+"{title}"
+
+News:
+"{full_text}"
+
+Return JSON in this EXACT format:
+{TRIAGE_FORMAT}
+"""
+
+
+def _build_batch_prompt(
+    items: List[Tuple[str, str, str]],
+    rules: str = ANALYSIS_RULES,
+    item_format: str = BATCH_ANALYSIS_FORMAT
+) -> str:
+    """Prompt for analysing several (id, title, full_text) articles at once"""
+    articles = "\n\n".join(
+        f'--- ARTICLE id="{item_id}" ---\nTitle:\n"{title}"\n\nNews:\n"{full_text}"'
+        for item_id, title, full_text in items
+    )
+    return f"""
+You are a professional news analyst AI.
+
+Analyze EACH of the following {len(items)} news articles independently and
+return ONLY a valid JSON array with exactly one object per article.
+DO NOT add explanations, markdown, comments, or extra text.
+STRICTLY follow the schema and rules for every object.
+{rules}
+{articles}
+
+Return a JSON array where every element has this EXACT format, with "id"
+set to the id of the article it describes:
+{item_format}
+"""
+
+
+def _parse_json(text: str):
+    clean_text = text.replace("```json", "").replace("```", "").strip()
+    return json.loads(clean_text)
+
+
+# Gemini responseSchema (OpenAPI subset) for one analysis object
+_STRING = {"type": "STRING"}
+ANALYSIS_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        "category": _STRING,
+        "summary_60_bn": _STRING,
+        "summary_60_en": _STRING,
+        "importance": {"type": "INTEGER", "minimum": 1, "maximum": 10},
+        "clickbait_score": {"type": "INTEGER", "minimum": 0, "maximum": 5},
+        "clickbait_reason": _STRING,
+        "corrected_title": _STRING,
+        "keywords": {"type": "ARRAY", "items": _STRING},
+        "mcqs": {
+            "type": "ARRAY",
+            "items": {
+                "type": "OBJECT",
+                "properties": {
+                    "question": _STRING,
+                    "options": {"type": "ARRAY", "items": _STRING},
+                    "correct_answer": _STRING,
+                },
+                "required": ["question", "options", "correct_answer"],
+            },
+        },
+    },
+    "required": list(ANALYSIS_FIELDS),
+}
+
+TRIAGE_SCHEMA = {
+    "type": "OBJECT",
+    "properties": {
+        field: ANALYSIS_SCHEMA["properties"][field]
+        for field in ("category", "importance", "keywords")
+    },
+    "required": ["category", "importance", "keywords"],
+}
+
+
+def _batch_schema(schema: Dict) -> Dict:
+    """Array of ``schema`` objects that also carry the article id"""
+    return {
+        "type": "ARRAY",
+        "items": {
+            **schema,
+            "properties": {**schema["properties"], "id": _STRING},
+            "required": schema["required"] + ["id"],
+        },
+    }
+
+
+def _to_int(value, low: int, high: int) -> Optional[int]:
+    """Coerce "7", 7.4 or 12 into an int clamped to [low, high]"""
+    try:
+        number = int(round(float(value)))
+    except (TypeError, ValueError):
+        return None
+    return max(low, min(high, number))
+
+
+def _repair_mcq(mcq) -> Optional[Dict]:
+    if not isinstance(mcq, dict):
+        return None
+    question = str(mcq.get("question") or "").strip()
+    options = [str(option).strip() for option in mcq.get("options") or [] if str(option).strip()]
+    answer = str(mcq.get("correct_answer") or "").strip()
+    if not question or len(options) != 4:
+        return None
+    
+    # Answers given as a letter or index instead of the option text
+    if answer not in options:
+        letters = {"A": 0, "B": 1, "C": 2, "D": 3, "1": 0, "2": 1, "3": 2, "4": 3}
+        index = letters.get(answer.upper().rstrip(").:"))
+        if index is None:
+            return None
+        answer = options[index]
+    
+    return {"question": question, "options": options, "correct_answer": answer}
+
+
+def _clean_category(category: str) -> str:
+    return category.split()[0].strip(",.").title()
+
+
+def _clean_keywords(keywords) -> List[str]:
+    """Lowercase, punctuation-free, at most four (Bangla vowel signs kept)"""
+    if isinstance(keywords, str):
+        keywords = keywords.split(",")
+    cleaned = [
+        "".join(
+            char for char in str(keyword)
+            if not unicodedata.category(char).startswith(("P", "S"))
+        ).strip().lower()
+        for keyword in keywords or []
+    ]
+    return [keyword for keyword in cleaned if keyword][:4]
+
+
+def repair_analysis(result) -> Optional[Dict]:
+    """Validate an analysis object, fixing what can be fixed locally
+    
+    Numbers are coerced and clamped, keywords normalised, bad MCQs dropped
+    and corrected_title cleared for non-clickbait titles. Returns None only
+    when something has to be generated again (category, a summary, or every
+    MCQ missing).
+    """
+    if not isinstance(result, dict):
+        return None
+    
+    category = str(result.get("category") or "").strip()
+    summary_bn = str(result.get("summary_60_bn") or "").strip()
+    summary_en = str(result.get("summary_60_en") or "").strip()
+    mcqs = [mcq for mcq in map(_repair_mcq, result.get("mcqs") or []) if mcq]
+    if not category or not summary_bn or not summary_en or not mcqs:
+        return None
+    
+    clickbait_score = _to_int(result.get("clickbait_score"), 0, 5)
+    clickbait_score = 0 if clickbait_score is None else clickbait_score
+    corrected_title = str(result.get("corrected_title") or "").strip()
+    
+    repaired = dict(result)
+    repaired.update({
+        "category": _clean_category(category),
+        "summary_60_bn": summary_bn,
+        "summary_60_en": summary_en,
+        "importance": _to_int(result.get("importance"), 1, 10) or 5,
+        "clickbait_score": clickbait_score,
+        "clickbait_reason": str(result.get("clickbait_reason") or "").strip(),
+        "corrected_title": corrected_title if clickbait_score >= 3 else "",
+        "keywords": _clean_keywords(result.get("keywords")),
+        "mcqs": mcqs[:4],
+    })
+    return repaired
+
+
+def repair_triage(result) -> Optional[Dict]:
+    """Validate and fix a triage object (category, importance, keywords)"""
+    if not isinstance(result, dict):
+        return None
+    
+    category = str(result.get("category") or "").strip()
+    importance = _to_int(result.get("importance"), 1, 10)
+    if not category or importance is None:
+        return None
+    
+    repaired = dict(result)
+    repaired.update({
+        "category": _clean_category(category),
+        "importance": importance,
+        "keywords": _clean_keywords(result.get("keywords")),
+    })
+    return repaired
+
+
+def _validator(repair: Callable) -> Callable:
+    """Single-object validator that raises so the next model is tried"""
+    def validate(result) -> Dict:
+        repaired = repair(result)
+        if repaired is None:
+            raise ValueError("Analysis response failed validation")
+        return repaired
+    return validate
+
+
+def _validate_batch(result) -> List:
+    """Validator for batch responses; elements are repaired one by one later"""
+    if not isinstance(result, list):
+        raise ValueError("Batch response is not a JSON array")
+    return result
+
+
+def _parse_retry_delay(value) -> Optional[float]:
+    """Parse a Retry-After header or a RetryInfo delay such as "37s" """
+    try:
+        return float(str(value).strip().rstrip("s"))
+    except (TypeError, ValueError):
+        return None
+
+
+def _quota_error(response) -> GeminiQuotaError:
+    """Read Retry-After and the RetryInfo / QuotaFailure details of a 429"""
+    retry_after = _parse_retry_delay(response.headers.get("Retry-After"))
+    per_day = False
+    message = "429 Too Many Requests"
+    
+    try:
+        error = response.json().get("error", {})
+        message = error.get("message") or message
+        for detail in error.get("details", []):
+            detail_type = detail.get("@type", "")
+            if detail_type.endswith("RetryInfo"):
+                retry_after = _parse_retry_delay(detail.get("retryDelay")) or retry_after
+            elif detail_type.endswith("QuotaFailure"):
+                for violation in detail.get("violations", []):
+                    if "PerDay" in violation.get("quotaId", ""):
+                        per_day = True
+    except Exception:
+        pass
+    
+    return GeminiQuotaError(message, retry_after=retry_after, per_day=per_day)
+
+
+def _park_for_quota(key: str, model: str, error: GeminiQuotaError) -> None:
+    if error.per_day and error.retry_after is None:
+        until = gemini_manager.park(key, model, until=gemini_manager.next_quota_reset())
+        print(f"   ⛔ Daily quota exhausted for {model}, parked until {until:%Y-%m-%d %H:%M %Z}")
+    else:
+        seconds = error.retry_after or config.GEMINI_DEFAULT_RETRY_AFTER
+        gemini_manager.park(key, model, seconds=seconds)
+        quota = "daily quota" if error.per_day else "rate limit"
+        print(f"   ⏳ {model} hit {quota}, parked for {seconds:.0f}s")
+
+
+def _request_with_key(
+    prompt: str,
+    key: str,
+    schema: Optional[Dict] = None,
+    validate: Optional[Callable] = None,
+    prefer: Optional[str] = None
+) -> Tuple[object, str, int]:
+    """Try the models of one key; returns (parsed JSON, model, tokens used)
+    
+    With structured output enabled the API is asked for JSON matching
+    ``schema``; ``validate`` may repair the parsed result or raise to move
+    on to the next model. ``prefer`` is tried first when healthy.
     
+    Raises GeminiKeyUnavailable when the key could not be used for quota
+    reasons only, so the caller can retry elsewhere without counting it as
+    a failure.
+    """
     payload = {
         "contents": [
             {
@@ -152,46 +1070,333 @@ Return JSON in this EXACT format:
             }
         ]
     }
+    if schema is not None and config.GEMINI_STRUCTURED_OUTPUT:
+        payload["generationConfig"] = {
+            "responseMimeType": "application/json",
+            "responseSchema": schema
+        }
     
-    models = gemini_manager.get_all_models()
-    api_keys = gemini_manager.get_all_keys()
-    
-    if not api_keys:
-        raise ValueError("No Gemini API keys configured")
-    
-    # Rotate keys in round-robin; for each key try all models
-    for _ in range(len(api_keys)):
-        key = gemini_manager.get_next_key()
-        
-        key_succeeded = False
+    while True:
         last_error: Optional[Exception] = None
+        waits: List[float] = []
         
-        # For this key, try all models
-        for model in models:
+        for model in gemini_manager.route(key, prefer):
+            wait = gemini_manager.acquire(key, model)
+            if wait > 0:
+                waits.append(wait)
+                continue
+            
+            started = time.monotonic()
             try:
-                url = f"https://generativelanguage.googleapis.com/v1beta/models/{model}:generateContent"
+                url = f"{config.GEMINI_API_BASE}/v1beta/models/{model}:generateContent"
                 headers = {"x-goog-api-key": key, "Content-Type": "application/json"}
                 
-                response = requests.post(url, json=payload, headers=headers, timeout=60)
+                session = get_session("gemini", gemini_pool.capacity)
+                response = session.post(url, json=payload, headers=headers, timeout=60)
+                metrics.observe("gemini_request_seconds", time.monotonic() - started, model=model)
+                metrics.inc("gemini_requests_total", model=model, status=response.status_code)
+                if response.status_code == 429:
+                    error = _quota_error(response)
+                    _park_for_quota(key, model, error)
+                    waits.append(error.retry_after or config.GEMINI_DEFAULT_RETRY_AFTER)
+                    continue
+                if response.status_code in (401, 403) or (
+                    response.status_code == 400 and "API_KEY_INVALID" in response.text
+                ):
+                    gemini_manager.disable_key_until_next_day(key)
+                    print(f"   ⛔ Key rejected ({response.status_code}), disabled until next day (Dhaka time)")
+                    raise GeminiKeyUnavailable(gemini_manager.seconds_until_available(key))
                 response.raise_for_status()
                 
                 data = response.json()
                 text = data["candidates"][0]["content"]["parts"][0]["text"]
-                clean_text = text.replace("```json", "").replace("```", "").strip()
-                result = json.loads(clean_text)
+                result = _parse_json(text)
+                if validate is not None:
+                    result = validate(result)
                 
-                print(f"   ✓ AI analysis done (Model: {model}, Category: {result.get('category', 'N/A')})")
-                key_succeeded = True
-                return result
+                usage = data.get("usageMetadata", {})
+                used_tokens = usage.get("totalTokenCount", 0)
+                metrics.inc("gemini_tokens_total", usage.get("promptTokenCount", 0), model=model, kind="prompt")
+                metrics.inc("gemini_tokens_total", usage.get("candidatesTokenCount", 0), model=model, kind="output")
+                gemini_manager.record(key, model, True, time.monotonic() - started)
+                return result, model, used_tokens
                 
+            except GeminiKeyUnavailable:
+                raise
             except Exception as e:
+                gemini_manager.record(key, model, False, time.monotonic() - started)
+                metrics.inc("gemini_model_failures_total", model=model)
                 last_error = e
                 print(f"   ⚠️  Model {model} failed: {e}")
                 continue
         
-        # If all models failed for this key -> disable until next day
-        if not key_succeeded:
-            gemini_manager.disable_key_until_next_day(key)
-            print(f"   ⛔ Disabled key until next day (Dhaka time)")
+        if last_error is not None:
+            raise last_error
+        if not waits:
+            raise ValueError("No Gemini models configured")
+        
+        # Only quota kept us from this key: wait briefly, or let another key take over
+        shortest = min(waits)
+        if shortest > config.GEMINI_BUCKET_WAIT:
+            raise GeminiKeyUnavailable(shortest)
+        time.sleep(shortest)
+
+
+# Global worker pool shared by every caller
+gemini_pool = GeminiWorkerPool(
+    gemini_manager,
+    concurrency_per_key=config.GEMINI_CONCURRENCY_PER_KEY,
+    rpm=config.GEMINI_KEY_RPM,
+    tpm=config.GEMINI_KEY_TPM
+)
+
+
+def _request_gemini(
+    prompt: str,
+    schema: Optional[Dict] = None,
+    validate: Optional[Callable] = None,
+    prefer: Optional[str] = None
+) -> Tuple[object, str]:
+    """Send a prompt through the key worker pool; returns (parsed JSON, model)"""
+    return gemini_pool.request(prompt, schema, validate, prefer)
+
+
+def export_gemini_stats(path: str = None) -> Optional[Dict]:
+    """Print per-model and per-key routing stats and save them as JSON"""
+    stats = gemini_manager.get_stats()
+    if not any(row["requests"] for row in stats["models"].values()):
+        return None
+    stats["token_budget"] = token_budget.stats.snapshot()
+    
+    print("\n🤖 GEMINI ROUTING STATS:")
+    for section in ("models", "keys"):
+        for name, row in stats[section].items():
+            circuit = "  🔌 open" if row["circuit_open"] else ""
+            print(
+                f"   {name:24} {row['requests']:4} req  "
+                f"ok {row['success_rate']:.0%}  "
+                f"p50 {row['p50_seconds']:6.2f}s  p95 {row['p95_seconds']:6.2f}s{circuit}"
+            )
+    
+    budget = stats["token_budget"]
+    print(
+        f"   ✂️  Input tokens: {budget['tokens_sent']} sent of {budget['tokens_in']} "
+        f"({budget['tokens_saved']} saved, {budget['paragraphs_dropped']} paragraphs dropped)"
+    )
+    
+    path = path or config.GEMINI_STATS_PATH
+    try:
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(stats, f, indent=2)
+        print(f"📁 Gemini stats saved to: {path}")
+    except Exception as e:
+        print(f"⚠️  Could not write Gemini stats: {e}")
+    
+    return stats
+
+
+class _Tier:
+    """Prompts, schemas and cache namespace of one analysis tier"""
     
-    raise ValueError("All Gemini models and keys failed")
+    def __init__(self, name, build, batch_rules, batch_format, schema, repair, prefer=None):
+        self.name = name
+        self.build = build
+        self.batch_rules = batch_rules
+        self.batch_format = batch_format
+        self.schema = schema
+        self.batch_schema = _batch_schema(schema)
+        self.repair = repair
+        self.validate = _validator(repair)
+        self.prefer = prefer
+        self.cache_version = PROMPT_VERSION if name == "full" else f"{PROMPT_VERSION}-{name}"
+
+
+FULL_TIER = _Tier(
+    "full", _build_prompt, ANALYSIS_RULES, BATCH_ANALYSIS_FORMAT,
+    ANALYSIS_SCHEMA, repair_analysis
+)
+TRIAGE_TIER = _Tier(
+    "triage", _build_triage_prompt, TRIAGE_RULES, BATCH_TRIAGE_FORMAT,
+    TRIAGE_SCHEMA, repair_triage, prefer=config.GEMINI_TRIAGE_MODEL
+)
+
+
+def _cached_analysis(tier: _Tier, title: str, full_text: str) -> Optional[Dict]:
+    if analysis_cache is None:
+        return None
+    return analysis_cache.get(content_key(title, full_text, tier.cache_version))
+
+
+def _cache_analysis(tier: _Tier, title: str, full_text: str, result: Dict) -> None:
+    if analysis_cache is not None:
+        analysis_cache.put(content_key(title, full_text, tier.cache_version), result)
+
+
+def _analyze_single(tier: _Tier, title: str, full_text: str, prompt_text: str) -> Dict:
+    result, model = _request_gemini(
+        tier.build(title, prompt_text), tier.schema, tier.validate, tier.prefer
+    )
+    label = "AI analysis" if tier is FULL_TIER else "AI triage"
+    print(f"   ✓ {label} done (Model: {model}, Category: {result.get('category', 'N/A')})")
+    _cache_analysis(tier, title, full_text, result)
+    return result
+
+
+def _budgeted(full_text: str) -> str:
+    text, saved = apply_token_budget(full_text)
+    if saved:
+        print(f"   ✂️  Trimmed ~{saved} tokens of boilerplate/overflow")
+    return text
+
+
+def _analyze_tier(
+    tier: _Tier,
+    articles: List[Tuple[str, str]],
+    indices: List[int],
+    prompt_text: Callable[[int], str]
+) -> Dict[int, Optional[Dict]]:
+    """Run one tier for ``articles[indices]``: cache, one batch request, single fallback"""
+    results: Dict[int, Optional[Dict]] = {
+        idx: _cached_analysis(tier, *articles[idx]) for idx in indices
+    }
+    
+    cached = sum(1 for result in results.values() if result is not None)
+    metrics.inc("gemini_cache_hits_total", cached, tier=tier.name)
+    if cached:
+        print(f"   ✓ {cached}/{len(indices)} AI {tier.name} results from cache")
+    
+    pending = [idx for idx in indices if results[idx] is None]
+    
+    if len(pending) > 1:
+        ids = {f"a{n + 1}": idx for n, idx in enumerate(pending)}
+        
+        try:
+            response, model = _request_gemini(
+                _build_batch_prompt(
+                    [(item_id, articles[idx][0], prompt_text(idx)) for item_id, idx in ids.items()],
+                    tier.batch_rules,
+                    tier.batch_format
+                ),
+                tier.batch_schema,
+                _validate_batch,
+                tier.prefer
+            )
+            by_id = {
+                str(element.get("id")): element
+                for element in response
+                if isinstance(element, dict)
+            }
+            valid = 0
+            for item_id, idx in ids.items():
+                element = tier.repair(by_id.get(item_id))
+                if element is not None:
+                    element.pop("id", None)
+                    results[idx] = element
+                    _cache_analysis(tier, *articles[idx], element)
+                    valid += 1
+            
+            print(f"   ✓ Batch AI {tier.name} done (Model: {model}, {valid}/{len(ids)} valid)")
+        except Exception as e:
+            print(f"   ⚠️  Batch AI {tier.name} failed: {e}")
+    
+    # Single-article fallback only for the items the batch did not cover
+    for idx in pending:
+        if results[idx] is not None:
+            continue
+        title, full_text = articles[idx]
+        try:
+            results[idx] = _analyze_single(tier, title, full_text, prompt_text(idx))
+        except Exception as e:
+            print(f"   ❌ AI {tier.name} failed for {title[:50]}...: {e}")
+    
+    return results
+
+
+def _with_tier(result: Optional[Dict], tier: _Tier) -> Optional[Dict]:
+    """Copy of a result marked with its tier; triage results get empty full fields"""
+    if result is None:
+        return None
+    if tier is TRIAGE_TIER:
+        return {
+            "summary_60_bn": "",
+            "summary_60_en": "",
+            "clickbait_score": 0,
+            "clickbait_reason": "",
+            "corrected_title": "",
+            "mcqs": [],
+            **result,
+            "analysis_tier": "triage",
+        }
+    return {**result, "analysis_tier": "full"}
+
+
+def generate_summaries_with_gemini(articles: List[Tuple[str, str]]) -> List[Optional[Dict]]:
+    """Analyse several (title, full_text) articles with as few requests as possible
+    
+    Results keep the input order. Cached analyses are reused, items missing
+    from a batch response or failing validation are retried one by one;
+    None marks an item that failed both ways.
+    
+    With ``GEMINI_ANALYSIS_MODE=tiered`` every article first gets a cheap
+    triage pass (category, importance, keywords) on GEMINI_TRIAGE_MODEL and
+    only those at or above GEMINI_FULL_ANALYSIS_THRESHOLD get summaries,
+    clickbait analysis and MCQs. ``analysis_tier`` records which one ran.
+    """
+    with metrics.timer("gemini_analysis_seconds", mode=config.GEMINI_ANALYSIS_MODE):
+        results = _analyze_articles(articles)
+    
+    for result in results:
+        outcome = result["analysis_tier"] if result is not None else "failed"
+        metrics.inc("gemini_articles_total", outcome=outcome)
+    return results
+
+
+def _analyze_articles(articles: List[Tuple[str, str]]) -> List[Optional[Dict]]:
+    prompt_texts: Dict[int, str] = {}
+    
+    def prompt_text(idx: int) -> str:
+        if idx not in prompt_texts:
+            prompt_texts[idx] = _budgeted(articles[idx][1])
+        return prompt_texts[idx]
+    
+    indices = list(range(len(articles)))
+    
+    if config.GEMINI_ANALYSIS_MODE != "tiered":
+        full = _analyze_tier(FULL_TIER, articles, indices, prompt_text)
+        return [_with_tier(full[idx], FULL_TIER) for idx in indices]
+    
+    # Articles analysed in full before need no triage
+    full = {idx: _cached_analysis(FULL_TIER, *articles[idx]) for idx in indices}
+    remaining = [idx for idx in indices if full[idx] is None]
+    
+    triage = _analyze_tier(TRIAGE_TIER, articles, remaining, prompt_text)
+    needs_full = [
+        idx for idx in remaining
+        if triage[idx] is None or triage[idx]["importance"] >= config.GEMINI_FULL_ANALYSIS_THRESHOLD
+    ]
+    if len(remaining) > len(needs_full):
+        print(f"   🪶 {len(remaining) - len(needs_full)}/{len(remaining)} article(s) below importance "
+              f"{config.GEMINI_FULL_ANALYSIS_THRESHOLD}, keeping triage only")
+    full.update(_analyze_tier(FULL_TIER, articles, needs_full, prompt_text))
+    
+    return [
+        _with_tier(full[idx], FULL_TIER) if full[idx] is not None
+        else _with_tier(triage.get(idx), TRIAGE_TIER)
+        for idx in indices
+    ]
+
+
+def generate_summary_with_gemini(title: str, full_text: str) -> Dict:
+    """Generate AI summary and analysis using Gemini API with key rotation"""
+    result = generate_summaries_with_gemini([(title, full_text)])[0]
+    if result is None:
+        raise ValueError("AI analysis failed")
+    return result
+
+
+def complete_analysis(title: str, full_text: str) -> Dict:
+    """Run the full analysis for an article that only got the triage pass"""
+    result = _analyze_tier(FULL_TIER, [(title, full_text)], [0], lambda idx: _budgeted(full_text))[0]
+    if result is None:
+        raise ValueError("AI analysis failed")
+    return _with_tier(result, FULL_TIER)
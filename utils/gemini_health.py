@@ -0,0 +1,49 @@
+"""
+Gemini Key Health Store
+Persists key/model quota parks and recent request outcomes between runs
+"""
+
+import hashlib
+import json
+import os
+import threading
+from typing import Dict
+
+from .config import config
+
+
+def key_fingerprint(api_key: str) -> str:
+    """Stable identifier for a key that does not reveal it"""
+    return hashlib.sha256(api_key.encode("utf-8")).hexdigest()[:16]
+
+
+class GeminiHealthStore:
+    """Small JSON file holding GeminiAPIManager health state, keyed by key fingerprint"""
+
+    def __init__(self, path: str = None):
+        self.path = path or config.GEMINI_HEALTH_PATH
+        self.lock = threading.Lock()
+
+    def load(self) -> Dict:
+        with self.lock:
+            try:
+                with open(self.path, 'r', encoding='utf-8') as f:
+                    return json.load(f)
+            except FileNotFoundError:
+                return {}
+            except Exception as e:
+                print(f"⚠️  Could not read Gemini key health: {e}")
+                return {}
+
+    def save(self, state: Dict) -> None:
+        with self.lock:
+            try:
+                directory = os.path.dirname(self.path)
+                if directory:
+                    os.makedirs(directory, exist_ok=True)
+                tmp_path = f"{self.path}.tmp"
+                with open(tmp_path, 'w', encoding='utf-8') as f:
+                    json.dump(state, f, indent=2)
+                os.replace(tmp_path, self.path)
+            except Exception as e:
+                print(f"⚠️  Could not write Gemini key health: {e}")
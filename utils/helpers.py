@@ -5,55 +5,171 @@ Common functions used across all scrapers
 
 import time
 import random
-import requests
 from datetime import datetime, timedelta
-from typing import Optional
-from bs4 import BeautifulSoup
+from typing import Dict, List, Optional, Union
+from bs4 import BeautifulSoup, Tag
+
+try:
+    from selectolax.parser import HTMLParser as SelectolaxParser
+except ImportError:  # Optional fast parser
+    SelectolaxParser = None
+
+try:
+    import lxml  # noqa: F401  (enables BeautifulSoup's 'lxml' tree builder)
+    HAS_LXML = True
+except ImportError:
+    HAS_LXML = False
 
 from .config import config
+from .http_client import ReceivedBytes, http_client
+from .metrics import metrics
+
+# Parsed HTML: a BeautifulSoup tree or a selectolax tree
+Document = Union[BeautifulSoup, "SelectolaxParser"]
+
+# BeautifulSoup leaves the text of these out of ``.text``; selectolax does not
+NON_TEXT_TAGS = ["script", "style", "template"]
 
 
 def sleep_random(min_seconds: float = 2, max_seconds: float = 6):
     """Random sleep to avoid rate limiting"""
     delay = random.uniform(min_seconds, max_seconds)
+    metrics.inc("sleep_seconds_total", delay)
     time.sleep(delay)
 
 
-def fetch_url(url: str, max_retries: int = 3) -> Optional[str]:
-    """Fetch URL with retry logic"""
-    headers = {'User-Agent': config.USER_AGENT}
+def _record_fetch(kind: str, started: float, ok: bool, received: ReceivedBytes) -> None:
+    """Fetch latency, outcome and downloaded bytes for the metrics dump"""
+    metrics.observe("fetch_seconds", time.perf_counter() - started, kind=kind)
+    metrics.inc("fetch_requests_total", kind=kind, status="ok" if ok else "failed")
+    metrics.inc("download_bytes_total", received.total, kind=kind)
+
+
+def fetch_url(url: str, max_retries: int = 3, impersonate: Optional[str] = None) -> Optional[str]:
+    """Fetch URL with retry logic over the pooled async HTTP client
     
-    for attempt in range(max_retries):
-        try:
-            response = requests.get(url, headers=headers, timeout=config.REQUEST_TIMEOUT)
-            response.raise_for_status()
-            return response.text
-        except Exception as e:
-            if attempt < max_retries - 1:
-                print(f"⚠️  Retry {attempt + 1}/{max_retries} for {url}: {e}")
-                time.sleep(2 ** attempt)  # Exponential backoff
-            else:
-                print(f"❌ Failed to fetch {url}: {e}")
-                return None
-
-
-def parse_html(html_content: str) -> BeautifulSoup:
-    """Parse HTML content"""
-    return BeautifulSoup(html_content, 'html.parser')
-
-
-def extract_og_image(soup: BeautifulSoup) -> str:
+    Pass ``impersonate`` (e.g. 'safari260') for sites that require a
+    browser TLS fingerprint.
+    """
+    started, received = time.perf_counter(), ReceivedBytes()
+    html = http_client.run(http_client.fetch(url, max_retries, impersonate, received))
+    _record_fetch("page", started, bool(html), received)
+    return html
+
+
+def fetch_meta(
+    url: str,
+    fields: Optional[List[str]] = None,
+    max_retries: int = 3,
+    impersonate: Optional[str] = None
+) -> Dict[str, str]:
+    """Stream only the page head and return its meta tags
+    
+    The connection is closed as soon as every requested field (e.g.
+    'og:image') is found, so image lookups cost a few KB, not a full page.
+    """
+    started, received = time.perf_counter(), ReceivedBytes()
+    meta = http_client.run(http_client.fetch_meta(url, fields, max_retries, impersonate, received))
+    _record_fetch("meta", started, bool(meta), received)
+    return meta
+
+
+def fetch_until(url: str, tag: str, max_retries: int = 3, impersonate: Optional[str] = None) -> Optional[str]:
+    """Fetch HTML only up to the end of the first ``<tag>`` (e.g. 'article')"""
+    started, received = time.perf_counter(), ReceivedBytes()
+    html = http_client.run(http_client.fetch_until(url, tag, max_retries, impersonate, received))
+    _record_fetch("until", started, bool(html), received)
+    return html
+
+
+def _parser_backend() -> str:
+    """Configured HTML parser, falling back when an optional one is missing"""
+    backend = config.HTML_PARSER.lower()
+    if backend == "selectolax" and SelectolaxParser is None:
+        backend = "lxml"
+    if backend == "lxml" and not HAS_LXML:
+        backend = "html.parser"
+    if backend not in ("selectolax", "lxml"):
+        backend = "html.parser"
+    return backend
+
+
+def parse_html(html_content: Union[str, bytes], backend: Optional[str] = None) -> Document:
+    """Parse HTML content with the configured backend (HTML_PARSER)
+    
+    'selectolax' returns a selectolax tree, 'lxml' and 'html.parser' return
+    BeautifulSoup trees. Use the extract_*/select_* helpers below to read
+    either kind of document.
+    """
+    backend = backend or _parser_backend()
+    with metrics.timer("html_parse_seconds", backend=backend):
+        if backend == "selectolax":
+            tree = SelectolaxParser(html_content)
+            tree.strip_tags(NON_TEXT_TAGS)
+            return tree
+        return BeautifulSoup(html_content, backend)
+
+
+def _is_soup(node) -> bool:
+    return isinstance(node, Tag)
+
+
+def _select(node, selector: str) -> list:
+    return node.select(selector) if _is_soup(node) else node.css(selector)
+
+
+def _select_first(node, selector: str):
+    return node.select_one(selector) if _is_soup(node) else node.css_first(selector)
+
+
+def _text(node) -> str:
+    return node.text if _is_soup(node) else node.text(deep=True)
+
+
+def _attr(node, attr: str) -> Optional[str]:
+    return node.get(attr) if _is_soup(node) else node.attributes.get(attr)
+
+
+def select_texts(doc: Document, selector: str, scope: Optional[str] = None) -> List[str]:
+    """Stripped, non-empty texts of elements matching a CSS selector
+    
+    With ``scope``, only the first element matching it is searched.
+    """
+    if scope:
+        doc = _select_first(doc, scope)
+        if doc is None:
+            return []
+    texts = (_text(node).strip() for node in _select(doc, selector))
+    return [text for text in texts if text]
+
+
+def select_first_text(doc: Document, selector: str) -> Optional[str]:
+    """Stripped text of the first element matching a CSS selector"""
+    node = _select_first(doc, selector)
+    return _text(node).strip() if node is not None else None
+
+
+def select_attr(doc: Document, selector: str, attr: str) -> Optional[str]:
+    """Attribute of the first element matching a CSS selector"""
+    node = _select_first(doc, selector)
+    return _attr(node, attr) if node is not None else None
+
+
+def select_attrs(doc: Document, selector: str, attr: str) -> List[str]:
+    """Non-empty attribute values of all elements matching a CSS selector"""
+    values = (_attr(node, attr) for node in _select(doc, selector))
+    return [value for value in values if value]
+
+
+def extract_og_image(doc: Document) -> str:
     """Extract Open Graph image from HTML"""
-    og_image = soup.find("meta", property="og:image")
-    if og_image and og_image.get("content"):
-        return og_image["content"]
-    return "NO IMAGE"
+    image_url = select_attr(doc, 'meta[property="og:image"]', "content")
+    return image_url if image_url else "NO IMAGE"
 
 
-def extract_paragraphs(soup: BeautifulSoup) -> str:
+def extract_paragraphs(doc: Document) -> str:
     """Extract all paragraphs from HTML"""
-    paragraphs = soup.find_all("p")
-    text_array = [p.text.strip() for p in paragraphs if p.text.strip()]
+    text_array = select_texts(doc, "p")
     return "\n\n".join(text_array) if text_array else "NO CONTENT"
 
 
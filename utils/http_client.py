@@ -0,0 +1,278 @@
+"""
+Async HTTP Client
+Pooled keep-alive fetch layer with per-host concurrency limits
+"""
+
+import atexit
+import asyncio
+import codecs
+import threading
+from html.parser import HTMLParser
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+from curl_cffi.requests import AsyncSession
+
+from .config import config
+
+
+class _IncrementalExtractor(HTMLParser):
+    """Incremental HTML parser that signals when enough has been read.
+
+    Collects <meta> tags from the head and, when ``until_tag`` is given,
+    tracks when the first such element has been closed.
+    """
+
+    def __init__(self, meta_fields: Optional[Iterable[str]] = None, until_tag: Optional[str] = None):
+        super().__init__(convert_charrefs=True)
+        self.meta_fields = set(meta_fields or [])
+        self.until_tag = until_tag
+        self.meta: Dict[str, str] = {}
+        self.done = False
+        self._depth = 0
+        self._entered = False
+
+    def handle_starttag(self, tag, attrs):
+        if self.until_tag:
+            if tag == self.until_tag:
+                self._depth += 1
+                self._entered = True
+            return
+
+        if tag == "meta":
+            attrs = dict(attrs)
+            key = attrs.get("property") or attrs.get("name")
+            if key and attrs.get("content") is not None:
+                self.meta.setdefault(key, attrs["content"])
+                if self.meta_fields and self.meta_fields.issubset(self.meta):
+                    self.done = True
+        elif tag == "body":
+            self.done = True
+
+    def handle_endtag(self, tag):
+        if self.until_tag:
+            if tag == self.until_tag and self._entered:
+                self._depth -= 1
+                if self._depth <= 0:
+                    self.done = True
+        elif tag == "head":
+            self.done = True
+
+
+class ReceivedBytes:
+    """Body bytes downloaded by one fetch call, failed attempts included
+
+    The client loop runs on its own thread, so callers pass one in and
+    record it themselves under their own metrics source.
+    """
+
+    def __init__(self):
+        self.total = 0
+
+
+class AsyncHTTPClient:
+    """Asyncio fetch layer with one persistent connection pool per host.
+
+    Sessions are keyed by (host, impersonate) so plain and browser-
+    impersonating requests never share a pool. All coroutines run on a
+    single background event loop, which lets synchronous callers from any
+    thread share the same pools through :meth:`run`.
+    """
+
+    def __init__(self, per_host_limit: int = None, timeout: int = None):
+        self.per_host_limit = per_host_limit or config.HTTP_MAX_PER_HOST
+        self.timeout = timeout or config.REQUEST_TIMEOUT
+
+        # Only touched from the event loop thread
+        self._sessions: Dict[Tuple[str, Optional[str]], AsyncSession] = {}
+        self._semaphores: Dict[str, asyncio.Semaphore] = {}
+
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    # ---------- Event loop ----------
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                self._thread = threading.Thread(
+                    target=self._loop.run_forever,
+                    name="http-client",
+                    daemon=True
+                )
+                self._thread.start()
+            return self._loop
+
+    def run(self, coro):
+        """Run a coroutine on the client loop and wait for its result"""
+        loop = self._ensure_loop()
+        return asyncio.run_coroutine_threadsafe(coro, loop).result()
+
+    # ---------- Pools ----------
+
+    def _session(self, host: str, impersonate: Optional[str]) -> AsyncSession:
+        key = (host, impersonate)
+        session = self._sessions.get(key)
+        if session is None:
+            # Impersonation supplies its own browser headers
+            headers = {} if impersonate else {'User-Agent': config.USER_AGENT}
+            session = AsyncSession(
+                impersonate=impersonate,
+                headers=headers,
+                timeout=self.timeout,
+                max_clients=self.per_host_limit
+            )
+            self._sessions[key] = session
+        return session
+
+    def _semaphore(self, host: str) -> asyncio.Semaphore:
+        semaphore = self._semaphores.get(host)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(self.per_host_limit)
+            self._semaphores[host] = semaphore
+        return semaphore
+
+    # ---------- Fetching ----------
+
+    async def fetch(
+        self,
+        url: str,
+        max_retries: int = 3,
+        impersonate: Optional[str] = None,
+        received: Optional[ReceivedBytes] = None
+    ) -> Optional[str]:
+        """Fetch URL text with retry logic, reusing the host's pool"""
+        host = urlsplit(url).netloc
+        session = self._session(host, impersonate)
+
+        for attempt in range(max_retries):
+            try:
+                async with self._semaphore(host):
+                    response = await session.get(url)
+                if received is not None:
+                    received.total += len(response.content)
+                response.raise_for_status()
+                return response.text
+            except Exception as e:
+                if attempt < max_retries - 1:
+                    print(f"⚠️  Retry {attempt + 1}/{max_retries} for {url}: {e}")
+                    await asyncio.sleep(2 ** attempt)  # Exponential backoff
+                else:
+                    print(f"❌ Failed to fetch {url}: {e}")
+                    return None
+
+    async def _stream_until_done(
+        self,
+        url: str,
+        make_extractor: Callable[[], _IncrementalExtractor],
+        max_retries: int = 3,
+        impersonate: Optional[str] = None,
+        received: Optional[ReceivedBytes] = None
+    ) -> Optional[Tuple[str, _IncrementalExtractor]]:
+        """Stream a page into an extractor and abort the transfer once it is done
+
+        Every attempt starts a fresh extractor from ``make_extractor``, so a
+        retry does not inherit the parser state of a transfer that failed
+        halfway. Returns the HTML read so far and its extractor, or None if
+        the request failed.
+        """
+        host = urlsplit(url).netloc
+        session = self._session(host, impersonate)
+
+        for attempt in range(max_retries):
+            chunks: List[str] = []
+            extractor = make_extractor()
+            try:
+                async with self._semaphore(host):
+                    response = await session.request("GET", url, stream=True)
+                    try:
+                        response.raise_for_status()
+                        decoder = codecs.getincrementaldecoder(response.charset or "utf-8")(errors="replace")
+                        async for chunk in response.aiter_content():
+                            if received is not None:
+                                received.total += len(chunk)
+                            text = decoder.decode(chunk)
+                            chunks.append(text)
+                            extractor.feed(text)
+                            if extractor.done:
+                                # Make curl abort the transfer on its next write
+                                response.quit_now.set()
+                                break
+                    finally:
+                        await response.aclose()
+                return "".join(chunks), extractor
+            except Exception as e:
+                if attempt < max_retries - 1:
+                    print(f"⚠️  Retry {attempt + 1}/{max_retries} for {url}: {e}")
+                    await asyncio.sleep(2 ** attempt)  # Exponential backoff
+                else:
+                    print(f"❌ Failed to fetch {url}: {e}")
+                    return None
+
+    async def fetch_meta(
+        self,
+        url: str,
+        fields: Optional[Iterable[str]] = None,
+        max_retries: int = 3,
+        impersonate: Optional[str] = None,
+        received: Optional[ReceivedBytes] = None
+    ) -> Dict[str, str]:
+        """Read only the page head and return its meta tags (property/name → content)
+
+        With ``fields``, the download stops as soon as all of them are found.
+        """
+        result = await self._stream_until_done(
+            url, lambda: _IncrementalExtractor(meta_fields=fields), max_retries, impersonate, received
+        )
+        return result[1].meta if result is not None else {}
+
+    async def fetch_until(
+        self,
+        url: str,
+        tag: str,
+        max_retries: int = 3,
+        impersonate: Optional[str] = None,
+        received: Optional[ReceivedBytes] = None
+    ) -> Optional[str]:
+        """Fetch HTML only up to the end of the first ``<tag>`` element"""
+        result = await self._stream_until_done(
+            url, lambda: _IncrementalExtractor(until_tag=tag.lower()), max_retries, impersonate, received
+        )
+        return result[0] if result is not None else None
+
+    # ---------- Shutdown ----------
+
+    async def _close_sessions(self) -> None:
+        sessions = list(self._sessions.values())
+        self._sessions.clear()
+        self._semaphores.clear()
+        for session in sessions:
+            try:
+                await session.close()
+            except Exception:
+                pass
+
+    def close(self) -> None:
+        """Close every pool and stop the background loop"""
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+
+        if loop is None:
+            return
+
+        try:
+            asyncio.run_coroutine_threadsafe(self._close_sessions(), loop).result(timeout=10)
+        except Exception:
+            pass
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(timeout=10)
+        if not thread.is_alive():
+            loop.close()
+
+
+# Global HTTP client instance
+http_client = AsyncHTTPClient()
+atexit.register(http_client.close)
@@ -0,0 +1,201 @@
+"""
+API Sessions
+Long-lived pooled HTTP sessions for the Telegram and Gemini APIs
+"""
+
+import threading
+import time
+from typing import Dict
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib3.connection import HTTPConnection, HTTPSConnection
+from urllib3.connectionpool import HTTPConnectionPool, HTTPSConnectionPool
+
+try:
+    import httpx
+    import h2  # noqa: F401 - httpx needs it for HTTP/2
+except ImportError:  # Optional HTTP/2 client
+    httpx = None
+
+from .config import config
+
+
+class SessionStats:
+    """Requests and new connections (TCP + TLS handshakes) of one session"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.requests = 0
+        self.request_seconds = 0.0
+        self.connections = 0
+        self.connect_seconds = 0.0
+
+    def record_request(self, seconds: float) -> None:
+        with self.lock:
+            self.requests += 1
+            self.request_seconds += seconds
+
+    def record_connect(self, seconds: float) -> None:
+        with self.lock:
+            self.connections += 1
+            self.connect_seconds += seconds
+
+    def snapshot(self) -> Dict:
+        with self.lock:
+            reused = max(0, self.requests - self.connections)
+            avg_connect = self.connect_seconds / self.connections if self.connections else 0.0
+            return {
+                "requests": self.requests,
+                "connections": self.connections,
+                "reused": reused,
+                "request_seconds": round(self.request_seconds, 3),
+                "connect_seconds": round(self.connect_seconds, 3),
+                "avg_connect_seconds": round(avg_connect, 4),
+                # Each reused connection skipped one handshake of about average cost
+                "handshake_saved_seconds": round(reused * avg_connect, 3),
+            }
+
+
+class _TimedConnect:
+    """Mixin timing urllib3's connect(), which covers DNS, TCP and TLS"""
+
+    stats: SessionStats = None
+
+    def connect(self):
+        started = time.perf_counter()
+        super().connect()
+        self.stats.record_connect(time.perf_counter() - started)
+
+
+class _TimedAdapter(HTTPAdapter):
+    """HTTPAdapter whose connection pools report new connections to ``stats``"""
+
+    def __init__(self, stats: SessionStats, **kwargs):
+        self.stats = stats
+        super().__init__(**kwargs)
+
+    def init_poolmanager(self, *args, **kwargs):
+        super().init_poolmanager(*args, **kwargs)
+        attrs = {"stats": self.stats}
+        http_conn = type("TimedHTTPConnection", (_TimedConnect, HTTPConnection), attrs)
+        https_conn = type("TimedHTTPSConnection", (_TimedConnect, HTTPSConnection), attrs)
+        self.poolmanager.pool_classes_by_scheme = {
+            "http": type("TimedHTTPConnectionPool", (HTTPConnectionPool,), {"ConnectionCls": http_conn}),
+            "https": type("TimedHTTPSConnectionPool", (HTTPSConnectionPool,), {"ConnectionCls": https_conn}),
+        }
+
+
+class ApiSession:
+    """Keep-alive connection pool for one API endpoint
+
+    Uses an HTTP/2 ``httpx`` client when ``API_HTTP2`` is on and httpx with
+    h2 is installed, otherwise a ``requests.Session``. Both return responses
+    with ``status_code``, ``text``, ``headers``, ``json()`` and
+    ``raise_for_status()``.
+    """
+
+    def __init__(self, name: str, pool_size: int, http2: bool = None):
+        self.name = name
+        self.pool_size = max(1, pool_size)
+        self.stats = SessionStats()
+        self.http2 = (config.API_HTTP2 if http2 is None else http2) and httpx is not None
+
+        if self.http2:
+            self._client = httpx.Client(
+                http2=True,
+                timeout=config.REQUEST_TIMEOUT,
+                limits=httpx.Limits(
+                    max_connections=self.pool_size,
+                    max_keepalive_connections=self.pool_size
+                )
+            )
+        else:
+            adapter = _TimedAdapter(self.stats, pool_connections=4, pool_maxsize=self.pool_size, max_retries=0)
+            self._client = requests.Session()
+            self._client.mount("https://", adapter)
+            self._client.mount("http://", adapter)
+
+    def _trace(self, tls: bool):
+        """httpx trace hook recording the TCP + TLS time of new connections"""
+        started = []
+        done_event = "connection.start_tls.complete" if tls else "connection.connect_tcp.complete"
+
+        def trace(event: str, info: Dict) -> None:
+            if event == "connection.connect_tcp.started":
+                started.append(time.perf_counter())
+            elif event == done_event and started:
+                self.stats.record_connect(time.perf_counter() - started.pop())
+
+        return trace
+
+    def post(self, url: str, **kwargs):
+        started = time.perf_counter()
+        try:
+            if self.http2:
+                extensions = {"trace": self._trace(url.startswith("https://"))}
+                return self._client.post(url, extensions=extensions, **kwargs)
+            return self._client.post(url, **kwargs)
+        finally:
+            self.stats.record_request(time.perf_counter() - started)
+
+    def close(self) -> None:
+        self._client.close()
+
+
+class SessionRegistry:
+    """One ApiSession per endpoint name, created on first use"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self._sessions: Dict[str, ApiSession] = {}
+
+    def get(self, name: str, pool_size: int = 4) -> ApiSession:
+        with self.lock:
+            session = self._sessions.get(name)
+            if session is None:
+                session = ApiSession(name, pool_size)
+                self._sessions[name] = session
+            return session
+
+    def stats(self) -> Dict[str, Dict]:
+        with self.lock:
+            return {name: session.stats.snapshot() for name, session in self._sessions.items()}
+
+    def close_all(self) -> Dict[str, Dict]:
+        """Close every session and print how much connection reuse saved
+
+        A session used again afterwards is simply recreated.
+        """
+        with self.lock:
+            sessions, self._sessions = self._sessions, {}
+
+        stats = {}
+        for name, session in sessions.items():
+            stats[name] = session.stats.snapshot()
+            session.close()
+
+        used = {name: row for name, row in stats.items() if row["requests"]}
+        if used:
+            print("\n🔌 API SESSIONS:")
+            for name, row in used.items():
+                protocol = "HTTP/2" if sessions[name].http2 else "HTTP/1.1"
+                print(
+                    f"   {name:10} {row['requests']:4} req over {row['connections']} connections ({protocol}), "
+                    f"{row['connect_seconds']:.2f}s connecting, ~{row['handshake_saved_seconds']:.2f}s of handshakes saved"
+                )
+        return stats
+
+
+# Global registry shared by the API clients
+http_sessions = SessionRegistry()
+
+
+def get_session(name: str, pool_size: int = 4) -> ApiSession:
+    """Shared pooled session for an API endpoint"""
+    return http_sessions.get(name, pool_size)
+
+
+def close_all() -> Dict[str, Dict]:
+    """Close all API sessions; call once at the end of the run"""
+    return http_sessions.close_all()
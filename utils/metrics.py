@@ -0,0 +1,224 @@
+"""
+Run Metrics
+Per-stage latency histograms and counters, dumped as JSON and Prometheus text
+"""
+
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from .config import config
+
+# Histogram bucket upper bounds in seconds (plus +Inf)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+
+METRIC_PREFIX = "scraper_"
+
+Labels = Tuple[Tuple[str, str], ...]
+
+_context = threading.local()
+
+# thread id -> source, readable from other threads (used by the sampling profiler)
+thread_sources: Dict[int, str] = {}
+
+
+def current_source() -> str:
+    """Source (scraper name) the calling thread is working for"""
+    return getattr(_context, "source", None) or "-"
+
+
+@contextmanager
+def source_context(name: str) -> Iterator[None]:
+    """Tag metrics recorded by this thread with ``source=name``"""
+    previous = getattr(_context, "source", None)
+    thread_id = threading.get_ident()
+    _context.source = name
+    thread_sources[thread_id] = name
+    try:
+        yield
+    finally:
+        _context.source = previous
+        if previous is None:
+            thread_sources.pop(thread_id, None)
+        else:
+            thread_sources[thread_id] = previous
+
+
+def _escape_label(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+class Histogram:
+    """Cumulative-bucket histogram in the Prometheus layout"""
+
+    def __init__(self, buckets: Tuple[float, ...] = LATENCY_BUCKETS):
+        self.buckets = buckets
+        self.counts = [0] * (len(buckets) + 1)
+        self.count = 0
+        self.sum = 0.0
+        self.max = 0.0
+
+    def observe(self, value: float) -> None:
+        for idx, bound in enumerate(self.buckets):
+            if value <= bound:
+                self.counts[idx] += 1
+                break
+        else:
+            self.counts[-1] += 1
+        self.count += 1
+        self.sum += value
+        self.max = max(self.max, value)
+
+    def quantile(self, q: float) -> float:
+        """Upper bound of the bucket holding the q-quantile"""
+        if not self.count:
+            return 0.0
+        rank, seen = q * self.count, 0
+        for idx, bucket_count in enumerate(self.counts[:-1]):
+            seen += bucket_count
+            if seen >= rank:
+                return self.buckets[idx]
+        return self.max
+
+    def snapshot(self) -> Dict:
+        return {
+            "count": self.count,
+            "sum": round(self.sum, 6),
+            "max": round(self.max, 6),
+            "p50": self.quantile(0.5),
+            "p95": self.quantile(0.95),
+            "buckets": dict(zip([str(b) for b in self.buckets] + ["+Inf"], self.counts)),
+        }
+
+
+class MetricsRegistry:
+    """Thread-safe counters and histograms keyed by name and labels
+
+    Every metric gets a ``source`` label from :func:`source_context` unless
+    the caller passes one.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.enabled = config.METRICS_ENABLED
+        self.started_at = time.time()
+        self._counters: Dict[Tuple[str, Labels], float] = {}
+        self._histograms: Dict[Tuple[str, Labels], Histogram] = {}
+
+    @staticmethod
+    def _key(name: str, labels: Dict) -> Tuple[str, Labels]:
+        labels.setdefault("source", current_source())
+        return name, tuple(sorted((k, str(v)) for k, v in labels.items()))
+
+    def inc(self, name: str, value: float = 1, **labels) -> None:
+        if not self.enabled:
+            return
+        key = self._key(name, labels)
+        with self.lock:
+            self._counters[key] = self._counters.get(key, 0) + value
+
+    def observe(self, name: str, seconds: float, **labels) -> None:
+        if not self.enabled:
+            return
+        key = self._key(name, labels)
+        with self.lock:
+            histogram = self._histograms.get(key)
+            if histogram is None:
+                histogram = self._histograms[key] = Histogram()
+            histogram.observe(seconds)
+
+    @contextmanager
+    def timer(self, name: str, **labels) -> Iterator[Dict]:
+        """Observe the duration of the block; labels may be added to the yielded dict"""
+        started = time.perf_counter()
+        try:
+            yield labels
+        finally:
+            self.observe(name, time.perf_counter() - started, **labels)
+
+    def snapshot(self) -> Dict:
+        with self.lock:
+            return {
+                "started_at": self.started_at,
+                "duration_seconds": round(time.time() - self.started_at, 3),
+                "counters": [
+                    {"name": name, "labels": dict(labels), "value": value}
+                    for (name, labels), value in sorted(self._counters.items())
+                ],
+                "histograms": [
+                    {"name": name, "labels": dict(labels), **histogram.snapshot()}
+                    for (name, labels), histogram in sorted(self._histograms.items(), key=lambda item: item[0])
+                ],
+            }
+
+    # ---------- Output ----------
+
+    @staticmethod
+    def _label_text(labels: Labels, extra: Optional[Tuple[str, str]] = None) -> str:
+        pairs = list(labels) + ([extra] if extra else [])
+        if not pairs:
+            return ""
+        return "{" + ",".join(f'{k}="{_escape_label(v)}"' for k, v in pairs) + "}"
+
+    def prometheus_text(self) -> str:
+        """Metrics in the Prometheus text exposition format"""
+        lines: List[str] = []
+        with self.lock:
+            typed = set()
+            for (name, labels), value in sorted(self._counters.items()):
+                metric = METRIC_PREFIX + name
+                if metric not in typed:
+                    lines.append(f"# TYPE {metric} counter")
+                    typed.add(metric)
+                lines.append(f"{metric}{self._label_text(labels)} {value}")
+
+            for (name, labels), histogram in sorted(self._histograms.items(), key=lambda item: item[0]):
+                metric = METRIC_PREFIX + name
+                if metric not in typed:
+                    lines.append(f"# TYPE {metric} histogram")
+                    typed.add(metric)
+                cumulative = 0
+                for bound, bucket_count in zip(list(histogram.buckets) + ["+Inf"], histogram.counts):
+                    cumulative += bucket_count
+                    lines.append(f"{metric}_bucket{self._label_text(labels, ('le', str(bound)))} {cumulative}")
+                lines.append(f"{metric}_sum{self._label_text(labels)} {histogram.sum}")
+                lines.append(f"{metric}_count{self._label_text(labels)} {histogram.count}")
+
+        lines.append(f"# TYPE {METRIC_PREFIX}last_run_timestamp_seconds gauge")
+        lines.append(f"{METRIC_PREFIX}last_run_timestamp_seconds {int(time.time())}")
+        lines.append(f"# TYPE {METRIC_PREFIX}run_duration_seconds gauge")
+        lines.append(f"{METRIC_PREFIX}run_duration_seconds {time.time() - self.started_at:.3f}")
+        return "\n".join(lines) + "\n"
+
+    def export(self, json_path: str = None, prom_path: str = None) -> Optional[Dict]:
+        """Write the JSON dump and the Prometheus textfile; returns the snapshot"""
+        if not self.enabled:
+            return None
+
+        snapshot = self.snapshot()
+        json_path = json_path or config.METRICS_JSON_PATH
+        prom_path = prom_path or config.METRICS_PROM_PATH
+
+        try:
+            with open(json_path, 'w', encoding='utf-8') as f:
+                json.dump(snapshot, f, ensure_ascii=False, indent=2)
+
+            # Write then rename so the node_exporter textfile collector never
+            # reads a half-written file
+            tmp_path = f"{prom_path}.tmp"
+            with open(tmp_path, 'w', encoding='utf-8') as f:
+                f.write(self.prometheus_text())
+            os.replace(tmp_path, prom_path)
+
+            print(f"📈 Metrics saved to: {json_path}, {prom_path}")
+        except Exception as e:
+            print(f"⚠️  Could not write metrics: {e}")
+
+        return snapshot
+
+
+# Global registry for the whole run
+metrics = MetricsRegistry()
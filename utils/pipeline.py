@@ -0,0 +1,329 @@
+"""
+Article Processing Pipeline
+Runs AI analysis, MongoDB writes and Telegram notifications as separate stages
+"""
+
+import queue
+import threading
+import time
+from collections import Counter
+from typing import Callable, Dict, List, Optional, Tuple
+
+from pymongo.errors import DuplicateKeyError
+
+from .config import config
+from .gemini_ai import generate_summaries_with_gemini, gemini_pool
+from .database import db_handler
+from .telegram import send_to_telegram
+from .result_sink import result_sink
+from .metrics import metrics, source_context
+
+# Sentinel telling a stage worker to exit
+_STOP = object()
+
+# (channel name, article_data) travelling between stages
+Job = Tuple[str, Dict]
+
+
+class Stage:
+    """Pool of worker threads draining one bounded queue"""
+
+    def __init__(
+        self,
+        name: str,
+        handler: Callable[[Job], Optional[Job]],
+        workers: int,
+        queue_size: int,
+        downstream: Optional["Stage"] = None,
+        on_error: Optional[Callable[[str], None]] = None
+    ):
+        self.name = name
+        self.handler = handler
+        self.on_error = on_error
+        self.workers = max(1, workers)
+        self.queue: "queue.Queue" = queue.Queue(maxsize=max(1, queue_size))
+        self.downstream = downstream
+        self._threads: List[threading.Thread] = []
+
+    def start(self) -> None:
+        for i in range(self.workers):
+            thread = threading.Thread(
+                target=self._work,
+                name=f"{self.name}-{i + 1}",
+                daemon=True
+            )
+            thread.start()
+            self._threads.append(thread)
+
+    def put(self, job: Job) -> None:
+        """Enqueue a job, blocking while the queue is full (backpressure)"""
+        self.queue.put(job)
+
+    def stop(self) -> None:
+        """Wait for queued jobs to drain, then stop all workers"""
+        for _ in self._threads:
+            self.queue.put(_STOP)
+        for thread in self._threads:
+            thread.join()
+        self._threads = []
+
+    def _work(self) -> None:
+        while True:
+            job = self.queue.get()
+            if job is _STOP:
+                return
+
+            try:
+                with source_context(job[0]), metrics.timer("pipeline_stage_seconds", stage=self.name):
+                    result = self.handler(job)
+                if result is not None and self.downstream is not None:
+                    self.downstream.put(result)
+            except Exception as e:
+                name, article_data = job
+                title = article_data.get("title", "")
+                print(f"   ❌ [{name}] {self.name} failed for {title[:50]}...: {e}")
+                if self.on_error is not None:
+                    self.on_error(name)
+
+
+class BatchStage(Stage):
+    """Stage whose handler receives up to ``batch_size`` jobs at once
+
+    A worker takes whatever is queued, waiting at most ``max_wait`` seconds
+    for a batch to fill, and forwards every job the handler returns. The
+    handler time is also split across the batch's sources by job count
+    (``pipeline_stage_share_seconds_total``), since a mixed batch is
+    otherwise only recorded under ``source="mixed"``.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        handler: Callable[[List[Job]], List[Job]],
+        workers: int,
+        queue_size: int,
+        batch_size: int,
+        max_wait: float,
+        downstream: Optional[Stage] = None,
+        on_error: Optional[Callable[[str], None]] = None
+    ):
+        super().__init__(name, handler, workers, queue_size, downstream, on_error)
+        self.batch_size = max(1, batch_size)
+        self.max_wait = max_wait
+
+    def _work(self) -> None:
+        while True:
+            job = self.queue.get()
+            if job is _STOP:
+                return
+
+            batch = [job]
+            stop = False
+            deadline = time.monotonic() + self.max_wait
+            while len(batch) < self.batch_size:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    job = self.queue.get(timeout=remaining)
+                except queue.Empty:
+                    break
+                if job is _STOP:
+                    stop = True
+                    break
+                batch.append(job)
+
+            names = {name for name, _ in batch}
+            source = names.pop() if len(names) == 1 else "mixed"
+            started = time.perf_counter()
+            results: List[Job] = []
+            try:
+                with source_context(source), metrics.timer("pipeline_stage_seconds", stage=self.name):
+                    results = self.handler(batch)
+            except Exception as e:
+                names = sorted({name for name, _ in batch})
+                print(f"   ❌ [{', '.join(names)}] {self.name} failed for {len(batch)} articles: {e}")
+                if self.on_error is not None:
+                    for name, _ in batch:
+                        self.on_error(name)
+
+            elapsed = time.perf_counter() - started
+            for name, count in Counter(name for name, _ in batch).items():
+                metrics.inc(
+                    "pipeline_stage_share_seconds_total", elapsed * count / len(batch),
+                    stage=self.name, source=name
+                )
+
+            for result in results:
+                if self.downstream is not None:
+                    self.downstream.put(result)
+
+            if stop:
+                return
+
+
+class PipelineChannel:
+    """Producer handle that tags submitted articles with a scraper name"""
+
+    def __init__(self, pipeline: "ArticlePipeline", name: str):
+        self.pipeline = pipeline
+        self.name = name
+
+    def submit(self, article_data: Dict) -> None:
+        self.pipeline.submit(self.name, article_data)
+
+    def on_success(self, callback: Callable[[], None]) -> None:
+        """Run ``callback`` at close if every article of this channel was saved"""
+        self.pipeline.on_success(self.name, callback)
+
+
+class ArticlePipeline:
+    """Fetch → analyze → persist → notify pipeline with bounded queues.
+
+    Scrapers only produce ``article_data`` dicts. Gemini calls, MongoDB
+    writes and Telegram sends each drain their own queue with their own
+    number of workers, so a slow stage applies backpressure to the ones
+    before it instead of serialising every article.
+    """
+
+    def __init__(
+        self,
+        analyze_workers: int = None,
+        persist_workers: int = None,
+        notify_workers: int = None,
+        queue_size: int = None
+    ):
+        queue_size = queue_size or config.PIPELINE_QUEUE_SIZE
+
+        self.notify_stage = Stage(
+            "notify", self._notify,
+            notify_workers or config.PIPELINE_NOTIFY_WORKERS, queue_size
+        )
+        self.persist_stage = Stage(
+            "persist", self._persist,
+            persist_workers or config.PIPELINE_PERSIST_WORKERS, queue_size,
+            downstream=self.notify_stage,
+            on_error=self._record_failure
+        )
+        # Gemini requests carry up to GEMINI_BATCH_SIZE articles each; by
+        # default one analyze worker per key slot keeps every key busy
+        self.analyze_stage = BatchStage(
+            "analyze", self._analyze,
+            analyze_workers or config.PIPELINE_ANALYZE_WORKERS or gemini_pool.capacity, queue_size,
+            batch_size=config.GEMINI_BATCH_SIZE,
+            max_wait=config.GEMINI_BATCH_WAIT,
+            downstream=self.persist_stage,
+            on_error=self._record_failure
+        )
+
+        self.results: Dict[str, List[Dict]] = {}
+        # Articles per channel that were not analysed or saved
+        self.failures: Dict[str, int] = {}
+        self._on_success: List[Tuple[str, Callable[[], None]]] = []
+        self.lock = threading.Lock()
+        self._started = False
+
+    def start(self) -> "ArticlePipeline":
+        if not self._started:
+            for stage in (self.notify_stage, self.persist_stage, self.analyze_stage):
+                stage.start()
+            self._started = True
+        return self
+
+    def channel(self, name: str) -> PipelineChannel:
+        """Return a producer handle for one scraper"""
+        with self.lock:
+            self.results.setdefault(name, [])
+        return PipelineChannel(self, name)
+
+    def submit(self, name: str, article_data: Dict) -> None:
+        """Queue an article for analysis (blocks while the pipeline is full)"""
+        self.analyze_stage.put((name, article_data))
+
+    def on_success(self, name: str, callback: Callable[[], None]) -> None:
+        """Run ``callback`` at close unless an article of ``name`` failed"""
+        with self.lock:
+            self._on_success.append((name, callback))
+
+    def _record_failure(self, name: str) -> None:
+        with self.lock:
+            self.failures[name] = self.failures.get(name, 0) + 1
+
+    def close(self) -> Dict[str, List[Dict]]:
+        """Drain every stage in order and return processed articles per scraper"""
+        if self._started:
+            self.analyze_stage.stop()
+            self.persist_stage.stop()
+            # Buffered writes still owe their articles to the notify stage
+            db_handler.flush()
+            self.notify_stage.stop()
+            self._started = False
+
+        with self.lock:
+            callbacks, self._on_success = self._on_success, []
+        for name, callback in callbacks:
+            if self.failures.get(name):
+                print(f"⚠️  [{name}] {self.failures[name]} article(s) failed; feed will be read again next run")
+                continue
+            callback()
+        return self.results
+
+    def __enter__(self) -> "ArticlePipeline":
+        return self.start()
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+    # ---------- Stage handlers ----------
+
+    def _analyze(self, jobs: List[Job]) -> List[Job]:
+        names = sorted({name for name, _ in jobs})
+        print(f"   🤖 [{', '.join(names)}] Generating AI analysis for {len(jobs)} article(s)...")
+        analyses = generate_summaries_with_gemini([
+            (article_data.get("title", ""), article_data.get("full_text", ""))
+            for _, article_data in jobs
+        ])
+
+        analysed = []
+        for job, ai_analysis in zip(jobs, analyses):
+            if ai_analysis is None:
+                self._record_failure(job[0])
+                continue
+            job[1].update(ai_analysis)
+            analysed.append(job)
+        return analysed
+
+    def _persist(self, job: Job) -> Optional[Job]:
+        name, article_data = job
+
+        if db_handler.batch_size <= 1:
+            print(f"   💾 [{name}] Saving to MongoDB...")
+            try:
+                db_handler.create_article(article_data)
+            except DuplicateKeyError:
+                # Stored by an overlapping run: nothing to save or notify
+                return None
+            result_sink.write(name, article_data)
+            return job
+
+        # Bulk path: the flush callback forwards saved articles to notify;
+        # duplicates are already stored and are neither sent nor failures
+        def on_saved(saved_article: Dict, outcome: str) -> None:
+            if outcome == "saved":
+                result_sink.write(name, saved_article)
+                self.notify_stage.put((name, saved_article))
+            elif outcome == "failed":
+                self._record_failure(name)
+
+        print(f"   💾 [{name}] Buffered for MongoDB bulk write...")
+        db_handler.buffer_article(article_data, on_saved)
+        return None
+
+    def _notify(self, job: Job) -> None:
+        name, article_data = job
+        print(f"   📱 [{name}] Sending to Telegram...")
+        send_to_telegram(article_data)
+
+        with self.lock:
+            self.results.setdefault(name, []).append(article_data)
+        print(f"   ✅ [{name}] SUCCESS - Article processed!")
@@ -0,0 +1,217 @@
+"""
+Run Profiler
+Sampling wall-clock profiler with flamegraph output and a per-source time breakdown
+"""
+
+import json
+import os
+import re
+import sys
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Optional
+
+from .config import config
+from .metrics import metrics, thread_sources
+
+# Worker threads are numbered ("scraper_0", "analyze-2"); stacks merge per role
+_THREAD_NUMBER = re.compile(r"[-_]\d+$")
+
+
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    return f"{code.co_name} ({os.path.basename(code.co_filename)}:{code.co_firstlineno})"
+
+
+class SamplingProfiler:
+    """Samples the stack of every thread at a fixed interval
+
+    Samples are taken whether a thread is running or blocked, so time spent
+    waiting on the network, Gemini or ``sleep_random`` shows up next to CPU
+    work. Each stack is prefixed with the thread's source (from
+    ``source_context``) and role, and written in the folded format read by
+    flamegraph.pl, speedscope and inferno.
+    """
+
+    def __init__(self, interval: float = None):
+        self.interval = max(0.001, interval or config.PROFILE_INTERVAL)
+        self.stacks: Counter = Counter()
+        self.leaves: Counter = Counter()
+        self.samples = 0
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> "SamplingProfiler":
+        self._stop.clear()
+        self._thread = threading.Thread(target=self._run, name="profiler", daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self) -> None:
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        own_id = threading.get_ident()
+        while not self._stop.wait(self.interval):
+            names = {thread.ident: thread.name for thread in threading.enumerate()}
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == own_id:
+                    continue
+
+                stack: List[str] = []
+                while frame is not None:
+                    stack.append(_frame_label(frame))
+                    frame = frame.f_back
+                stack.reverse()
+
+                role = _THREAD_NUMBER.sub("", names.get(thread_id, "thread"))
+                source = thread_sources.get(thread_id, "-")
+                self.stacks[";".join([source, role] + stack)] += 1
+                self.leaves[stack[-1] if stack else role] += 1
+            self.samples += 1
+
+    def write_folded(self, path: str) -> None:
+        with open(path, 'w', encoding='utf-8') as f:
+            for stack, count in self.stacks.most_common():
+                f.write(f"{stack} {count}\n")
+
+
+COLUMNS = ("wall", "cpu", "network", "gemini", "mongo", "telegram", "sleep", "other")
+
+
+def _rows(snapshot: Dict, name: str, source: str, labels: Dict):
+    for kind, field in (("histograms", "sum"), ("counters", "value")):
+        for row in snapshot[kind]:
+            if row["name"] == name and row["labels"].get("source") == source and all(
+                row["labels"].get(label) == value for label, value in labels.items()
+            ):
+                yield row[field]
+
+
+def _metric_sum(snapshot: Dict, name: str, source: str, **labels) -> float:
+    """Histogram sum or counter value of ``name`` for one source"""
+    return sum(_rows(snapshot, name, source, labels))
+
+
+def _has_metric(snapshot: Dict, name: str, source: str) -> bool:
+    return any(True for _ in _rows(snapshot, name, source, {}))
+
+
+def source_breakdown(snapshot: Dict) -> Dict[str, Dict]:
+    """Time of each source: scraper-thread wall clock plus Gemini, MongoDB and Telegram
+
+    Built from the run metrics: ``source_seconds`` (wall) and
+    ``source_cpu_seconds_total`` (CPU of the scraper thread), network and
+    sleep waits of the scraper thread, and the Gemini, MongoDB and Telegram
+    time spent on the source's articles, wherever it ran. Work done on
+    other threads (pipeline stages, bulk flushes, the Telegram dispatcher)
+    runs concurrently with the scraper; those columns are listed in
+    ``background``, overlap wall and are not subtracted from it. Waits
+    overlap a little with CPU (feed parsing happens inside
+    ``feed_parse_seconds``); "other" is the rest of the wall clock.
+    """
+    sources = sorted({
+        row["labels"].get("source") for row in snapshot["histograms"] if row["name"] == "source_seconds"
+    })
+
+    breakdown = {}
+    for source in sources:
+        pipelined = (
+            _has_metric(snapshot, "pipeline_stage_seconds", source)
+            or _has_metric(snapshot, "pipeline_stage_share_seconds_total", source)
+        )
+        row = {
+            "wall": _metric_sum(snapshot, "source_seconds", source),
+            "cpu": _metric_sum(snapshot, "source_cpu_seconds_total", source),
+            "network": _metric_sum(snapshot, "fetch_seconds", source) + _metric_sum(snapshot, "feed_parse_seconds", source),
+            # Mixed analyze batches are recorded under "mixed"; their share per source is separate
+            "gemini": (
+                _metric_sum(snapshot, "pipeline_stage_share_seconds_total", source, stage="analyze")
+                if pipelined else _metric_sum(snapshot, "gemini_analysis_seconds", source)
+            ),
+            "mongo": _metric_sum(snapshot, "mongo_seconds", source),
+            "telegram": _metric_sum(snapshot, "telegram_send_seconds", source),
+            "sleep": _metric_sum(snapshot, "sleep_seconds_total", source),
+        }
+
+        background = ["gemini", "mongo", "telegram"] if pipelined else []
+        if config.TELEGRAM_ASYNC and "telegram" not in background:
+            background.append("telegram")
+
+        accounted = sum(value for name, value in row.items() if name != "wall" and name not in background)
+        if pipelined:
+            # The existing-link lookup still runs on the scraper thread
+            accounted += _metric_sum(snapshot, "mongo_seconds", source, op="find_existing")
+        row["other"] = max(0.0, row["wall"] - accounted)
+        breakdown[source] = {name: round(row[name], 3) for name in COLUMNS}
+        breakdown[source]["background"] = background
+    return breakdown
+
+
+class RunProfiler:
+    """``main.py --profile``: sampler plus per-source breakdown, written to PROFILE_DIR"""
+
+    def __init__(self, output_dir: str = None, interval: float = None):
+        self.output_dir = output_dir or config.PROFILE_DIR
+        self.sampler = SamplingProfiler(interval)
+        self._wall_started = 0.0
+        self._cpu_started = 0.0
+
+    def start(self) -> "RunProfiler":
+        # The breakdown is computed from the run metrics
+        metrics.enabled = True
+        self._wall_started = time.perf_counter()
+        self._cpu_started = time.process_time()
+        self.sampler.start()
+        print(f"🔬 Profiling every {self.sampler.interval * 1000:.0f} ms")
+        return self
+
+    def stop(self) -> Dict:
+        """Stop sampling, print the breakdown and write the profile files"""
+        self.sampler.stop()
+        wall = time.perf_counter() - self._wall_started
+        cpu = time.process_time() - self._cpu_started
+
+        breakdown = source_breakdown(metrics.snapshot())
+        total_leaves = sum(self.sampler.leaves.values()) or 1
+        hottest = [
+            {"frame": frame, "share": round(count / total_leaves, 4)}
+            for frame, count in self.sampler.leaves.most_common(15)
+        ]
+        report = {
+            "wall_seconds": round(wall, 3),
+            "process_cpu_seconds": round(cpu, 3),
+            "samples": self.sampler.samples,
+            "interval_seconds": self.sampler.interval,
+            "sources": breakdown,
+            "hottest_frames": hottest,
+        }
+
+        print("\n🔬 PROFILE:")
+        print(f"   Run: {wall:.1f}s wall, {cpu:.1f}s CPU (whole process), {self.sampler.samples} samples")
+        print("   " + f"{'source':14}" + "".join(f"{name:>11}" for name in COLUMNS))
+        for source, row in breakdown.items():
+            print("   " + f"{source:14}" + "".join(
+                f"{row[name]:>9.1f}s" + ("*" if name in row["background"] else " ") for name in COLUMNS
+            ))
+        if any(row["background"] for row in breakdown.values()):
+            print("   * ran on pipeline/dispatcher threads alongside the scraper: overlaps wall, not part of other")
+        print("   Hottest frames (share of thread samples, waiting included):")
+        for entry in hottest[:10]:
+            print(f"   {entry['share']:6.1%}  {entry['frame']}")
+
+        try:
+            os.makedirs(self.output_dir, exist_ok=True)
+            folded_path = os.path.join(self.output_dir, "stacks.folded")
+            self.sampler.write_folded(folded_path)
+            with open(os.path.join(self.output_dir, "profile.json"), 'w', encoding='utf-8') as f:
+                json.dump(report, f, indent=2)
+            print(f"📁 Profile saved to: {self.output_dir}/ (flamegraph.pl {folded_path} > flamegraph.svg)")
+        except Exception as e:
+            print(f"⚠️  Could not write profile: {e}")
+
+        return report
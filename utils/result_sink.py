@@ -0,0 +1,96 @@
+"""
+Result Sink
+Streams persisted articles to per-source NDJSON files as they are saved
+"""
+
+import gzip
+import io
+import json
+import os
+import threading
+from typing import Dict, IO, Optional
+
+try:
+    import zstandard
+except ImportError:  # Optional, gzip is used instead
+    zstandard = None
+
+from .config import config
+
+EXTENSIONS = {"none": "", "gzip": ".gz", "zstd": ".zst"}
+
+
+class ResultSink:
+    """Appends one compact JSON line per saved article to ``{name}_articles.ndjson``
+
+    Files are opened on the first article of a source and truncated once per
+    run; writing to a source again after :meth:`close` appends (a valid
+    multi-member gzip/zstd stream). Uncompressed files are flushed after
+    every line, so a crashed run keeps what it saved.
+    """
+
+    def __init__(self, directory: str = None, compression: str = None):
+        self.directory = directory or config.RESULTS_DIR
+        compression = (compression or config.RESULTS_COMPRESSION).lower()
+        if compression not in EXTENSIONS:
+            print(f"⚠️  Unknown RESULTS_COMPRESSION '{compression}', writing uncompressed")
+            compression = "none"
+        if compression == "zstd" and zstandard is None:
+            print("⚠️  zstandard not installed, compressing results with gzip")
+            compression = "gzip"
+        self.compression = compression
+
+        self.lock = threading.Lock()
+        self._files: Dict[str, IO[str]] = {}
+        self._counts: Dict[str, int] = {}
+
+    def path_for(self, name: str) -> str:
+        return os.path.join(self.directory, f"{name}_articles.ndjson{EXTENSIONS[self.compression]}")
+
+    def _open(self, name: str) -> IO[str]:
+        path = self.path_for(name)
+        if self.directory:
+            os.makedirs(self.directory, exist_ok=True)
+        mode = "ab" if name in self._counts else "wb"
+
+        if self.compression == "gzip":
+            return gzip.open(path, mode.replace("b", "t"), encoding="utf-8")
+        if self.compression == "zstd":
+            raw = zstandard.ZstdCompressor().stream_writer(open(path, mode))
+            return io.TextIOWrapper(raw, encoding="utf-8")
+        return open(path, mode.replace("b", ""), encoding="utf-8")
+
+    def write(self, name: str, article_data: Dict) -> None:
+        """Append one article of source ``name``"""
+        line = json.dumps(article_data, ensure_ascii=False, separators=(",", ":"), default=str)
+        with self.lock:
+            f = self._files.get(name)
+            if f is None:
+                f = self._open(name)
+                self._files[name] = f
+                self._counts.setdefault(name, 0)
+            f.write(line + "\n")
+            if self.compression == "none":
+                f.flush()
+            self._counts[name] += 1
+
+    def output(self, name: str) -> Optional[Dict]:
+        """File and article count written for ``name`` this run, if any"""
+        with self.lock:
+            if name not in self._counts:
+                return None
+            return {"path": self.path_for(name), "count": self._counts[name]}
+
+    def close(self) -> None:
+        """Finish every open file (required for compressed output)"""
+        with self.lock:
+            files, self._files = self._files, {}
+        for f in files.values():
+            try:
+                f.close()
+            except Exception as e:
+                print(f"⚠️  Could not close result file: {e}")
+
+
+# Global sink shared by the scrapers and the pipeline
+result_sink = ResultSink()
@@ -0,0 +1,142 @@
+"""
+Seen-URL Cache
+Local dedup layer (Bloom filter + SQLite) in front of MongoDB lookups
+"""
+
+import math
+import os
+import sqlite3
+import threading
+import time
+import hashlib
+from typing import Iterable, Optional, Set
+
+from .config import config
+
+
+def _digest(url: str) -> bytes:
+    """Compact 16-byte fingerprint stored instead of the full URL"""
+    return hashlib.blake2b(url.encode("utf-8"), digest_size=16).digest()
+
+
+class BloomFilter:
+    """Fixed-size Bloom filter using double hashing over a URL digest"""
+
+    def __init__(self, capacity: int, error_rate: float = 0.01):
+        capacity = max(1, capacity)
+        self.size = max(8, int(-capacity * math.log(error_rate) / (math.log(2) ** 2)))
+        self.hash_count = max(1, round(self.size / capacity * math.log(2)))
+        self.bits = bytearray((self.size + 7) // 8)
+
+    def _positions(self, digest: bytes):
+        h1 = int.from_bytes(digest[:8], "little")
+        h2 = int.from_bytes(digest[8:], "little") | 1
+        for i in range(self.hash_count):
+            yield (h1 + i * h2) % self.size
+
+    def add(self, digest: bytes) -> None:
+        for pos in self._positions(digest):
+            self.bits[pos >> 3] |= 1 << (pos & 7)
+
+    def __contains__(self, digest: bytes) -> bool:
+        return all(self.bits[pos >> 3] & (1 << (pos & 7)) for pos in self._positions(digest))
+
+
+class SeenURLCache:
+    """Persistent set of article URLs already known to be stored.
+
+    The Bloom filter answers "definitely not seen" without touching disk;
+    possible hits are confirmed against the SQLite file, so false positives
+    simply fall through to MongoDB. Entries older than the TTL are evicted
+    when the cache is opened.
+    """
+
+    def __init__(self, path: str = None, ttl_days: float = None, capacity: int = None):
+        self.path = path or config.SEEN_CACHE_PATH
+        self.ttl_seconds = (ttl_days if ttl_days is not None else config.SEEN_CACHE_TTL_DAYS) * 86400
+        self.capacity = capacity or config.SEEN_CACHE_CAPACITY
+        self.lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+        self._bloom: Optional[BloomFilter] = None
+
+    def _open(self) -> sqlite3.Connection:
+        """Open the cache file, evict expired entries and load the Bloom filter"""
+        if self._conn is not None:
+            return self._conn
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        conn = sqlite3.connect(self.path, check_same_thread=False)
+        conn.execute(
+            "CREATE TABLE IF NOT EXISTS seen_urls ("
+            "digest BLOB PRIMARY KEY, seen_at REAL NOT NULL) WITHOUT ROWID"
+        )
+        conn.execute("DELETE FROM seen_urls WHERE seen_at < ?", (time.time() - self.ttl_seconds,))
+        conn.commit()
+
+        count = conn.execute("SELECT COUNT(*) FROM seen_urls").fetchone()[0]
+        self._bloom = BloomFilter(max(self.capacity, count * 2))
+        for (digest,) in conn.execute("SELECT digest FROM seen_urls"):
+            self._bloom.add(digest)
+
+        self._conn = conn
+        return conn
+
+    def filter_seen(self, urls: Iterable[str]) -> Set[str]:
+        """Return the URLs known to be stored already"""
+        with self.lock:
+            try:
+                conn = self._open()
+                candidates = {}
+                for url in urls:
+                    digest = _digest(url)
+                    if digest in self._bloom:
+                        candidates[digest] = url
+                if not candidates:
+                    return set()
+
+                cutoff = time.time() - self.ttl_seconds
+                placeholders = ",".join("?" * len(candidates))
+                rows = conn.execute(
+                    f"SELECT digest FROM seen_urls WHERE seen_at >= ? AND digest IN ({placeholders})",
+                    (cutoff, *candidates.keys())
+                )
+                return {candidates[digest] for (digest,) in rows}
+            except Exception as e:
+                print(f"⚠️  Seen-URL cache lookup failed: {e}")
+                return set()
+
+    def contains(self, url: str) -> bool:
+        return url in self.filter_seen([url])
+
+    def add_many(self, urls: Iterable[str]) -> None:
+        """Record URLs as stored"""
+        digests = [_digest(url) for url in urls if url]
+        if not digests:
+            return
+
+        with self.lock:
+            try:
+                conn = self._open()
+                now = time.time()
+                conn.executemany(
+                    "INSERT OR REPLACE INTO seen_urls (digest, seen_at) VALUES (?, ?)",
+                    [(digest, now) for digest in digests]
+                )
+                conn.commit()
+                for digest in digests:
+                    self._bloom.add(digest)
+            except Exception as e:
+                print(f"⚠️  Seen-URL cache update failed: {e}")
+
+    def add(self, url: str) -> None:
+        self.add_many([url])
+
+    def close(self) -> None:
+        with self.lock:
+            if self._conn is not None:
+                self._conn.close()
+                self._conn = None
+                self._bloom = None
@@ -1,62 +1,431 @@
 """
 Telegram Integration
-Send notifications to Telegram channel
+Send notifications to Telegram channel through a paced background outbox
 """
 
-import requests
-from typing import Dict
+import json
+import os
+import sqlite3
+import threading
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
 
 from .config import config
+from .http_sessions import get_session
+from .metrics import metrics, current_source
+
+
+def _build_message(article_data: Dict) -> Tuple[str, Dict]:
+    """Return (API method, payload) for one article notification"""
+    banner = article_data.get("image", "")
+    source_name = article_data.get("source", "")
+    title = article_data.get("title", "")
+    summary_bn = article_data.get("summary_60_bn", "")
+    category = article_data.get("category", "").lower()
+
+    # Prepare caption
+    caption = f"📰 *{title}*\n\n"
+    caption += f"📌 {source_name}\n\n"
+    caption += f"{summary_bn}\n\n"
+    caption += f"#{category}"
+
+    # Send with image if available
+    if banner and banner != "NO IMAGE":
+        # Send photo with caption
+        return "sendPhoto", {
+            "chat_id": config.TELEGRAM_CHAT_ID,
+            "photo": banner,
+            "caption": caption,
+            "parse_mode": "Markdown"
+        }
+
+    # Send text message only
+    return "sendMessage", {
+        "chat_id": config.TELEGRAM_CHAT_ID,
+        "text": caption,
+        "parse_mode": "Markdown"
+    }
+
+
+def _digest_only(article_data: Dict) -> bool:
+    """Low-importance and triage-only articles (no summary yet) go to the digest"""
+    if article_data.get("analysis_tier") == "triage":
+        return True
+    importance = article_data.get("importance", 10)
+    return isinstance(importance, int) and importance < config.TELEGRAM_DIGEST_THRESHOLD
+
+
+def _escape_markdown(text: str) -> str:
+    for char in ("\\", "_", "*", "`", "["):
+        text = text.replace(char, f"\\{char}")
+    return text
+
+
+def _build_digest(items: List[Dict]) -> str:
+    """One message listing several low-importance articles"""
+    lines = ["🗞️ *More headlines*", ""]
+    for item in items:
+        title = _escape_markdown(item.get("title", ""))
+        category = item.get("category", "").lower()
+        tag = f" #{category}" if category else ""
+        lines.append(f"• [{title}]({item.get('link', '')}) — {_escape_markdown(item.get('source', ''))}{tag}")
+    return "\n".join(lines)
+
+
+def _post(method: str, payload: Dict):
+    url = f"https://api.telegram.org/bot{config.TELEGRAM_BOT_TOKEN}/{method}"
+    return get_session("telegram", 2).post(url, json=payload, timeout=config.REQUEST_TIMEOUT)
+
+
+def _record_send(sources: List[str], method: str, seconds: float) -> None:
+    """Charge one send to the sources whose articles it carried, by share"""
+    for source, count in Counter(sources).items():
+        metrics.observe("telegram_send_seconds", seconds * count / len(sources), method=method, source=source)
+
+
+def _count_sends(sources: List[str], status: str) -> None:
+    """Count the articles of one send per source"""
+    for source, count in Counter(sources).items():
+        metrics.inc("telegram_messages_total", count, status=status, source=source)
+
+
+def _timed_post(sources: List[str], method: str, payload: Dict):
+    """Post one send and charge its time to the sources it carries"""
+    started = time.perf_counter()
+    try:
+        return _post(method, payload)
+    finally:
+        _record_send(sources, method, time.perf_counter() - started)
+
+
+class TelegramOutbox:
+    """SQLite queue of pending Telegram sends that survives restarts
+
+    ``kind`` is "message" for an article sent on its own, or "digest" for a
+    low-importance article waiting to be grouped with others. ``source`` is
+    the scraper that queued it, so send time is charged to that source.
+    """
+
+    def __init__(self, path: str = None):
+        self.path = path or config.TELEGRAM_OUTBOX_PATH
+        self.lock = threading.Lock()
+        self._conn: Optional[sqlite3.Connection] = None
+
+    def _open(self) -> sqlite3.Connection:
+        if self._conn is None:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+
+            conn = sqlite3.connect(self.path, check_same_thread=False)
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS outbox ("
+                "id INTEGER PRIMARY KEY AUTOINCREMENT, chat_id TEXT NOT NULL, kind TEXT NOT NULL, "
+                "method TEXT NOT NULL, payload TEXT NOT NULL, created_at REAL NOT NULL, "
+                "attempts INTEGER NOT NULL DEFAULT 0, next_attempt REAL NOT NULL DEFAULT 0, "
+                "source TEXT NOT NULL DEFAULT '-')"
+            )
+            # Outboxes left by runs before the source column existed
+            columns = {row[1] for row in conn.execute("PRAGMA table_info(outbox)")}
+            if "source" not in columns:
+                conn.execute("ALTER TABLE outbox ADD COLUMN source TEXT NOT NULL DEFAULT '-'")
+            conn.commit()
+            self._conn = conn
+        return self._conn
+
+    def add(self, chat_id, kind: str, method: str, payload: Dict, source: str = "-") -> None:
+        with self.lock:
+            conn = self._open()
+            conn.execute(
+                "INSERT INTO outbox (chat_id, kind, method, payload, created_at, source) VALUES (?, ?, ?, ?, ?, ?)",
+                (str(chat_id), kind, method, json.dumps(payload, ensure_ascii=False), time.time(), source)
+            )
+            conn.commit()
+
+    def next_message(self, now: float) -> Optional[Tuple]:
+        """Oldest message that is due: (id, chat_id, method, payload, attempts, source)"""
+        with self.lock:
+            row = self._open().execute(
+                "SELECT id, chat_id, method, payload, attempts, source FROM outbox "
+                "WHERE kind = 'message' AND next_attempt <= ? ORDER BY id LIMIT 1",
+                (now,)
+            ).fetchone()
+        if row is None:
+            return None
+        return row[0], row[1], row[2], json.loads(row[3]), row[4], row[5]
+
+    def digest_items(self) -> Dict[str, List[Tuple[int, Dict, float, str]]]:
+        """Pending digest items per chat: [(id, item, created_at, source)]"""
+        with self.lock:
+            rows = self._open().execute(
+                "SELECT id, chat_id, payload, created_at, source FROM outbox WHERE kind = 'digest' ORDER BY id"
+            ).fetchall()
+        items: Dict[str, List[Tuple[int, Dict, float, str]]] = {}
+        for row_id, chat_id, payload, created_at, source in rows:
+            items.setdefault(chat_id, []).append((row_id, json.loads(payload), created_at, source))
+        return items
+
+    def next_due_at(self) -> Optional[float]:
+        with self.lock:
+            row = self._open().execute(
+                "SELECT MIN(next_attempt) FROM outbox WHERE kind = 'message'"
+            ).fetchone()
+        return row[0] if row else None
+
+    def delete(self, ids: List[int]) -> None:
+        with self.lock:
+            conn = self._open()
+            conn.executemany("DELETE FROM outbox WHERE id = ?", [(row_id,) for row_id in ids])
+            conn.commit()
+
+    def reschedule(self, row_id: int, payload: Dict, attempts: int, next_attempt: float) -> None:
+        with self.lock:
+            conn = self._open()
+            conn.execute(
+                "UPDATE outbox SET payload = ?, attempts = ?, next_attempt = ? WHERE id = ?",
+                (json.dumps(payload, ensure_ascii=False), attempts, next_attempt, row_id)
+            )
+            conn.commit()
+
+    def count(self) -> int:
+        with self.lock:
+            return self._open().execute("SELECT COUNT(*) FROM outbox").fetchone()[0]
+
+
+class TelegramDispatcher:
+    """Background sender that paces the outbox to Telegram's limits
+
+    Messages go out at most ``TELEGRAM_PER_CHAT_PER_MINUTE`` per chat and
+    ``TELEGRAM_GLOBAL_PER_SECOND`` overall. A 429 pauses the chat for the
+    ``retry_after`` Telegram asks for, without losing the message. Articles
+    below ``TELEGRAM_DIGEST_THRESHOLD`` importance, and triage-only articles
+    that have no summary yet, are collected and sent as one digest message.
+    """
+
+    def __init__(self, outbox: TelegramOutbox):
+        self.outbox = outbox
+        self.chat_interval = 60.0 / max(1, config.TELEGRAM_PER_CHAT_PER_MINUTE)
+        self.global_interval = 1.0 / max(1, config.TELEGRAM_GLOBAL_PER_SECOND)
+        self.lock = threading.Lock()
+        self._wake = threading.Event()
+        self._closing = threading.Event()
+        self._deadline = float("inf")
+        self._thread: Optional[threading.Thread] = None
+
+        # chat_id -> monotonic time of the next allowed send
+        self._chat_ready: Dict[str, float] = {}
+        self._global_ready = 0.0
+        self.sent = 0
+        self.dropped = 0
+
+    def start(self) -> None:
+        with self.lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._closing.clear()
+                self._deadline = float("inf")
+                self._thread = threading.Thread(target=self._run, name="telegram-dispatcher", daemon=True)
+                self._thread.start()
+
+    def submit(self, article_data: Dict) -> None:
+        """Queue an article notification without waiting for Telegram"""
+        if _digest_only(article_data):
+            item = {
+                field: article_data.get(field, "")
+                for field in ("title", "link", "source", "category")
+            }
+            self.outbox.add(config.TELEGRAM_CHAT_ID, "digest", "sendMessage", item, current_source())
+            metrics.inc("telegram_queued_total", kind="digest")
+        else:
+            method, payload = _build_message(article_data)
+            self.outbox.add(config.TELEGRAM_CHAT_ID, "message", method, payload, current_source())
+            metrics.inc("telegram_queued_total", kind="message")
+
+        self.start()
+        self._wake.set()
+
+    def close(self, timeout: float = None) -> int:
+        """Send what is queued within ``timeout`` seconds; returns messages left
+
+        Pending digests are flushed regardless of size. Anything still queued
+        stays in the outbox and is sent by the next run.
+        """
+        timeout = config.TELEGRAM_DRAIN_TIMEOUT if timeout is None else timeout
+        if self._thread is None or not self._thread.is_alive():
+            if not self.outbox.count():
+                return 0
+            self.start()
+
+        self._deadline = time.monotonic() + timeout
+        self._closing.set()
+        self._wake.set()
+        self._thread.join(timeout + 1)
+
+        left = self.outbox.count()
+        if self.sent or left:
+            print(f"📱 Telegram: {self.sent} sent, {self.dropped} dropped, {left} left in outbox")
+        self.sent = self.dropped = 0
+        return left
+
+    # ---------- Worker ----------
+
+    def _next_job(self) -> Optional[Tuple[str, Dict]]:
+        """Next send: a due message, or a digest that is full, old or being flushed"""
+        message = self.outbox.next_message(time.time())
+        if message is not None:
+            row_id, chat_id, method, payload, attempts, source = message
+            return chat_id, {
+                "ids": [row_id], "sources": [source], "method": method,
+                "payload": payload, "attempts": attempts, "digest": False
+            }
+
+        for chat_id, items in self.outbox.digest_items().items():
+            oldest = items[0][2]
+            if (
+                len(items) >= config.TELEGRAM_DIGEST_SIZE
+                or time.time() - oldest >= config.TELEGRAM_DIGEST_MAX_WAIT
+                or self._closing.is_set()
+            ):
+                batch = items[:max(1, config.TELEGRAM_DIGEST_SIZE)]
+                payload = {
+                    "chat_id": chat_id,
+                    "text": _build_digest([item for _, item, _, _ in batch]),
+                    "parse_mode": "Markdown",
+                    "disable_web_page_preview": True
+                }
+                return chat_id, {
+                    "ids": [row_id for row_id, _, _, _ in batch], "sources": [source for _, _, _, source in batch],
+                    "method": "sendMessage", "payload": payload, "attempts": 0, "digest": True
+                }
+
+        return None
+
+    def _run(self) -> None:
+        while True:
+            if self._closing.is_set() and time.monotonic() >= self._deadline:
+                return
+
+            job = self._next_job()
+            if job is None:
+                if self._closing.is_set() and self.outbox.next_due_at() is None:
+                    return
+                self._wake.wait(1)
+                self._wake.clear()
+                continue
+
+            chat_id, send = job
+            now = time.monotonic()
+            wait = max(self._chat_ready.get(chat_id, 0.0), self._global_ready) - now
+            if wait > 0:
+                self._wake.wait(min(wait, 1))
+                self._wake.clear()
+                continue
+
+            self._chat_ready[chat_id] = now + self.chat_interval
+            self._global_ready = now + self.global_interval
+            self._send(chat_id, send)
+
+    def _send(self, chat_id: str, send: Dict) -> None:
+        ids, method, payload, attempts = send["ids"], send["method"], send["payload"], send["attempts"]
+        digest, sources = send["digest"], send["sources"]
+
+        try:
+            response = _timed_post(sources, method, payload)
+
+            if response.status_code == 400 and "parse entities" in response.text and "parse_mode" in payload:
+                # Markdown the title broke: resend as plain text
+                payload = {k: v for k, v in payload.items() if k != "parse_mode"}
+                if not digest:
+                    self.outbox.reschedule(ids[0], payload, attempts + 1, 0)
+                    return
+                response = _timed_post(sources, method, payload)
+
+            if response.status_code == 429:
+                # Digest items stay queued and are regrouped once the chat resumes
+                _count_sends(sources, "rate_limited")
+                retry_after = 5
+                try:
+                    retry_after = response.json().get("parameters", {}).get("retry_after", retry_after)
+                except Exception:
+                    pass
+                self._chat_ready[chat_id] = time.monotonic() + float(retry_after)
+                print(f"   ⏳ Telegram rate limited, retrying in {retry_after}s")
+                return
+
+            if 400 <= response.status_code < 500:
+                print(f"   ⚠️  Telegram rejected notification ({response.status_code}): {response.text[:100]}")
+                self.outbox.delete(ids)
+                self.dropped += len(ids)
+                _count_sends(sources, "rejected")
+                return
+
+            response.raise_for_status()
+            self.outbox.delete(ids)
+            self.sent += 1
+            _count_sends(sources, "sent")
+            label = f"digest of {len(ids)}" if digest else "notification"
+            print(f"   ✓ Sent {label} to Telegram")
+
+        except Exception as e:
+            _count_sends(sources, "failed")
+            if digest:
+                # Digest items stay queued and are regrouped on the next pass
+                print(f"   ⚠️  Telegram digest failed, will retry: {e}")
+                self._chat_ready[chat_id] = time.monotonic() + 5
+                return
+
+            attempts += 1
+            if attempts >= config.TELEGRAM_MAX_ATTEMPTS:
+                print(f"   ⚠️  Telegram notification failed {attempts} times, dropping: {e}")
+                self.outbox.delete(ids)
+                self.dropped += 1
+                return
+
+            delay = 2 ** attempts
+            print(f"   ⚠️  Telegram notification failed, retrying in {delay}s: {e}")
+            self.outbox.reschedule(ids[0], payload, attempts, time.time() + delay)
+
+
+# Global dispatcher; main() drains it at the end of the run. Other processes
+# that only import utils never send: what they queue waits in the outbox.
+telegram_dispatcher = TelegramDispatcher(TelegramOutbox())
 
 
 def send_to_telegram(article_data: Dict) -> bool:
-    """Send article notification to Telegram"""
+    """Send article notification to Telegram
+
+    With ``TELEGRAM_ASYNC`` (default) the article is only queued in the
+    outbox and the background dispatcher sends it, so callers never wait on
+    Telegram.
+    """
     bot_token = config.TELEGRAM_BOT_TOKEN
     chat_id = config.TELEGRAM_CHAT_ID
-    
+
     # Skip if Telegram not configured
     if not bot_token or not chat_id:
         print("   ⏭️  Telegram not configured - skipping notification")
         return False
-    
+
     try:
-        banner = article_data.get("image", "")
-        source_name = article_data.get("source", "")
-        title = article_data.get("title", "")
-        summary_bn = article_data.get("summary_60_bn", "")
-        category = article_data.get("category", "").lower()
-        
-        # Prepare caption
-        caption = f"📰 *{title}*\n\n"
-        caption += f"📌 {source_name}\n\n"
-        caption += f"{summary_bn}\n\n"
-        caption += f"#{category}"
-        
-        # Send with image if available
-        if banner and banner != "NO IMAGE":
-            # Send photo with caption
-            url = f"https://api.telegram.org/bot{bot_token}/sendPhoto"
-            payload = {
-                "chat_id": chat_id,
-                "photo": banner,
-                "caption": caption,
-                "parse_mode": "Markdown"
-            }
-        else:
-            # Send text message only
-            url = f"https://api.telegram.org/bot{bot_token}/sendMessage"
-            payload = {
-                "chat_id": chat_id,
-                "text": caption,
-                "parse_mode": "Markdown"
-            }
-        
-        response = requests.post(url, json=payload, timeout=config.REQUEST_TIMEOUT)
+        if config.TELEGRAM_ASYNC:
+            telegram_dispatcher.submit(article_data)
+            print(f"   📨 Queued for Telegram")
+            return True
+
+        if article_data.get("analysis_tier") == "triage":
+            # Without the outbox there is no digest, and no summary to send yet
+            print("   ⏭️  Triage-only analysis - skipping notification")
+            return False
+
+        method, payload = _build_message(article_data)
+        with metrics.timer("telegram_send_seconds", method=method):
+            response = _post(method, payload)
         response.raise_for_status()
-        
+        metrics.inc("telegram_messages_total", status="sent")
+
         print(f"   ✓ Sent to Telegram")
         return True
-        
+
     except Exception as e:
         print(f"   ⚠️  Telegram notification failed: {e}")
         return False
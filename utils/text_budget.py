@@ -0,0 +1,156 @@
+"""
+Token Budgeting
+Trims boilerplate from article text and caps what is sent to Gemini
+"""
+
+import re
+import threading
+from typing import Dict, List, Tuple
+
+from .config import config
+
+# Whole paragraphs that are page furniture rather than story text (English
+# and Bangla). Each pattern must match the entire paragraph, so a sentence
+# that merely mentions copyright or a newsletter is kept.
+BOILERPLATE_PATTERNS = [
+    re.compile(pattern, re.IGNORECASE)
+    for pattern in (
+        r"^(read more|also read|related( news| stories)?|more news|see also)(\s*[:|\-–—»›].*)?$",
+        r"^(subscribe|sign up)\b.*\b(newsletter|channel|updates|alerts)\W*$",
+        r"^(follow us|download (our|the) app)\b[^.!?]*\W*$",
+        r"^(©|copyright\s*(©|\(c\))?\s*\d{4}).*$",
+        r"^[^.!?]*all rights reserved\W*$",
+        r"^(advertisement|sponsored|share this( article| story)?|click here\b[^.!?]*)\W*$",
+        r"^(আরও|আরো) পড়ুন(\s*[:|\-–—»›].*)?$",
+        r"^(সম্পর্কিত( খবর)?|আরও খবর|আরো খবর|বিজ্ঞাপন)(\s*[:|\-–—»›].*)?$",
+        r"^[^।!?]*(ফলো করুন|সাবস্ক্রাইব করুন)\W*$",
+        r"^[^।!?]*সর্বস্বত্ব সংরক্ষিত\W*$",
+    )
+]
+
+# Short paragraphs matching a pattern are dropped; long ones are probably story text
+BOILERPLATE_MAX_CHARS = 200
+
+
+def estimate_tokens(text: str) -> int:
+    """Rough token count: ~4 ASCII characters per token, 1 per other character
+
+    Bangla tokenizes far denser than English, so counting every non-ASCII
+    character as a token keeps Bangla articles from overshooting the cap.
+    """
+    ascii_chars = len(text.encode("ascii", "ignore"))
+    return max(1, ascii_chars // 4 + len(text) - ascii_chars)
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """Longest prefix of ``text`` that fits in ``max_tokens`` estimated tokens"""
+    # Budget in quarter tokens: an ASCII character costs 1, any other 4
+    budget = max_tokens * 4
+    for idx, char in enumerate(text):
+        budget -= 1 if ord(char) < 128 else 4
+        if budget < 0:
+            return text[:idx]
+    return text
+
+
+class TokenBudgetStats:
+    """Running totals of tokens trimmed before Gemini requests"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.articles = 0
+        self.tokens_in = 0
+        self.tokens_sent = 0
+        self.paragraphs_dropped = 0
+
+    def record(self, tokens_in: int, tokens_sent: int, dropped: int) -> None:
+        with self.lock:
+            self.articles += 1
+            self.tokens_in += tokens_in
+            self.tokens_sent += tokens_sent
+            self.paragraphs_dropped += dropped
+
+    def snapshot(self) -> Dict:
+        with self.lock:
+            return {
+                "articles": self.articles,
+                "tokens_in": self.tokens_in,
+                "tokens_sent": self.tokens_sent,
+                "tokens_saved": self.tokens_in - self.tokens_sent,
+                "paragraphs_dropped": self.paragraphs_dropped,
+            }
+
+
+class TokenBudget:
+    """Drops repeated and boilerplate paragraphs, then caps the token count
+
+    Only repeats inside one article are dropped: an updated story shares
+    most paragraphs with its earlier version and still needs them for
+    context. The lead paragraphs are kept first, since news puts the facts
+    up front.
+    """
+
+    def __init__(self, max_tokens: int = None, trim_boilerplate: bool = None):
+        self.max_tokens = config.GEMINI_MAX_INPUT_TOKENS if max_tokens is None else max_tokens
+        self.trim_boilerplate = (
+            config.GEMINI_TRIM_BOILERPLATE if trim_boilerplate is None else trim_boilerplate
+        )
+        self.stats = TokenBudgetStats()
+
+    @staticmethod
+    def _normalize(text: str) -> str:
+        return re.sub(r"\s+", " ", text).strip().lower()
+
+    def _is_boilerplate(self, paragraph: str) -> bool:
+        return len(paragraph) <= BOILERPLATE_MAX_CHARS and any(
+            pattern.search(paragraph) for pattern in BOILERPLATE_PATTERNS
+        )
+
+    def _clean(self, paragraphs: List[str]) -> List[str]:
+        kept = []
+        seen = set()
+
+        for paragraph in paragraphs:
+            normalized = self._normalize(paragraph)
+            if normalized in seen or self._is_boilerplate(paragraph):
+                continue
+            seen.add(normalized)
+            kept.append(paragraph)
+
+        return kept
+
+    def apply(self, full_text: str) -> str:
+        """Return the text to send to Gemini and record the tokens saved"""
+        full_text = full_text or ""
+        paragraphs = [p.strip() for p in re.split(r"\n\s*\n|\n", full_text) if p.strip()]
+
+        kept = paragraphs
+        if self.trim_boilerplate:
+            kept = self._clean(paragraphs) or paragraphs
+
+        if self.max_tokens > 0:
+            capped, used = [], 0
+            for paragraph in kept:
+                tokens = estimate_tokens(paragraph)
+                if used + tokens > self.max_tokens:
+                    if not capped:
+                        # A single oversized lead paragraph is cut, not dropped
+                        capped.append(truncate_to_tokens(paragraph, self.max_tokens))
+                    break
+                capped.append(paragraph)
+                used += tokens
+            kept = capped
+
+        text = "\n\n".join(kept)
+        self.stats.record(estimate_tokens(full_text), estimate_tokens(text), len(paragraphs) - len(kept))
+        return text
+
+
+# Global budget shared by every Gemini request
+token_budget = TokenBudget()
+
+
+def apply_token_budget(full_text: str) -> Tuple[str, int]:
+    """Trim an article for the prompt; returns (text, tokens saved)"""
+    text = token_budget.apply(full_text)
+    return text, max(0, estimate_tokens(full_text or "") - estimate_tokens(text))